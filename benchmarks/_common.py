@@ -0,0 +1,37 @@
+"""Shared helpers for the standalone benchmark scripts."""
+from __future__ import annotations
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
+
+WORDS = [
+    "company", "shares", "quarter", "guidance", "revenue", "earnings", "market", "analyst",
+    "outlook", "deal", "merger", "bank", "energy", "tech", "retail", "chip", "demand", "supply",
+    "beat", "growth", "record", "surge", "profit", "miss", "loss", "slow", "fraud", "decline",
+]
+
+
+def make_headlines(rows: int, words_per_headline: int = 8, seed: int = 42) -> list[str]:
+    """Generate *rows* random headlines from a fixed vocabulary plus numeric tickers."""
+    rng = np.random.default_rng(seed)
+    vocab = np.array(WORDS + [f"tkr{i}" for i in range(5_000)])
+    tokens = vocab[rng.integers(0, len(vocab), size=(rows, words_per_headline))]
+    return [" ".join(row) for row in tokens]
+
+
+@contextmanager
+def measure() -> Iterator[dict]:
+    """Record wall time and peak traced allocations (MB) of the enclosed block."""
+    stats: dict = {}
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats["seconds"] = time.perf_counter() - start
+        stats["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
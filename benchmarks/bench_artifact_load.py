@@ -0,0 +1,99 @@
+"""Cold-start load time and RSS of joblib pickles vs compact memory-mapped artifacts.
+
+Each load runs in a fresh subprocess. ``import_s`` covers the imports needed by
+that loader (scikit-learn for joblib, NumPy only for compact). Run from the
+repository root::
+
+    python -m benchmarks.bench_artifact_load --rows 200000 --max-features 50000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+MODES = ["joblib", "compact"]
+
+
+def _status_mb(field: str) -> float:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith(field):
+            return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _child(mode: str, directory: Path) -> None:
+    start = time.perf_counter()
+    if mode == "joblib":
+        from src.nlp.sentiment_transformer import SentimentTransformer
+
+        imported = time.perf_counter()
+        model = SentimentTransformer.load(directory / "sentiment.joblib")
+    else:
+        from src.models.artifacts import load_sentiment
+
+        imported = time.perf_counter()
+        model = load_sentiment(directory / "sentiment")
+    loaded = time.perf_counter()
+    model.predict_proba(["record profit for the quarter"])
+    first = time.perf_counter()
+    print(json.dumps({
+        "mode": mode,
+        "import_s": imported - start,
+        "load_s": loaded - imported,
+        "first_predict_s": first - loaded,
+        "rss_mb": _status_mb("VmRSS:"),
+        "peak_rss_mb": _status_mb("VmHWM:"),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--max-features", type=int, default=50_000)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        _child(args.mode, Path(args.dir))
+        return
+
+    import pandas as pd
+
+    from benchmarks._common import make_headlines
+    from src.data.preprocess import sentiment_seed_labels
+    from src.models.artifacts import export_sentiment
+    from src.nlp.embedder import NewsEmbedder
+    from src.nlp.sentiment_transformer import SentimentTransformer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        texts = make_headlines(args.rows)
+        labels = sentiment_seed_labels(pd.Series(texts)).to_numpy()
+        model = SentimentTransformer(embedder_model=NewsEmbedder(max_features=args.max_features)).fit(texts, labels)
+        model.save(directory / "sentiment.joblib")
+        export_sentiment(model, directory / "sentiment")
+        sizes = {
+            "joblib": (directory / "sentiment.joblib").stat().st_size,
+            "compact": sum(p.stat().st_size for p in (directory / "sentiment").iterdir()),
+        }
+        print(f"vocabulary={len(model.embedder_model.vocab())} terms")
+        print(f"{'mode':>8} {'disk_MB':>8} {'import_s':>9} {'load_s':>7} {'predict_s':>10} {'RSS_MB':>7} {'peak_MB':>8}")
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_artifact_load", "--mode", mode, "--dir", str(directory)],
+                check=True, capture_output=True, text=True,
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(
+                f"{mode:>8} {sizes[mode] / 1e6:>8.1f} {r['import_s']:>9.3f} {r['load_s']:>7.3f} "
+                f"{r['first_predict_s']:>10.4f} {r['rss_mb']:>7.1f} {r['peak_rss_mb']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Measure batch scoring throughput (rows/s) as the worker count grows.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_batch_scoring --rows 1000000 --workers 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import make_headlines
+from src.models.predict_sentiment import score_file
+from src.nlp.embedder import NewsEmbedder
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--max-features", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        texts = make_headlines(args.rows)
+        source = tmp_dir / "news.parquet"
+        pd.DataFrame({"clean_text": texts}).to_parquet(source)
+
+        model_path = tmp_dir / "sentiment.joblib"
+        labels = np.random.default_rng(0).integers(-1, 2, size=min(args.rows, 50_000))
+        model = SentimentTransformer(embedder_model=NewsEmbedder(max_features=args.max_features))
+        model.fit(texts[: len(labels)], labels).save(model_path)
+
+        baseline = None
+        print(f"{'workers':>7} {'seconds':>8} {'rows/s':>10} {'speedup':>8}")
+        for workers in args.workers:
+            stats = score_file(
+                source, tmp_dir / f"scores_{workers}.parquet", model_path,
+                chunk_size=args.chunk_size, workers=workers,
+            )
+            baseline = baseline or stats["rows_per_second"]
+            print(
+                f"{workers:>7} {stats['seconds']:>8.2f} {stats['rows_per_second']:>10.0f} "
+                f"{stats['rows_per_second'] / baseline:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
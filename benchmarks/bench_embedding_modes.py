@@ -0,0 +1,63 @@
+"""Compare sparse and dense NewsEmbedder/SentimentTransformer memory and latency.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_embedding_modes --sizes 10000 100000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+
+from benchmarks._common import make_headlines, measure
+from src.nlp.embedder import NewsEmbedder
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+def run(rows: int, dense: bool, max_features: int) -> dict:
+    texts = make_headlines(rows)
+    labels = np.random.default_rng(0).integers(-1, 2, size=rows)
+    model = SentimentTransformer(embedder_model=NewsEmbedder(max_features=max_features, dense=dense))
+    with measure() as fit_stats:
+        model.fit(texts, labels)
+    with measure() as predict_stats:
+        model.predict_proba(texts)
+    return {
+        "rows": rows,
+        "mode": "dense" if dense else "sparse",
+        "fit_s": fit_stats["seconds"],
+        "fit_peak_mb": fit_stats["peak_mb"],
+        "predict_s": predict_stats["seconds"],
+        "predict_peak_mb": predict_stats["peak_mb"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--max-features", type=int, default=50_000)
+    parser.add_argument(
+        "--max-dense-gb",
+        type=float,
+        default=4.0,
+        help="Skip dense runs whose float64 matrix would exceed this size",
+    )
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'mode':>6} {'fit_s':>8} {'fit_MB':>9} {'pred_s':>8} {'pred_MB':>9}")
+    for rows in args.sizes:
+        for dense in (False, True):
+            dense_gb = rows * args.max_features * 8 / 1e9
+            if dense and dense_gb > args.max_dense_gb:
+                print(f"{rows:>9} {'dense':>6} skipped (would allocate ~{dense_gb:.0f} GB)")
+                continue
+            r = run(rows, dense, args.max_features)
+            print(
+                f"{r['rows']:>9} {r['mode']:>6} {r['fit_s']:>8.2f} {r['fit_peak_mb']:>9.1f} "
+                f"{r['predict_s']:>8.2f} {r['predict_peak_mb']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
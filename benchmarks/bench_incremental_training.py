@@ -0,0 +1,72 @@
+"""Daily retraining cost and accuracy: full TF-IDF refit vs hashing + partial_fit.
+
+Each simulated day both models are scored on the new day's headlines and then
+updated with them: the full model refits on all history so far, the online
+model folds in just the new day. Run from the repository root::
+
+    python -m benchmarks.bench_incremental_training --days 30 --rows-per-day 50000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import make_headlines
+from src.data.preprocess import sentiment_seed_labels
+from src.nlp.embedder import NewsEmbedder
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--rows-per-day", type=int, default=20_000)
+    parser.add_argument("--max-features", type=int, default=50_000)
+    args = parser.parse_args()
+
+    days = []
+    for day in range(args.days):
+        texts = make_headlines(args.rows_per_day, seed=day)
+        days.append((texts, sentiment_seed_labels(pd.Series(texts)).to_numpy()))
+
+    history_texts: list[str] = []
+    history_labels: list[np.ndarray] = []
+    full_model = online_model = None
+    totals = {"full": 0.0, "online": 0.0}
+    accuracy: dict[str, list[float]] = {"full": [], "online": []}
+
+    print(f"{'day':>4} {'history':>9} {'full_s':>8} {'online_s':>9} {'full_acc':>9} {'online_acc':>11}")
+    for day, (texts, labels) in enumerate(days):
+        if full_model is not None:
+            accuracy["full"].append(float((full_model.predict(texts) == labels).mean()))
+            accuracy["online"].append(float((online_model.predict(texts) == labels).mean()))
+
+        history_texts.extend(texts)
+        history_labels.append(labels)
+        start = time.perf_counter()
+        full_model = SentimentTransformer(embedder_model=NewsEmbedder(max_features=args.max_features))
+        full_model.fit(history_texts, np.concatenate(history_labels))
+        full_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        online_model = online_model or SentimentTransformer(online=True)
+        online_model.partial_fit(texts, labels)
+        online_s = time.perf_counter() - start
+
+        totals["full"] += full_s
+        totals["online"] += online_s
+        full_acc = accuracy["full"][-1] if accuracy["full"] else float("nan")
+        online_acc = accuracy["online"][-1] if accuracy["online"] else float("nan")
+        print(f"{day:>4} {len(history_texts):>9} {full_s:>8.2f} {online_s:>9.2f} {full_acc:>9.3f} {online_acc:>11.3f}")
+
+    print(
+        f"total  full={totals['full']:.1f}s online={totals['online']:.1f}s  "
+        f"mean next-day accuracy full={np.mean(accuracy['full']):.3f} online={np.mean(accuracy['online']):.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compare peak RSS and wall time of the news loaders against the legacy read path.
+
+Each mode runs in a fresh subprocess so its peak RSS is measured in isolation.
+Run from the repository root::
+
+    python -m benchmarks.bench_loaders --rows 5000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import make_headlines
+from src.data import fetch_data
+
+MODES = ["legacy", "load_news", "iter_news", "load_news_parquet", "iter_news_parquet"]
+
+
+def _write_fixture(directory: Path, rows: int) -> Path:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.Timestamp("2015-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 10 * 365 * 86400, rows)), unit="s"),
+            "headline": make_headlines(rows),
+            "source": rng.choice(["reuters", "bloomberg", "dj", "pr"], size=rows),
+            "body": make_headlines(rows, words_per_headline=40, seed=1),
+            "author": rng.choice([f"author{i}" for i in range(500)], size=rows),
+        }
+    )
+    csv_path = directory / "news.csv"
+    df.to_csv(csv_path, index=False)
+    df.to_parquet(directory / "news.parquet")
+    return csv_path
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM is reset on exec, unlike ru_maxrss which inherits the forking parent's peak.
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _run_mode(mode: str, csv_path: Path, chunksize: int) -> None:
+    start = time.perf_counter()
+    parquet_path = csv_path.with_suffix(".parquet")
+    rows = 0
+    if mode == "legacy":
+        df = pd.read_csv(csv_path)[fetch_data.DEFAULT_NEWS_COLUMNS]
+        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+        rows = len(df)
+    elif mode == "load_news":
+        rows = len(fetch_data.load_news(csv_path))
+    elif mode == "load_news_parquet":
+        rows = len(fetch_data.load_news(parquet_path))
+    else:
+        path = parquet_path if mode.endswith("parquet") else csv_path
+        for chunk in fetch_data.iter_news(path, chunksize=chunksize):
+            rows += len(chunk)
+    elapsed = time.perf_counter() - start
+    peak_mb = _peak_rss_mb()
+    print(json.dumps({"mode": mode, "rows": rows, "seconds": elapsed, "peak_rss_mb": peak_mb}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_mode(args.mode, Path(args.path), args.chunksize)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = _write_fixture(Path(tmp), args.rows)
+        print(f"{'mode':>18} {'rows':>9} {'seconds':>8} {'peak_RSS_MB':>12}")
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_loaders", "--mode", mode,
+                 "--path", str(csv_path), "--chunksize", str(args.chunksize)],
+                check=True, capture_output=True, text=True,
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{r['mode']:>18} {r['rows']:>9} {r['seconds']:>8.2f} {r['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
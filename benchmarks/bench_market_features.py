@@ -0,0 +1,55 @@
+"""Market feature engine against per-window rolling ``apply`` kernels, across window lengths.
+
+The engine's cost should stay flat as the lookback grows; the ``apply`` path
+(what ``helpers.rolling_apply`` did) grows with bars per window. Run from the
+repository root::
+
+    python -m benchmarks.bench_market_features --tickers 50 --days 250 --lookback-days 1 5 20
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.data import synthetic
+from src.data.market_features import market_features
+
+
+def rolling_apply_baseline(market: pd.DataFrame, lookback_days: float) -> pd.Series:
+    """Lookback return only, one Python call per window on a Series (``raw=False``)."""
+    window = f"{int(lookback_days * 24)}h"
+    parts = []
+    for _, group in market.groupby("ticker", sort=False, observed=True):
+        close = group.set_index("timestamp")["close"]
+        parts.append(close.rolling(window).apply(lambda x: x.iloc[-1] / x.iloc[0] - 1, raw=False))
+    return pd.concat(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--days", type=int, default=250)
+    parser.add_argument("--bars-per-day", type=int, default=26)
+    parser.add_argument("--lookback-days", type=float, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--skip-apply-above", type=int, default=500_000, help="Skip the apply baseline above this many bars")
+    args = parser.parse_args()
+
+    market = synthetic.make_market(args.tickers, days=args.days, bars_per_day=args.bars_per_day)
+    print(f"{len(market)} bars, {args.tickers} tickers")
+    print(f"{'lookback_d':>10} {'engine_s':>9} {'apply_s':>8}")
+    for lookback in args.lookback_days:
+        start = time.perf_counter()
+        market_features(market, lookback, by="ticker")
+        engine_s = time.perf_counter() - start
+        apply_s = float("nan")
+        if len(market) <= args.skip_apply_above:
+            start = time.perf_counter()
+            rolling_apply_baseline(market, lookback)
+            apply_s = time.perf_counter() - start
+        print(f"{lookback:>10g} {engine_s:>9.3f} {apply_s:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Scaling of the grouped ``merge_on_timestamps(by="ticker")`` against a per-ticker loop.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_merge --tickers 10 300 3000 --news-rows 100000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.merge_news_market import merge_on_timestamps
+
+
+def make_frames(tickers: int, news_rows: int, bars_per_ticker: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    symbols = np.array([f"T{i:04d}" for i in range(tickers)])
+    span = 365 * 86400
+    market_rows = tickers * bars_per_ticker
+    market = pd.DataFrame(
+        {
+            "timestamp": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, span, market_rows), unit="s"),
+            "ticker": np.repeat(symbols, bars_per_ticker),
+            "close": 100 + rng.normal(scale=1.0, size=market_rows).cumsum() / 100,
+            "volume": rng.integers(1_000, 10_000, market_rows),
+        }
+    )
+    news = pd.DataFrame(
+        {
+            "timestamp": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, span, news_rows), unit="s"),
+            "ticker": rng.choice(symbols, news_rows),
+            "clean_text": "synthetic headline",
+        }
+    )
+    return news, market
+
+
+def looped(news: pd.DataFrame, market: pd.DataFrame) -> pd.DataFrame:
+    parts = []
+    market_groups = dict(tuple(market.groupby("ticker")))
+    for ticker, group in news.groupby("ticker"):
+        if ticker in market_groups:
+            parts.append(merge_on_timestamps(group, market_groups[ticker].drop(columns="ticker")))
+    return pd.concat(parts, ignore_index=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[10, 300, 3000])
+    parser.add_argument("--news-rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--bars-per-ticker", type=int, default=500)
+    parser.add_argument("--skip-loop-above", type=int, default=1000, help="Skip the loop baseline above this many tickers")
+    args = parser.parse_args()
+
+    print(f"{'tickers':>7} {'news':>9} {'bars':>9} {'grouped_s':>10} {'loop_s':>8}")
+    for tickers in args.tickers:
+        for rows in args.news_rows:
+            news, market = make_frames(tickers, rows, args.bars_per_ticker)
+            start = time.perf_counter()
+            merge_on_timestamps(news, market, by="ticker")
+            grouped_s = time.perf_counter() - start
+            loop_s = float("nan")
+            if tickers <= args.skip_loop_above:
+                start = time.perf_counter()
+                looped(news, market)
+                loop_s = time.perf_counter() - start
+            print(f"{tickers:>7} {rows:>9} {len(market):>9} {grouped_s:>10.2f} {loop_s:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
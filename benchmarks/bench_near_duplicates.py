@@ -0,0 +1,84 @@
+"""MinHash/LSH near-duplicate detection against a naive pairwise Jaccard baseline.
+
+A share of the synthetic headlines is re-published minutes to hours later with
+a small edit (a word dropped, appended or replaced), like wire reprints. The
+LSH pass runs on every size; the pairwise baseline, quadratic in the rows
+inside each window, only up to ``--naive-rows`` and is also used to report
+the LSH recall and precision. Run from the repository root::
+
+    python -m benchmarks.bench_near_duplicates --rows 100000 1000000 2000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data import near_duplicates, preprocess, synthetic
+
+
+def with_reprints(rows: int, reprint_rate: float = 0.1, seed: int = 7) -> pd.DataFrame:
+    """Cleaned synthetic news plus edited, delayed copies of ``reprint_rate`` of the rows."""
+    rng = np.random.default_rng(seed)
+    news = preprocess.clean_news(synthetic.make_news(int(rows / (1 + reprint_rate)), seed=seed))
+    copies = news.sample(frac=reprint_rate, random_state=seed).reset_index(drop=True)
+    words = copies["clean_text"].str.split(" ")
+    edit = rng.integers(0, 3, len(copies))
+    edited = [
+        " ".join(w[:-1] if e == 0 and len(w) > 3 else w + ["update"] if e == 1 else w[:-1] + ["revised"])
+        for w, e in zip(words, edit)
+    ]
+    copies["clean_text"] = edited
+    copies["timestamp"] = copies["timestamp"] + pd.to_timedelta(rng.integers(60, 6 * 3600, len(copies)), unit="s")
+    return pd.concat([news, copies], ignore_index=True).sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+def naive_duplicates(texts: pd.Series, times: pd.Series, threshold: float, window: pd.Timedelta) -> np.ndarray:
+    """Exact word-bigram Jaccard of every pair inside the window."""
+    shingles = [
+        frozenset(zip(words, words[1:])) if len(words) > 1 else frozenset([tuple(words)])
+        for words in (text.split(" ") for text in texts)
+    ]
+    stamps = times.to_numpy()
+    duplicate = np.zeros(len(shingles), dtype=bool)
+    first = 0
+    for i, current in enumerate(shingles):
+        while stamps[i] - stamps[first] > window:
+            first += 1
+        for j in range(first, i):
+            union = len(current | shingles[j])
+            if union and len(current & shingles[j]) / union >= threshold:
+                duplicate[i] = True
+                break
+    return duplicate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000, 200_000, 1_000_000])
+    parser.add_argument("--naive-rows", type=int, default=20_000, help="Largest size the pairwise baseline runs on")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--window-days", type=float, default=1.0)
+    args = parser.parse_args()
+
+    window = pd.Timedelta(days=args.window_days)
+    print(f"{'rows':>9} {'lsh_s':>7} {'flagged':>8} {'naive_s':>8} {'recall':>7} {'precision':>9}")
+    for rows in args.rows:
+        news = with_reprints(rows)
+        start = time.perf_counter()
+        lsh = near_duplicates.near_duplicate_mask(news["clean_text"], news["timestamp"], args.threshold, window)
+        lsh_s = time.perf_counter() - start
+        naive_s = recall = precision = float("nan")
+        if len(news) <= args.naive_rows:
+            start = time.perf_counter()
+            exact = naive_duplicates(news["clean_text"], news["timestamp"], args.threshold, window)
+            naive_s = time.perf_counter() - start
+            recall = (lsh & exact).sum() / max(exact.sum(), 1)
+            precision = (lsh & exact).sum() / max(lsh.sum(), 1)
+        print(f"{len(news):>9} {lsh_s:>7.2f} {lsh.mean():>8.2%} {naive_s:>8.2f} {recall:>7.3f} {precision:>9.3f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
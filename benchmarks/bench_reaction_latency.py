@@ -0,0 +1,79 @@
+"""Reaction-model predict latency for single headlines and 10k-row batches.
+
+Starts from the sentiment model's ``(preds, probas)`` output, as the scoring
+service does, and times four ways to reach the predicted reaction:
+
+* ``frame+sklearn``: build the feature frame, then the regressor's ``predict``
+  on the training columns (the path before ``ReactionPredictor``)
+* ``predict_frame``: the same frame through the cached column positions
+* ``predict_array``: a float matrix already in the schema's column order
+* ``predict_sentiment``: straight from ``(preds, probas)``, no frame at all
+
+Run from the repository root::
+
+    python -m benchmarks.bench_reaction_latency --batch 1 10000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from src.models import market_reaction_model
+from src.nlp.feature_engineering import sentiment_feature_frame
+
+
+CLASSES = np.array([-1, 0, 1])
+
+
+def _fitted(rows: int = 5_000, seed: int = 3):
+    from sklearn.linear_model import LinearRegression
+
+    rng = np.random.default_rng(seed)
+    probas = rng.dirichlet(np.ones(3), rows)
+    preds = CLASSES[probas.argmax(axis=1)]
+    features = sentiment_feature_frame(preds, probas, CLASSES)
+    reaction = probas @ np.array([-0.01, 0.0, 0.012]) + rng.normal(0, 0.003, rows)
+    return LinearRegression().fit(features, reaction)
+
+
+def _per_call_us(call: Callable[[], Any], min_seconds: float = 0.5) -> float:
+    call()
+    calls, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_seconds:
+        call()
+        calls += 1
+    return elapsed / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 10_000])
+    args = parser.parse_args()
+
+    regressor = _fitted()
+    predictor = market_reaction_model.reaction_predictor(regressor)
+    names = list(regressor.feature_names_in_)
+    rng = np.random.default_rng(0)
+    print(f"{'batch':>7} {'path':>18} {'us/call':>10} {'us/row':>8}")
+    for batch in args.batch:
+        probas = rng.dirichlet(np.ones(3), batch)
+        preds = CLASSES[probas.argmax(axis=1)]
+        matrix = sentiment_feature_frame(preds, probas, CLASSES)[names].to_numpy()
+        paths = {
+            "frame+sklearn": lambda: regressor.predict(sentiment_feature_frame(preds, probas, CLASSES)[names]),
+            "predict_frame": lambda: predictor.predict_frame(sentiment_feature_frame(preds, probas, CLASSES)),
+            "predict_array": lambda: predictor.predict_array(matrix),
+            "predict_sentiment": lambda: predictor.predict_sentiment(preds, probas, CLASSES),
+        }
+        reference = paths["frame+sklearn"]()
+        for name, call in paths.items():
+            np.testing.assert_allclose(call(), reference, atol=1e-12)
+            us = _per_call_us(call)
+            print(f"{batch:>7} {name:>18} {us:>10.1f} {us / batch:>8.3f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""One month's query against the partitioned store versus reading a single Parquet file and filtering.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_store --rows 2000000 --tickers 200 --days 1000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks._common import measure
+from src.data import preprocess, store, synthetic
+
+
+COLUMNS = ["timestamp", "ticker", "sentiment_seed"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--days", type=int, default=1_000)
+    parser.add_argument("--start", default="2025-03-01")
+    parser.add_argument("--end", default="2025-04-01")
+    args = parser.parse_args()
+
+    news = preprocess.add_sentiment_seed(
+        preprocess.clean_news(synthetic.make_news(args.rows, tickers=args.tickers, days=args.days))
+    )
+    ticker = news["ticker"].iloc[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        single, root = Path(tmp) / "news.parquet", Path(tmp) / "news"
+        news.to_parquet(single, index=False)
+        start = time.perf_counter()
+        store.write_dataset(news, root)
+        print(f"{len(news)} rows; dataset written in {time.perf_counter() - start:.2f}s")
+
+        window = (pd.Timestamp(args.start), pd.Timestamp(args.end))
+        print(f"{'query':<28} {'rows':>8} {'seconds':>8} {'peak_mb':>8}")
+        for label, tickers in [("month", None), ("month, one ticker", [ticker])]:
+            with measure() as full:
+                frame = pd.read_parquet(single, columns=COLUMNS)
+                frame = frame[frame["timestamp"].between(*window, inclusive="left")]
+                if tickers is not None:
+                    frame = frame[frame["ticker"].isin(tickers)]
+            print(f"{'full read, ' + label:<28} {len(frame):>8} {full['seconds']:>8.3f} {full['peak_mb']:>8.1f}")
+            with measure() as pushed:
+                frame = store.read_dataset(root, COLUMNS, start=args.start, end=args.end, tickers=tickers)
+            print(f"{'store, ' + label:<28} {len(frame):>8} {pushed['seconds']:>8.3f} {pushed['peak_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Closed-loop load test against a running scoring service.
+
+Start the service first, e.g.::
+
+    python -m src.models.scoring_service --config config.yaml --port 8080
+
+then run from the repository root::
+
+    python -m benchmarks.load_test_service --port 8080 --concurrency 64 --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from benchmarks._common import make_headlines
+
+
+class Client:
+    """One keep-alive HTTP connection (TCP or Unix socket)."""
+
+    def __init__(self, host: str, port: int, unix_socket: str | None) -> None:
+        self.host, self.port, self.unix_socket = host, port, unix_socket
+
+    async def connect(self) -> None:
+        if self.unix_socket:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.unix_socket)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, path: str, payload: dict | None = None) -> dict:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+        await self.reader.readline()
+        length = 0
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return json.loads(await self.reader.readexactly(length))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+async def run(args: argparse.Namespace) -> None:
+    headlines = make_headlines(10_000)
+    latencies: list[float] = []
+    counter = iter(range(args.requests))
+
+    async def worker() -> None:
+        client = Client(args.host, args.port, args.unix_socket)
+        await client.connect()
+        try:
+            for i in counter:
+                batch = [headlines[(i * args.batch + j) % len(headlines)] for j in range(args.batch)]
+                start = time.perf_counter()
+                await client.request("POST", "/score", {"headlines": batch})
+                latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    metrics_client = Client(args.host, args.port, args.unix_socket)
+    await metrics_client.connect()
+    server_metrics = await metrics_client.request("GET", "/metrics")
+    metrics_client.close()
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"requests={len(latencies)} concurrency={args.concurrency} headlines/request={args.batch}")
+    print(f"throughput={len(latencies) / elapsed:.0f} req/s  client p50={p50:.2f}ms p99={p99:.2f}ms")
+    print(f"server metrics: {json.dumps(server_metrics)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix-socket")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--batch", type=int, default=1, help="Headlines per request")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Benchmark suite over synthetic data with stored baselines and a regression check.
+
+Each case times one hot path on data from ``src.data.synthetic``; set-up work
+(generating data, fitting the model a predict case needs) and one warm-up call
+are not timed. Run from the repository root::
+
+    python -m benchmarks.suite --scale small                  # print timings
+    python -m benchmarks.suite --scale small --save-baseline  # store benchmarks/baselines/small.json
+    python -m benchmarks.suite --scale small --check          # exit 1 on regressions
+
+``--check`` compares the best-of-``--repeat`` time of every case against the
+stored baseline and fails when it is more than ``--tolerance`` times slower.
+Baselines are machine specific: re-save them after changing hardware.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+from src.analysis.event_study import compute_event_windows
+from src.data import preprocess, synthetic
+from src.data.market_features import add_market_features
+from src.data.merge_news_market import add_horizon_targets, merge_on_timestamps
+from src.models import artifacts
+from src.nlp.embedder import NewsEmbedder
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+SCALES = {
+    "tiny": {"news": 2_000, "tickers": 5, "days": 20, "bars_per_day": 13},
+    "small": {"news": 50_000, "tickers": 50, "days": 120, "bars_per_day": 26},
+    "medium": {"news": 500_000, "tickers": 300, "days": 250, "bars_per_day": 26},
+    "large": {"news": 5_000_000, "tickers": 2_000, "days": 250, "bars_per_day": 26},
+}
+
+
+@dataclass
+class Workload:
+    """Synthetic inputs at one scale, with derived frames built on first use."""
+
+    news: pd.DataFrame
+    market: pd.DataFrame
+    cache: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def generate(cls, scale: str, seed: int = 42) -> "Workload":
+        size = SCALES[scale]
+        news = synthetic.make_news(size["news"], tickers=size["tickers"], days=size["days"], seed=seed)
+        market = synthetic.make_market(size["tickers"], days=size["days"], bars_per_day=size["bars_per_day"], seed=seed)
+        return cls(news, market)
+
+    def derived(self, name: str, build: Callable[[], Any]) -> Any:
+        if name not in self.cache:
+            self.cache[name] = build()
+        return self.cache[name]
+
+    @property
+    def clean(self) -> pd.DataFrame:
+        return self.derived("clean", lambda: preprocess.add_sentiment_seed(preprocess.clean_news(self.news)))
+
+    @property
+    def model(self) -> SentimentTransformer:
+        def fit() -> SentimentTransformer:
+            clean = self.clean
+            return SentimentTransformer(NewsEmbedder(max_features=5_000)).fit(clean["clean_text"], clean["sentiment_seed"])
+
+        return self.derived("model", fit)
+
+
+def _preprocess(work: Workload) -> Callable[[], Any]:
+    return lambda: preprocess.add_sentiment_seed(preprocess.clean_news(work.news))
+
+
+def _merge(work: Workload) -> Callable[[], Any]:
+    clean = work.clean
+    return lambda: merge_on_timestamps(clean, work.market, by="ticker")
+
+
+def _market_features(work: Workload) -> Callable[[], Any]:
+    clean = work.clean
+    return lambda: add_market_features(clean, work.market, lookback_days=5, by="ticker")
+
+
+def _horizon_targets(work: Workload) -> Callable[[], Any]:
+    clean = work.clean
+    return lambda: add_horizon_targets(clean, work.market, horizons_days=(1, 3, 5, 10), by="ticker")
+
+
+def _embed(work: Workload) -> Callable[[], Any]:
+    texts = work.clean["clean_text"]
+    return lambda: NewsEmbedder(max_features=5_000).fit_transform(texts)
+
+
+def _fit(work: Workload) -> Callable[[], Any]:
+    texts, labels = work.clean["clean_text"], work.clean["sentiment_seed"]
+    return lambda: SentimentTransformer(NewsEmbedder(max_features=5_000)).fit(texts, labels)
+
+
+def _predict(work: Workload) -> Callable[[], Any]:
+    model, texts = work.model, work.clean["clean_text"]
+    return lambda: model.predict_with_proba(texts)
+
+
+def _predict_compact(work: Workload) -> Callable[[], Any]:
+    directory = Path(tempfile.mkdtemp(prefix="bench-compact-"))
+    compact = artifacts.load_sentiment(artifacts.export_sentiment(work.model, directory))
+    texts = work.clean["clean_text"]
+    return lambda: compact.predict_with_proba(texts)
+
+
+def _event_study(work: Workload) -> Callable[[], Any]:
+    ticker = work.market["ticker"].iloc[0]
+    market = work.market[work.market["ticker"] == ticker]
+    events = work.clean[["timestamp"]]
+    return lambda: compute_event_windows(events, market, window=5)
+
+
+CASES: dict[str, Callable[[Workload], Callable[[], Any]]] = {
+    "preprocess": _preprocess,
+    "merge": _merge,
+    "market_features": _market_features,
+    "horizon_targets": _horizon_targets,
+    "embed": _embed,
+    "fit": _fit,
+    "predict": _predict,
+    "predict_compact": _predict_compact,
+    "event_study": _event_study,
+}
+
+
+def run_suite(scale: str, cases: list[str] | None = None, repeat: int = 3) -> dict[str, Any]:
+    """Time each case *repeat* times and return the result document."""
+    work = Workload.generate(scale)
+    results = {}
+    for name in cases or list(CASES):
+        call = CASES[name](work)
+        call()  # warm-up: lazy imports and first-touch allocations stay out of the timings
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+        results[name] = {"min_seconds": min(timings), "median_seconds": statistics.median(timings)}
+        print(f"{name:<16} min {min(timings):8.3f}s  median {statistics.median(timings):8.3f}s", flush=True)
+    return {
+        "scale": scale,
+        "rows": {"news": len(work.news), "market": len(work.market)},
+        "machine": {"platform": platform.platform(), "python": platform.python_version(), "processor": platform.processor()},
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float = 1.5) -> list[str]:
+    """Describe every case whose best time exceeds ``tolerance`` x the baseline's."""
+    regressions = []
+    for name, stats in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = stats["min_seconds"] / max(reference["min_seconds"], 1e-9)
+        if ratio > tolerance:
+            regressions.append(f"{name}: {stats['min_seconds']:.3f}s vs {reference['min_seconds']:.3f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--cases", nargs="*", choices=CASES, help="Subset of cases to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the baseline for this scale")
+    parser.add_argument("--check", action="store_true", help="Fail when a case regressed against the baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed slowdown factor for --check")
+    parser.add_argument("--output", type=Path, help="Also write this run's results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    current = run_suite(args.scale, args.cases, args.repeat)
+    baseline_path = BASELINE_DIR / f"{args.scale}.json"
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {baseline_path}")
+    if args.check:
+        if not baseline_path.exists():
+            print(f"no baseline at {baseline_path}; run with --save-baseline first")
+            return 1
+        regressions = compare(current, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.tolerance:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+"""Lightweight batch scoring entry point.
+
+Scores a CSV or Parquet file of headlines without importing training or
+plotting code; with a compact artifact it does not import scikit-learn either::
+
+    python score.py data/raw/news.csv data/processed/scored.parquet --workers 4
+"""
+from __future__ import annotations
+
+import sys
+
+from src.models.predict_sentiment import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,370 @@
-"""Correlation helpers between sentiment metrics and market reactions."""
+"""Correlation helpers between sentiment metrics and market reactions.
+
+Correlations of many feature columns against one target are computed from
+per-group sums (``n``, ``Σx``, ``Σy``, ``Σx²``, ``Σy²``, ``Σxy``) gathered in a
+single pass with a sparse group-indicator product, so grouping by ticker,
+source or month costs no more than the ungrouped case and sparse feature
+matrices (e.g. TF-IDF) are never densified. Missing values are excluded
+pairwise, as in ``DataFrame.corr``.
+
+The sums are mergeable: ``CorrelationAccumulator`` keeps them between calls so
+Pearson correlations can be updated batch by batch (say, one day of merged
+news at a time) and accumulators built on separate shards combined.
+"""
 from __future__ import annotations
 
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Literal
+
+import numpy as np
 import pandas as pd
+from scipy import sparse
+
+Method = Literal["pearson", "spearman"]
+MOMENTS = ("n", "sx", "sy", "sxx", "syy", "sxy")
+RESULT_COLUMNS = ["feature", "n", "correlation", "p_value"]
+# Bootstrap replicates per pool task; fixed so results do not depend on ``n_jobs``.
+REPLICATES_PER_TASK = 50
+
+# Data shipped once to each pool worker by ``_init_worker``.
+_WORKER_DATA: dict[str, Any] = {}
+
+
+def _indicator(codes: np.ndarray, n_groups: int) -> sparse.csr_matrix:
+    """``(n_groups, n_rows)`` 0/1 matrix; multiplying by it sums rows per group."""
+    return sparse.csr_matrix(
+        (np.ones(len(codes)), (codes, np.arange(len(codes)))), shape=(n_groups, len(codes))
+    )
+
+
+def _moments(
+    X: np.ndarray | sparse.spmatrix,
+    y: np.ndarray,
+    codes: np.ndarray,
+    n_groups: int,
+    shift_x: np.ndarray,
+    shift_y: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Per-group, per-feature sums of the shifted values over pairwise-complete rows.
+
+    *y* is one target column, or an ``(n_rows, n_features)`` matrix pairing a
+    separate target column with each feature (Spearman ranks). Sparse *X* must
+    be NaN free and is not shifted, which would densify it.
+    """
+    G = _indicator(codes, n_groups)
+    n_features = X.shape[1]
+    if sparse.issparse(X):
+        X = sparse.csr_matrix(X, dtype=np.float64)
+        yc = y - shift_y
+        ones = np.ones((len(yc), 1))
+        return {
+            "n": np.repeat(G @ ones, n_features, axis=1),
+            "sx": np.asarray((G @ X).todense()),
+            "sy": np.repeat(G @ yc[:, None], n_features, axis=1),
+            "sxx": np.asarray((G @ X.multiply(X)).todense()),
+            "syy": np.repeat(G @ (yc**2)[:, None], n_features, axis=1),
+            "sxy": np.asarray((G @ X.multiply(yc[:, None])).todense()),
+        }
+    Xc = X - shift_x
+    Yc = np.broadcast_to((y if y.ndim == 2 else y[:, None]) - shift_y, Xc.shape)
+    present = ~(np.isnan(Xc) | np.isnan(Yc))
+    Xc, Yc = np.where(present, Xc, 0.0), np.where(present, Yc, 0.0)
+    return {
+        "n": G @ present.astype(np.float64),
+        "sx": G @ Xc,
+        "sy": G @ Yc,
+        "sxx": G @ Xc**2,
+        "syy": G @ Yc**2,
+        "sxy": G @ (Xc * Yc),
+    }
+
+
+def _reshift(moments: dict[str, np.ndarray], dx: np.ndarray, dy: np.ndarray) -> dict[str, np.ndarray]:
+    """Sums of values shifted by ``+dx``/``+dy`` from the sums of the original values."""
+    n, sx, sy = moments["n"], moments["sx"], moments["sy"]
+    return {
+        "n": n,
+        "sx": sx + n * dx,
+        "sy": sy + n * dy,
+        "sxx": moments["sxx"] + 2 * dx * sx + n * dx**2,
+        "syy": moments["syy"] + 2 * dy * sy + n * dy**2,
+        "sxy": moments["sxy"] + dx * sy + dy * sx + n * dx * dy,
+    }
+
+
+def _pearson(moments: dict[str, np.ndarray]) -> np.ndarray:
+    n = moments["n"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = moments["sxy"] - moments["sx"] * moments["sy"] / n
+        var_x = moments["sxx"] - moments["sx"] ** 2 / n
+        var_y = moments["syy"] - moments["sy"] ** 2 / n
+        r = cov / np.sqrt(var_x * var_y)
+        # Variances at rounding-error level mean a constant column.
+        flat = (n < 3) | (var_x <= 1e-12 * moments["sxx"]) | (var_y <= 1e-12 * moments["syy"])
+    return np.where(flat, np.nan, np.clip(r, -1.0, 1.0))
+
+
+def _p_value(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Two-sided p-value of ``r != 0`` from Student's t with ``n - 2`` degrees of freedom."""
+    from scipy import stats
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r * np.sqrt((n - 2) / (1.0 - r**2))
+        return 2 * stats.t.sf(np.abs(t), n - 2)
+
+
+def _group_codes(labels: Any, n_rows: int) -> tuple[np.ndarray, pd.Index]:
+    """Sorted group codes for *labels* (``None`` means one group); rows with a missing label get -1."""
+    if labels is None:
+        return np.zeros(n_rows, dtype=np.int64), pd.Index([None])
+    codes, uniques = pd.factorize(pd.Series(labels).to_numpy(), sort=True)
+    return codes.astype(np.int64), pd.Index(uniques)
+
+
+def _ranks(values: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Average ranks of each column within its group; NaN stays NaN."""
+    return pd.DataFrame(values).groupby(codes).rank().to_numpy(dtype=np.float64)
+
+
+def _spearman_inputs(X: np.ndarray, y: np.ndarray, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Ranked features and, per feature, the target ranked over the rows where that feature is present."""
+    present = ~np.isnan(X)
+    if present.all():
+        return _ranks(X, codes), _ranks(y[:, None], codes)[:, 0]
+    Y = np.where(present, y[:, None], np.nan)
+    return _ranks(X, codes), _ranks(Y, codes)
+
+
+def _correlations(X: Any, y: np.ndarray, codes: np.ndarray, n_groups: int, method: Method) -> tuple[np.ndarray, np.ndarray]:
+    """``(correlation, n)`` arrays of shape ``(n_groups, n_features)``."""
+    if method == "spearman":
+        if sparse.issparse(X):
+            raise ValueError("spearman correlation needs a dense feature matrix")
+        X, y = _spearman_inputs(X, y, codes)
+    elif method != "pearson":
+        raise ValueError(f"unknown method {method}")
+    if sparse.issparse(X):
+        shift_x, shift_y = np.zeros(X.shape[1]), np.nanmean(y) if len(y) else 0.0
+    else:
+        shift_x = np.nan_to_num(np.nanmean(X, axis=0)) if len(X) else np.zeros(X.shape[1])
+        shift_y = np.nan_to_num(np.nanmean(y, axis=0)) if len(y) else 0.0
+    moments = _moments(X, y, codes, n_groups, shift_x, shift_y)
+    return _pearson(moments), moments["n"]
+
+
+def _result_frame(
+    r: np.ndarray, n: np.ndarray, names: list[str], groups: pd.Index, by_name: str | None
+) -> pd.DataFrame:
+    result = pd.DataFrame(
+        {
+            "feature": np.tile(names, len(groups)),
+            "n": n.ravel().astype(np.int64),
+            "correlation": r.ravel(),
+            "p_value": _p_value(r, n).ravel(),
+        }
+    )
+    if by_name is not None:
+        result.insert(0, by_name, np.repeat(groups.to_numpy(), len(names)))
+    return result
+
+
+def correlate_matrix(
+    X: np.ndarray | sparse.spmatrix,
+    y: Iterable[float],
+    feature_names: Iterable[str] | None = None,
+    groups: Iterable | None = None,
+    method: Method = "pearson",
+    group_name: str = "group",
+) -> pd.DataFrame:
+    """Correlate every column of *X* (dense or sparse) with *y*, optionally per group label in *groups*.
+
+    Returns one row per (group, feature) with ``n``, ``correlation`` and the
+    two-sided ``p_value``; correlations with fewer than three pairs or a
+    constant side are NaN. Rows with a missing *y* are ignored.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    X = X if sparse.issparse(X) else np.asarray(X, dtype=np.float64).reshape(len(y), -1)
+    names = list(feature_names) if feature_names is not None else [str(i) for i in range(X.shape[1])]
+    codes, uniques = _group_codes(groups, len(y))
+    keep = ~np.isnan(y) & (codes >= 0)
+    if not keep.all():
+        X, y, codes = X[keep], y[keep], codes[keep]
+    r, n = _correlations(X, y, codes, len(uniques), method)
+    return _result_frame(r, n, names, uniques, group_name if groups is not None else None)
+
+
+def _frame_inputs(
+    df: pd.DataFrame, features: Iterable[str] | None, target: str, by: str | Iterable | None
+) -> tuple[list[str], Any, str | None]:
+    features = list(features) if features is not None else [c for c in df.columns if c.startswith("sentiment_prob_")]
+    missing = [col for col in [*features, target] if col not in df.columns]
+    if not features or missing:
+        raise KeyError(f"required columns missing: {missing or 'no feature columns'}")
+    if isinstance(by, str):
+        return features, df[by], by
+    if by is not None:
+        return features, by, getattr(by, "name", None) or "group"
+    return features, None, None
+
+
+def correlate(
+    df: pd.DataFrame,
+    features: Iterable[str] | None = None,
+    target: str = "reaction",
+    method: Method = "pearson",
+    by: str | Iterable | None = None,
+) -> pd.DataFrame:
+    """Correlation of each feature column (default: ``sentiment_prob_*``) with *target*.
+
+    *by* is a column name or per-row labels (e.g. ``df["timestamp"].dt.to_period("M")``);
+    every group is computed in the same pass.
+    """
+    features, labels, by_name = _frame_inputs(df, features, target, by)
+    result = correlate_matrix(df[features].to_numpy(dtype=np.float64), df[target], features, labels, method)
+    return result.rename(columns={"group": by_name}) if by_name is not None else result
+
+
+def _init_worker(data: dict[str, Any]) -> None:
+    _WORKER_DATA.clear()
+    _WORKER_DATA.update(data)
+
+
+def _bootstrap_task(seed: np.random.SeedSequence, replicates: int) -> np.ndarray:
+    """Correlations of *replicates* resamples, each drawn with replacement within every group."""
+    X, y, codes, n_groups, method = (_WORKER_DATA[key] for key in ("X", "y", "codes", "n_groups", "method"))
+    rng = np.random.default_rng(seed)
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = (np.cumsum(sizes) - sizes)[sorted_codes]
+    out = np.empty((replicates, n_groups, X.shape[1]))
+    for i in range(replicates):
+        sample = order[starts + (rng.random(len(order)) * sizes[sorted_codes]).astype(np.int64)]
+        out[i] = _correlations(X[sample], y[sample], sorted_codes, n_groups, method)[0]
+    return out
+
+
+def bootstrap_ci(
+    df: pd.DataFrame,
+    features: Iterable[str] | None = None,
+    target: str = "reaction",
+    method: Method = "pearson",
+    by: str | Iterable | None = None,
+    n_boot: int = 1_000,
+    confidence: float = 0.95,
+    n_jobs: int = 1,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """``correlate`` plus percentile bootstrap ``ci_low``/``ci_high`` columns.
+
+    Rows are resampled within each group, so every replicate keeps the group
+    sizes. Replicates are split into fixed-size tasks with their own seeds and
+    run on ``n_jobs`` processes; the intervals do not depend on ``n_jobs``.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    features, labels, by_name = _frame_inputs(df, features, target, by)
+    result = correlate(df, features, target, method, by)
+    y = df[target].to_numpy(dtype=np.float64)
+    codes, uniques = _group_codes(labels, len(df))
+    keep = ~np.isnan(y) & (codes >= 0)
+    data = {
+        "X": df[features].to_numpy(dtype=np.float64)[keep],
+        "y": y[keep],
+        "codes": codes[keep],
+        "n_groups": len(uniques),
+        "method": method,
+    }
+    sizes = [min(REPLICATES_PER_TASK, n_boot - start) for start in range(0, n_boot, REPLICATES_PER_TASK)]
+    arguments = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+    if n_jobs > 1 and len(arguments) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(arguments)), initializer=_init_worker, initargs=(data,)) as pool:
+            blocks = list(pool.map(_bootstrap_task, *zip(*arguments)))
+    else:
+        _init_worker(data)
+        try:
+            blocks = [_bootstrap_task(*argument) for argument in arguments]
+        finally:
+            _WORKER_DATA.clear()
+    replicates = np.concatenate(blocks).reshape(n_boot, -1)
+    tail = (1 - confidence) / 2 * 100
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # groups too small to ever give a correlation
+        result["ci_low"], result["ci_high"] = np.nanpercentile(replicates, [tail, 100 - tail], axis=0)
+    return result
+
+
+@dataclass
+class CorrelationAccumulator:
+    """Mergeable Pearson sums of *features* against *target*, per value of the *by* column.
+
+    ``update`` adds a batch, ``merge`` adds another accumulator's sums and
+    ``result`` reports the same frame as ``correlate`` for all data seen so
+    far. Sums are kept relative to the first batch's means, so they stay
+    accurate for data far from zero.
+    """
+
+    features: list[str]
+    target: str = "reaction"
+    by: str | None = None
+    groups: list = field(default_factory=list)
+    shift_x: np.ndarray | None = None
+    shift_y: np.ndarray | None = None
+    moments: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def _grow(self, labels: Iterable) -> None:
+        """Append unseen group labels, with zero sums."""
+        known = set(self.groups)
+        self.groups.extend(label for label in labels if label not in known)
+        shape = (len(self.groups), len(self.features))
+        for key in MOMENTS:
+            current = self.moments.get(key, np.zeros((0, shape[1])))
+            if current.shape != shape:
+                self.moments[key] = np.vstack([current, np.zeros((shape[0] - current.shape[0], shape[1]))])
+
+    def _codes(self, df: pd.DataFrame) -> np.ndarray:
+        if self.by is None:
+            self._grow([None])
+            return np.zeros(len(df), dtype=np.int64)
+        labels = df[self.by]
+        self._grow(pd.unique(labels.dropna()))
+        return pd.Index(self.groups).get_indexer(labels)
+
+    def update(self, df: pd.DataFrame) -> "CorrelationAccumulator":
+        X = df[self.features].to_numpy(dtype=np.float64)
+        y = df[self.target].to_numpy(dtype=np.float64)
+        if self.shift_x is None:
+            self.shift_x = np.nan_to_num(np.nanmean(X, axis=0)) if len(X) else np.zeros(len(self.features))
+            self.shift_y = np.full(len(self.features), np.nan_to_num(np.nanmean(y)) if len(y) else 0.0)
+        codes = self._codes(df)
+        keep = (codes >= 0) & ~np.isnan(y)
+        batch = _moments(X[keep], y[keep], codes[keep], len(self.groups), self.shift_x, self.shift_y)
+        for key in MOMENTS:
+            self.moments[key] += batch[key]
+        return self
+
+    def merge(self, other: "CorrelationAccumulator") -> "CorrelationAccumulator":
+        if (other.features, other.target, other.by) != (self.features, self.target, self.by):
+            raise ValueError("accumulators track different columns")
+        if other.shift_x is None:
+            return self
+        if self.shift_x is None:
+            self.shift_x, self.shift_y = other.shift_x.copy(), other.shift_y.copy()
+        self._grow(other.groups)
+        shifted = _reshift(other.moments, other.shift_x - self.shift_x, other.shift_y - self.shift_y)
+        rows = [self.groups.index(label) for label in other.groups]
+        for key in MOMENTS:
+            self.moments[key][rows] += shifted[key]
+        return self
+
+    def result(self) -> pd.DataFrame:
+        if not self.moments:
+            return pd.DataFrame(columns=([self.by] if self.by else []) + RESULT_COLUMNS)
+        result = _result_frame(_pearson(self.moments), self.moments["n"], self.features, pd.Index(self.groups), self.by)
+        # Groups are stored in arrival order; report them sorted like ``correlate``.
+        return result.sort_values(self.by, kind="stable", ignore_index=True) if self.by is not None else result
 
 
 def sentiment_reaction_correlation(df: pd.DataFrame) -> pd.Series:
@@ -9,5 +372,5 @@ def sentiment_reaction_correlation(df: pd.DataFrame) -> pd.Series:
     feature_cols = [col for col in df.columns if col.startswith("sentiment_prob_")]
     if not feature_cols or "reaction" not in df.columns:
         raise KeyError("required columns missing")
-    corr = df[feature_cols + ["reaction"]].corr()["reaction"].drop("reaction")
-    return corr.sort_values(ascending=False)
+    corr = correlate(df, feature_cols, "reaction").set_index("feature")["correlation"].rename("reaction")
+    return corr.rename_axis(None).sort_values(ascending=False)
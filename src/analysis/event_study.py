@@ -1,49 +1,157 @@
 """Event study helpers for understanding post-news market moves."""
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 
 from src.utils.helpers import ensure_datetime
 
 
+DAY_NS = 86_400 * 10**9
+
+
+def _as_ns(values: pd.Series) -> np.ndarray:
+    return values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def _market_returns(market_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    market_df = ensure_datetime(market_df[["timestamp", "close"]], "timestamp").sort_values("timestamp", kind="stable")
+    returns = market_df["close"].pct_change().fillna(0.0).to_numpy(dtype=np.float64)
+    return _as_ns(market_df["timestamp"]), returns
+
+
+def iter_event_blocks(
+    event_times: np.ndarray,
+    market_times: np.ndarray,
+    returns: np.ndarray,
+    window: int,
+    block_size: int = 10_000,
+) -> Iterator[tuple[slice, np.ndarray]]:
+    """Yield ``(event_slice, matrix)`` blocks of the event x relative-day return matrix.
+
+    ``event_times`` and ``market_times`` are int64 nanoseconds, the latter sorted.
+    Column ``j`` of each matrix holds the summed returns of bars falling ``j - window``
+    whole days from the event (NaN when there are none). Only one block of
+    events is materialised at a time.
+    """
+    width = 2 * window + 1
+    for start in range(0, len(event_times), block_size):
+        block = event_times[start:start + block_size]
+        lo = np.searchsorted(market_times, block - window * DAY_NS, side="left")
+        hi = np.searchsorted(market_times, block + window * DAY_NS, side="right")
+        counts = hi - lo
+        event_idx = np.repeat(np.arange(len(block)), counts)
+        # Positions lo[i]..hi[i]-1 for every event, flattened without a Python loop.
+        bar_idx = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts)
+        offsets = (market_times[bar_idx] - block[event_idx]) // DAY_NS + window
+        cells = event_idx * width + offsets
+        size = len(block) * width
+        sums = np.bincount(cells, weights=returns[bar_idx], minlength=size)
+        filled = np.bincount(cells, minlength=size) > 0
+        yield slice(start, start + len(block)), np.where(filled, sums, np.nan).reshape(len(block), width)
+
+
+def event_return_matrix(
+    events_df: pd.DataFrame,
+    market_df: pd.DataFrame,
+    window: int = 3,
+) -> pd.DataFrame:
+    """Return the full event x relative-day return matrix (columns ``-window..window``)."""
+    if window <= 0:
+        raise ValueError("window must be positive")
+    events_df = ensure_datetime(events_df, "timestamp")
+    market_times, returns = _market_returns(market_df)
+    blocks = [m for _, m in iter_event_blocks(_as_ns(events_df["timestamp"]), market_times, returns, window)]
+    matrix = np.vstack(blocks) if blocks else np.empty((0, 2 * window + 1))
+    return pd.DataFrame(matrix, index=events_df.index, columns=np.arange(-window, window + 1))
+
+
 def compute_event_windows(
     events_df: pd.DataFrame,
     market_df: pd.DataFrame,
     window: int = 3,
+    block_size: int = 10_000,
 ) -> pd.DataFrame:
-    """Return average abnormal and cumulative returns for an event window."""
+    """Return average abnormal and cumulative returns for an event window.
+
+    Also reports, per relative day, the number of contributing events and the
+    cross-sectional t-statistic of the average return. Events are processed in
+    blocks of ``block_size`` so memory does not grow with the number of events.
+    """
     if window <= 0:
         raise ValueError("window must be positive")
 
     events_df = ensure_datetime(events_df, "timestamp")
-    market_df = ensure_datetime(market_df, "timestamp").sort_values("timestamp")
-    market_df = market_df.set_index("timestamp")
-    market_df["return"] = market_df["close"].pct_change().fillna(0.0)
-
-    windows = []
-    for event_time in events_df["timestamp"]:
-        start = event_time - pd.Timedelta(days=window)
-        end = event_time + pd.Timedelta(days=window)
-        slice_df = market_df.loc[start:end, "return"]
-        if slice_df.empty:
-            continue
-        rel_index = (slice_df.index - event_time).days
-        windows.append(pd.Series(slice_df.values, index=rel_index))
-
-    if not windows:
-        return pd.DataFrame(columns=["avg_abnormal_return", "cumulative_abnormal_return"])
-
-    stacked = pd.concat(windows, axis=1)
-    avg = stacked.mean(axis=1).sort_index()
-    car = avg.cumsum()
+    market_times, returns = _market_returns(market_df)
+
+    width = 2 * window + 1
+    total = np.zeros(width)
+    total_sq = np.zeros(width)
+    count = np.zeros(width)
+    for _, matrix in iter_event_blocks(_as_ns(events_df["timestamp"]), market_times, returns, window, block_size):
+        present = ~np.isnan(matrix)
+        values = np.where(present, matrix, 0.0)
+        total += values.sum(axis=0)
+        total_sq += (values**2).sum(axis=0)
+        count += present.sum(axis=0)
+
+    observed = count > 0
+    if not observed.any():
+        return pd.DataFrame(columns=["avg_abnormal_return", "cumulative_abnormal_return", "n_events", "t_stat"])
+
+    n = count[observed]
+    avg = total[observed] / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.maximum(total_sq[observed] - n * avg**2, 0.0) / (n - 1)
+        t_stat = avg / np.sqrt(var / n)
     return pd.DataFrame(
         {
             "avg_abnormal_return": avg,
-            "cumulative_abnormal_return": car,
-        }
+            "cumulative_abnormal_return": np.cumsum(avg),
+            "n_events": n.astype(np.int64),
+            "t_stat": t_stat,
+        },
+        index=pd.Index(np.arange(-window, window + 1)[observed]),
+    )
+
+
+def compute_event_cars(
+    events_df: pd.DataFrame,
+    market_df: pd.DataFrame,
+    window: int = 3,
+    block_size: int = 10_000,
+) -> pd.DataFrame:
+    """Return each event's cumulative abnormal return over ``[-window, window]`` days.
+
+    Events with no market data inside their window are dropped.
+    """
+    if window <= 0:
+        raise ValueError("window must be positive")
+    events_df = ensure_datetime(events_df, "timestamp")
+    market_times, returns = _market_returns(market_df)
+
+    cars = np.full(len(events_df), np.nan)
+    n_obs = np.zeros(len(events_df), dtype=np.int64)
+    for rows, matrix in iter_event_blocks(_as_ns(events_df["timestamp"]), market_times, returns, window, block_size):
+        cars[rows] = np.nansum(matrix, axis=1)
+        n_obs[rows] = (~np.isnan(matrix)).sum(axis=1)
+
+    result = pd.DataFrame(
+        {"timestamp": events_df["timestamp"].to_numpy(), "cumulative_abnormal_return": cars, "n_obs": n_obs},
+        index=events_df.index,
     )
+    return result[result["n_obs"] > 0]
+
+
+def car_t_statistic(cars: pd.Series) -> float:
+    """Cross-sectional t-statistic that the mean CAR is zero."""
+    values = cars.dropna().to_numpy(dtype=np.float64)
+    if len(values) < 2:
+        return float("nan")
+    std = values.std(ddof=1)
+    return float(values.mean() / (std / np.sqrt(len(values)))) if std > 0 else float("nan")
 
 
 def summarize_events(events_df: pd.DataFrame) -> pd.Series:
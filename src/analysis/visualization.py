@@ -1,11 +1,17 @@
 """Plotting utilities for analysis notebooks."""
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING
+
 import pandas as pd
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 
 def plot_event_study(results: pd.DataFrame) -> plt.Axes:
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(6, 4))
     results[["avg_abnormal_return", "cumulative_abnormal_return"]].plot(ax=ax)
     ax.set_xlabel("Days relative to event")
@@ -17,6 +23,8 @@ def plot_event_study(results: pd.DataFrame) -> plt.Axes:
 
 
 def plot_sentiment_distribution(df: pd.DataFrame) -> plt.Axes:
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(5, 4))
     df["sentiment_seed"].value_counts().plot(kind="bar", ax=ax)
     ax.set_xlabel("Sentiment")
@@ -2,51 +2,135 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, Mapping
 
-import numpy as np
 import pandas as pd
 
+from src.data import synthetic
+
 
 DEFAULT_NEWS_COLUMNS = ["timestamp", "headline", "source"]
 DEFAULT_MARKET_COLUMNS = ["timestamp", "close", "volume"]
 
+# Explicit dtypes so readers never have to infer them; ``timestamp`` is parsed separately.
+NEWS_DTYPES = {"headline": "string", "source": "category", "ticker": "category"}
+MARKET_DTYPES = {"close": "float64", "volume": "float64", "ticker": "category"}
+
+ARROW_SUFFIXES = {".feather", ".arrow"}
+
+
+def _simulate_news(rows: int = 500) -> pd.DataFrame:
+    return synthetic.make_news(rows, tickers=1, days=10, seed=0)
+
+
+def _simulate_market(days: int = 10) -> pd.DataFrame:
+    return synthetic.make_market(tickers=1, days=days, bars_per_day=13, seed=0)
+
 
-def _simulate_news(rows: int = 10) -> pd.DataFrame:
-    timestamps = pd.date_range("2024-01-01", periods=rows, freq="6H")
-    return pd.DataFrame(
-        {
-            "timestamp": timestamps,
-            "headline": [f"Company {i} beats expectations" for i in range(rows)],
-            "source": "synthetic",
-        }
-    )
+def _finalize(df: pd.DataFrame, dtypes: Mapping[str, str]) -> pd.DataFrame:
+    """Apply *dtypes* and parse ``timestamp`` once, unless the file already stores it typed."""
+    casts = {col: dtype for col, dtype in dtypes.items() if col in df.columns and str(df[col].dtype) != dtype}
+    if casts:
+        df = df.astype(casts)
+    if "timestamp" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["timestamp"]):
+        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    return df
+
+
+def iter_table(
+    path: Path | str,
+    columns: Iterable[str],
+    dtypes: Mapping[str, str] | None = None,
+    chunksize: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Yield *columns* of a CSV, Parquet or Arrow file in chunks of *chunksize* rows.
+
+    Columns are projected by the reader and timestamps parsed per chunk, so at
+    most one chunk of the requested columns is held in memory at a time.
+    """
+    path = Path(path)
+    cols = list(columns)
+    dtypes = dict(dtypes or {})
+    if chunksize <= 0:
+        raise ValueError("chunksize must be positive")
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=cols):
+            yield _finalize(batch.to_pandas(), dtypes)
+    elif path.suffix in ARROW_SUFFIXES:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        table = feather.read_table(pa.memory_map(str(path)), columns=cols, memory_map=True)
+        for batch in table.to_batches(max_chunksize=chunksize):
+            yield _finalize(batch.to_pandas(), dtypes)
+    else:
+        reader = pd.read_csv(
+            path,
+            usecols=cols,
+            dtype={col: dtype for col, dtype in dtypes.items() if col in cols},
+            chunksize=chunksize,
+        )
+        for chunk in reader:
+            yield _finalize(chunk[cols], dtypes)
 
 
-def _simulate_market(rows: int = 40) -> pd.DataFrame:
-    timestamps = pd.date_range("2024-01-01", periods=rows, freq="H")
-    base_price = 100 + np.cumsum(np.random.normal(scale=0.5, size=rows))
-    volume = np.random.randint(1_000, 3_000, size=rows)
-    return pd.DataFrame({"timestamp": timestamps, "close": base_price, "volume": volume})
+def read_table(path: Path | str, columns: Iterable[str], dtypes: Mapping[str, str] | None = None) -> pd.DataFrame:
+    """Read *columns* of a CSV, Parquet or Arrow file in one go with the same typing as ``iter_table``."""
+    path = Path(path)
+    cols = list(columns)
+    dtypes = dict(dtypes or {})
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path, columns=cols)
+    elif path.suffix in ARROW_SUFFIXES:
+        df = pd.read_feather(path, columns=cols)
+    else:
+        df = pd.read_csv(
+            path,
+            usecols=cols,
+            dtype={col: dtype for col, dtype in dtypes.items() if col in cols},
+        )
+    return _finalize(df[cols], dtypes)
 
 
 def load_news(path: Path | str, columns: Iterable[str] | None = None) -> pd.DataFrame:
     """Load news CSV at *path* or simulate data when the file does not exist."""
     path = Path(path)
-    if path.exists():
-        df = pd.read_csv(path)
-    else:
-        df = _simulate_news()
     cols = list(columns) if columns is not None else DEFAULT_NEWS_COLUMNS
-    return df[cols]
+    if path.exists():
+        return read_table(path, cols, NEWS_DTYPES)
+    return _finalize(_simulate_news()[cols], NEWS_DTYPES)
 
 
 def load_market(path: Path | str, columns: Iterable[str] | None = None) -> pd.DataFrame:
     """Load market data CSV or return simulated values."""
     path = Path(path)
+    cols = list(columns) if columns is not None else DEFAULT_MARKET_COLUMNS
     if path.exists():
-        df = pd.read_csv(path)
-    else:
-        df = _simulate_market()
+        return read_table(path, cols, MARKET_DTYPES)
+    return _finalize(_simulate_market()[cols], MARKET_DTYPES)
+
+
+def iter_news(
+    path: Path | str, columns: Iterable[str] | None = None, chunksize: int = 100_000
+) -> Iterator[pd.DataFrame]:
+    """Stream news in chunks; yields simulated data once when *path* does not exist."""
+    path = Path(path)
+    cols = list(columns) if columns is not None else DEFAULT_NEWS_COLUMNS
+    if not path.exists():
+        yield _finalize(_simulate_news()[cols], NEWS_DTYPES)
+        return
+    yield from iter_table(path, cols, NEWS_DTYPES, chunksize)
+
+
+def iter_market(
+    path: Path | str, columns: Iterable[str] | None = None, chunksize: int = 100_000
+) -> Iterator[pd.DataFrame]:
+    """Stream market bars in chunks; yields simulated data once when *path* does not exist."""
+    path = Path(path)
     cols = list(columns) if columns is not None else DEFAULT_MARKET_COLUMNS
-    return df[cols]
+    if not path.exists():
+        yield _finalize(_simulate_market()[cols], MARKET_DTYPES)
+        return
+    yield from iter_table(path, cols, MARKET_DTYPES, chunksize)
@@ -0,0 +1,117 @@
+"""Pre-event market features over trailing time windows.
+
+Every bar gets statistics of its own ticker's bars in ``(t - lookback, t]``.
+Window sums come from prefix sums, so the cost per bar does not depend on the
+window length; locating the window starts is one ``searchsorted`` per ticker.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.utils.helpers import ensure_datetime
+from src.utils.profiling import instrument
+
+
+MARKET_FEATURES = ["lookback_return", "realized_volatility", "baseline_return", "volume_zscore"]
+
+
+def _window_starts(times: np.ndarray, bounds: np.ndarray, window_ns: int) -> np.ndarray:
+    """Index of the first bar inside ``(t - window, t]`` for every bar, searched within its group."""
+    starts = np.empty(len(times), dtype=np.int64)
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        segment = times[lo:hi]
+        starts[lo:hi] = lo + np.searchsorted(segment, segment - window_ns, side="right")
+    return starts
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    return np.concatenate([[0.0], np.cumsum(values)])
+
+
+def market_features(market_df: pd.DataFrame, lookback_days: float = 5, by: str | None = None) -> pd.DataFrame:
+    """Per-bar trailing features, sorted by *by* and ``timestamp``.
+
+    * ``lookback_return``: close over the first close in the window, minus one.
+    * ``realized_volatility``: square root of the summed squared log returns.
+    * ``baseline_return``: mean log return per bar, the expected move that
+      abnormal returns are measured against.
+    * ``volume_zscore``: the bar's volume against the window's mean and std.
+    """
+    if lookback_days <= 0:
+        raise ValueError("lookback_days must be positive")
+    columns = ["timestamp", "close", "volume"] + ([by] if by else [])
+    market = ensure_datetime(market_df[columns], "timestamp")
+    market = market.sort_values([by, "timestamp"] if by else "timestamp", kind="stable").reset_index(drop=True)
+
+    n_bars = len(market)
+    codes = market[by].factorize()[0] if by else np.zeros(n_bars, dtype=np.int64)
+    counts = np.bincount(codes) if n_bars else np.zeros(0, dtype=np.int64)
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    first = bounds[:-1]
+    times = market["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    starts = _window_starts(times, bounds, int(pd.Timedelta(days=lookback_days).value))
+    ends = np.arange(n_bars)
+
+    close = market["close"].to_numpy(dtype=np.float64)
+    log_returns = np.diff(np.log(close), prepend=np.nan)
+    log_returns[first] = 0.0
+    # Returns inside the window are those of bars starts+1..i; the first bar's return starts outside it.
+    n_returns = ends - starts
+    R, R2 = _prefix(log_returns), _prefix(log_returns**2)
+    sum_returns = R[ends + 1] - R[starts + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        baseline = np.where(n_returns > 0, sum_returns / n_returns, np.nan)
+
+    volume = market["volume"].to_numpy(dtype=np.float64)
+    # Centre per ticker so the squared prefix sums stay small enough to difference accurately.
+    volume = volume - (np.bincount(codes, weights=volume) / np.maximum(counts, 1))[codes]
+    V, V2 = _prefix(volume), _prefix(volume**2)
+    n_bars_window = ends - starts + 1
+    mean = (V[ends + 1] - V[starts]) / n_bars_window
+    second_moment = (V2[ends + 1] - V2[starts]) / n_bars_window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.maximum(second_moment - mean**2, 0.0) * n_bars_window / (n_bars_window - 1)
+        # Variances at rounding-error level mean a flat window; report NaN rather than a huge score.
+        flat = (n_bars_window < 2) | (var <= 1e-12 * second_moment)
+        zscore = np.where(flat, np.nan, (volume - mean) / np.sqrt(var))
+
+    features = market[["timestamp"] + ([by] if by else [])].copy()
+    features["lookback_return"] = np.expm1(sum_returns)
+    features["realized_volatility"] = np.sqrt(R2[ends + 1] - R2[starts + 1])
+    features["baseline_return"] = baseline
+    features["volume_zscore"] = zscore
+    return features
+
+
+@instrument()
+def add_market_features(
+    news_df: pd.DataFrame, market_df: pd.DataFrame, lookback_days: float = 5, by: str | None = None
+) -> pd.DataFrame:
+    """Attach each news item's latest pre-event ``MARKET_FEATURES`` without reordering *news_df*.
+
+    Only bars strictly before the news timestamp and at most ``lookback_days``
+    old are used; items without one get NaN.
+    """
+    features = market_features(market_df, lookback_days, by).sort_values("timestamp", kind="stable")
+    news = ensure_datetime(news_df.drop(columns=MARKET_FEATURES, errors="ignore"), "timestamp")
+    keys = news[by] if by is not None else None
+    if by is not None and news[by].dtype != features[by].dtype:
+        news[by] = news[by].astype(str)
+        features[by] = features[by].astype(str)
+    position = "__position"
+    ordered = news.assign(**{position: np.arange(len(news))}).sort_values("timestamp", kind="stable")
+    joined = pd.merge_asof(
+        ordered,
+        features,
+        on="timestamp",
+        by=by,
+        direction="backward",
+        allow_exact_matches=False,
+        tolerance=pd.Timedelta(days=lookback_days),
+    )
+    joined = joined.sort_values(position, kind="stable").drop(columns=position)
+    joined.index = news.index
+    if keys is not None:
+        joined[by] = keys
+    return joined
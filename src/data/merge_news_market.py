@@ -1,43 +1,63 @@
 """Functions for linking news events with subsequent market moves."""
 from __future__ import annotations
 
-from typing import Literal
+from typing import Iterable, Literal
 
+import numpy as np
 import pandas as pd
 
+from src.data.market_features import market_features
 from src.utils.helpers import ensure_datetime
+from src.utils.profiling import instrument
 
 
 ReactionMethod = Literal["close_to_close", "close_to_next"]
 
 
-def prepare_market(market_df: pd.DataFrame) -> pd.DataFrame:
+def prepare_market(market_df: pd.DataFrame, by: str | None = None) -> pd.DataFrame:
+    """Sort bars by time and add one-step ``return``/``future_return`` columns.
+
+    With *by* (e.g. ``"ticker"``) returns are computed within each symbol's own series.
+    """
     market_df = ensure_datetime(market_df, "timestamp")
-    market_df = market_df.sort_values("timestamp")
-    market_df["return"] = market_df["close"].pct_change().fillna(0.0)
-    market_df["future_return"] = market_df["close"].pct_change().shift(-1).fillna(0.0)
-    return market_df.reset_index(drop=True)
+    market_df = market_df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+    close = market_df.groupby(by, sort=False, observed=True)["close"] if by else market_df["close"]
+    returns = close.pct_change()
+    future = returns.groupby(market_df[by], sort=False, observed=True).shift(-1) if by else returns.shift(-1)
+    market_df["return"] = returns.fillna(0.0)
+    market_df["future_return"] = future.fillna(0.0)
+    return market_df
 
 
+@instrument()
 def merge_on_timestamps(
     news_df: pd.DataFrame,
     market_df: pd.DataFrame,
     reaction: ReactionMethod = "close_to_next",
     tolerance: str = "2D",
+    by: str | None = None,
 ) -> pd.DataFrame:
-    """Match each news item with the closest market observation."""
+    """Match each news item with the closest market observation.
+
+    Pass ``by="ticker"`` to match every news item against its own symbol's
+    bars in a single ``merge_asof`` across all symbols.
+    """
     if "timestamp" not in news_df.columns or "timestamp" not in market_df.columns:
         raise KeyError("timestamp column missing")
-    news_df = ensure_datetime(news_df, "timestamp").sort_values("timestamp")
-    market_df = prepare_market(market_df)
-
-    market_df = market_df.set_index("timestamp").sort_index()
-    news_df = news_df.set_index("timestamp").sort_index()
+    if by is not None and (by not in news_df.columns or by not in market_df.columns):
+        raise KeyError(f"{by} column missing")
+    news_df = ensure_datetime(news_df, "timestamp").sort_values("timestamp", kind="stable")
+    market_df = prepare_market(market_df, by=by)
+    if by is not None and news_df[by].dtype != market_df[by].dtype:
+        # merge_asof needs identical key dtypes, e.g. categoricals with different categories.
+        news_df[by] = news_df[by].astype(str)
+        market_df[by] = market_df[by].astype(str)
 
     joined = pd.merge_asof(
-        news_df.reset_index().sort_values("timestamp"),
-        market_df.reset_index().sort_values("timestamp"),
+        news_df,
+        market_df,
         on="timestamp",
+        by=by,
         direction="forward",
         tolerance=pd.Timedelta(tolerance),
     )
@@ -48,3 +68,84 @@ def merge_on_timestamps(
         joined["reaction"] = joined["future_return"].fillna(0.0)
 
     return joined.dropna(subset=["reaction", "clean_text"]).reset_index(drop=True)
+
+
+def horizon_column(kind: str, horizon_days: float) -> str:
+    """Name of a horizon target, e.g. ``horizon_column("car", 3) == "car_3d"``."""
+    return f"{kind}_{horizon_days:g}d"
+
+
+@instrument()
+def add_horizon_targets(
+    news_df: pd.DataFrame,
+    market_df: pd.DataFrame,
+    horizons_days: Iterable[float] = (1, 3, 5),
+    by: str | None = None,
+    lookback_days: float = 5,
+) -> pd.DataFrame:
+    """Attach ``forward_return_<h>d`` and ``car_<h>d`` for every horizon without reordering *news_df*.
+
+    The entry price is the first close at or after the news timestamp and the
+    exit price the last close within *h* calendar days of it, both found with
+    one ``searchsorted`` per ticker for all horizons at once. The cumulative
+    abnormal return is the log return over the holding period minus the
+    pre-event ``baseline_return`` (see ``market_features``) per bar held.
+    Items without an entry bar, or whose entry lies beyond the horizon, get NaN.
+    """
+    horizons = sorted({float(h) for h in horizons_days})
+    if not horizons or horizons[0] <= 0:
+        raise ValueError("horizons must be positive")
+    if by is not None and (by not in news_df.columns or by not in market_df.columns):
+        raise KeyError(f"{by} column missing")
+
+    news = ensure_datetime(news_df, "timestamp")
+    market = ensure_datetime(market_df[["timestamp", "close", "volume"] + ([by] if by else [])], "timestamp")
+    market = market.sort_values([by, "timestamp"] if by else "timestamp", kind="stable").reset_index(drop=True)
+    baseline = np.nan_to_num(market_features(market, lookback_days, by)["baseline_return"].to_numpy())
+
+    if by is None:
+        market_codes = np.zeros(len(market), dtype=np.int64)
+        news_codes = np.zeros(len(news), dtype=np.int64)
+        n_groups = 1
+    else:
+        symbols = pd.unique(market[by].astype(str))
+        market_codes = pd.Categorical(market[by].astype(str), categories=symbols).codes.astype(np.int64)
+        news_codes = pd.Categorical(news[by].astype(str), categories=symbols).codes.astype(np.int64)
+        n_groups = len(symbols)
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(market_codes, minlength=n_groups))])
+
+    market_times = market["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    news_times = news["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    offsets = np.array([pd.Timedelta(days=h).value for h in horizons], dtype=np.int64)
+    entry = np.full(len(news), -1, dtype=np.int64)
+    exits = np.full((len(news), len(horizons)), -1, dtype=np.int64)
+    first_bar = np.zeros(len(news), dtype=np.int64)
+
+    order = np.argsort(news_codes, kind="stable")
+    news_bounds = np.searchsorted(news_codes[order], np.arange(n_groups + 1))
+    for group in range(n_groups):
+        rows = order[news_bounds[group]:news_bounds[group + 1]]
+        lo, hi = bounds[group], bounds[group + 1]
+        if not len(rows) or lo == hi:
+            continue
+        segment = market_times[lo:hi]
+        start = np.searchsorted(segment, news_times[rows], side="left")
+        stop = np.searchsorted(segment, news_times[rows, None] + offsets[None, :], side="right") - 1
+        has_entry = start < len(segment)
+        entry[rows[has_entry]] = lo + start[has_entry]
+        exits[rows] = np.where((stop >= start[:, None]) & has_entry[:, None], lo + stop, -1)
+        first_bar[rows] = lo
+
+    log_close = np.log(market["close"].to_numpy(dtype=np.float64))
+    valid = exits >= 0
+    safe_entry = np.maximum(entry, 0)[:, None]
+    safe_exit = np.maximum(exits, 0)
+    holding = np.where(valid, log_close[safe_exit] - log_close[safe_entry], np.nan)
+    pre_event = np.where(entry > first_bar, baseline[np.maximum(entry - 1, 0)], 0.0)
+    abnormal = holding - pre_event[:, None] * (safe_exit - safe_entry)
+
+    result = news.copy(deep=False)
+    for k, horizon in enumerate(horizons):
+        result[horizon_column("forward_return", horizon)] = np.expm1(holding[:, k])
+        result[horizon_column("car", horizon)] = abnormal[:, k]
+    return result
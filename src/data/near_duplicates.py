@@ -0,0 +1,248 @@
+"""Near-duplicate headline detection with MinHash signatures and LSH banding.
+
+Wire services re-publish a story with small edits ("... in q2" becoming
+"... in q2 2024"), which exact ``drop_duplicates`` misses. Each text becomes
+a set of word shingles; ``num_perm`` min-hashes of that set estimate the
+Jaccard similarity of two texts as the share of equal signature entries.
+Signatures are cut into bands, and only texts sharing a whole band (a
+bucket) are compared, so the work grows roughly linearly with the rows.
+
+A text is a near duplicate when an earlier text (by timestamp, then input
+order) within ``window`` has an estimated similarity of at least
+``threshold``. Within a bucket each text is compared with at most
+``max_candidates`` predecessors, which bounds the cost of very popular
+stories.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.utils.profiling import instrument
+
+# ``np.trapz`` was renamed to ``np.trapezoid`` in NumPy 2.0 (and later removed).
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finaliser: a fast, well-spread 64-bit hash of uint64 values."""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def shingle_hashes(texts: Iterable[str], shingle_size: int = 2) -> tuple[np.ndarray, np.ndarray]:
+    """64-bit hashes of every text's word ``shingle_size``-grams, grouped by text.
+
+    Returns ``(hashes, starts)``: the shingles of text *i* are
+    ``hashes[starts[i]:starts[i + 1]]``. Texts shorter than ``shingle_size``
+    words get one shingle of all their words; empty texts get one shared
+    empty shingle.
+    """
+    words = pc.split_pattern(pa.array(pd.Series(texts, dtype="string"), type=pa.large_string()), " ")
+    if words.null_count:
+        words = pc.fill_null(words, pa.scalar([], type=words.type))
+    lengths = pc.list_value_length(words).to_numpy(zero_copy_only=False).astype(np.int64)
+    # Hash each distinct word once by content, so hashes agree across calls (and batches).
+    encoded = pc.dictionary_encode(pc.list_flatten(words))
+    vocabulary = encoded.dictionary.to_numpy(zero_copy_only=False).astype(object)
+    word_hash = pd.util.hash_array(vocabulary)[encoded.indices.to_numpy(zero_copy_only=False)]
+
+    # Hash the shingle starting at every word, masking words past the end of its text.
+    word_starts = np.concatenate([[0], np.cumsum(lengths)])
+    text_of_word = np.repeat(np.arange(len(lengths)), lengths)
+    position = np.arange(len(word_hash)) - word_starts[text_of_word]
+    remaining = lengths[text_of_word] - position
+    combined = np.zeros(len(word_hash), dtype=np.uint64)
+    for k in range(shingle_size):
+        following = np.concatenate([word_hash[k:], np.zeros(min(k, len(word_hash)), dtype=np.uint64)])
+        combined = _mix(combined ^ np.where(remaining > k, following, np.uint64(0)))
+    complete = (remaining >= shingle_size) | ((position == 0) & (lengths[text_of_word] < shingle_size))
+
+    counts = np.maximum(lengths - shingle_size + 1, 1)
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    hashes = np.full(starts[-1], _mix(np.zeros(1, dtype=np.uint64))[0])
+    has_words = np.ones(starts[-1], dtype=bool)
+    has_words[starts[:-1][lengths == 0]] = False
+    hashes[has_words] = combined[complete]
+    return hashes, starts
+
+
+def minhash_signatures(texts: Iterable[str], num_perm: int = 64, shingle_size: int = 2, seed: int = 1) -> np.ndarray:
+    """``(n_texts, num_perm)`` uint32 MinHash signatures.
+
+    Permutation *j* is the multiply-shift hash ``(a_j * h + b_j) >> 32`` of the
+    shingle hash *h*, with odd ``a_j``. Headlines share most of their
+    shingles, so each permutation is computed once per distinct shingle and
+    gathered, then reduced per text with one ``minimum.reduceat``.
+    """
+    hashes, starts = shingle_hashes(texts, shingle_size)
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 2**63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+    inverse, distinct = pd.factorize(hashes)
+    # Built one permutation per row, then transposed once so signature rows are contiguous.
+    signatures = np.empty((num_perm, len(starts) - 1), dtype=np.uint32)
+    if signatures.shape[1]:
+        for j in range(num_perm):
+            permuted = ((distinct * a[j] + b[j]) >> np.uint64(32)).astype(np.uint32)
+            signatures[j] = np.minimum.reduceat(permuted[inverse], starts[:-1])
+    return np.ascontiguousarray(signatures.T)
+
+
+def lsh_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """``(bands, rows)`` with ``bands * rows == num_perm`` whose S-curve best separates at *threshold*.
+
+    Minimises the probability mass of false negatives (similarity above the
+    threshold but never sharing a band) plus false positives below it, with
+    false negatives weighted double since candidates are verified anyway.
+    """
+    grid = np.linspace(0, 1, 201)
+    best, best_cost = (num_perm, 1), np.inf
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        hit = 1 - (1 - grid**rows) ** bands
+        cost = _trapezoid(np.where(grid < threshold, hit, 0), grid) + 2 * _trapezoid(
+            np.where(grid >= threshold, 1 - hit, 0), grid
+        )
+        if cost < best_cost:
+            best, best_cost = (bands, rows), cost
+    return best
+
+
+def _band_keys(signatures: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """``(bands, n_texts)`` uint64 bucket keys, one per band of each signature."""
+    keys = np.empty((bands, len(signatures)), dtype=np.uint64)
+    for band in range(bands):
+        key = np.full(len(signatures), band, dtype=np.uint64)
+        for column in signatures[:, band * rows:(band + 1) * rows].T:
+            key = _mix(key ^ column.astype(np.uint64))
+        keys[band] = key
+    return keys
+
+
+def _duplicates(
+    signatures: np.ndarray,
+    times: np.ndarray,
+    threshold: float,
+    window_ns: int,
+    bands: int,
+    max_candidates: int,
+    first_checked: int = 0,
+) -> np.ndarray:
+    """Flag rows from ``first_checked`` on with a similar predecessor; earlier rows only serve as history."""
+    n_texts, num_perm = signatures.shape
+    rows = num_perm // bands
+    duplicate = np.zeros(n_texts, dtype=bool)
+    for keys in _band_keys(signatures, bands, rows):
+        # Stable on input order, so equal timestamps keep arrival order.
+        order = np.lexsort((times, keys))
+        sorted_keys, sorted_times = keys[order], times[order]
+        for lag in range(1, min(max_candidates, n_texts - 1) + 1):
+            later, earlier = order[lag:], order[:-lag]
+            candidate = (
+                (sorted_keys[lag:] == sorted_keys[:-lag])
+                & (sorted_times[lag:] - sorted_times[:-lag] <= window_ns)
+                & (later >= first_checked)
+                & ~duplicate[later]
+            )
+            if not candidate.any():
+                if not (sorted_keys[lag:] == sorted_keys[:-lag]).any():
+                    break
+                continue
+            later, earlier = later[candidate], earlier[candidate]
+            agreement = (signatures[later] == signatures[earlier]).mean(axis=1)
+            duplicate[later[agreement >= threshold]] = True
+    return duplicate
+
+
+def _window_ns(window: str | pd.Timedelta | None) -> int:
+    return np.iinfo(np.int64).max if window is None else int(pd.Timedelta(window).value)
+
+
+def _as_ns(timestamps: Iterable) -> np.ndarray:
+    return pd.to_datetime(pd.Series(timestamps)).to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def near_duplicate_mask(
+    texts: Iterable[str],
+    timestamps: Iterable,
+    threshold: float = 0.8,
+    window: str | pd.Timedelta | None = "3D",
+    num_perm: int = 64,
+    shingle_size: int = 2,
+    max_candidates: int = 8,
+    seed: int = 1,
+) -> np.ndarray:
+    """Boolean mask of rows that near-duplicate an earlier row within *window* (``None``: any time)."""
+    if not 0 < threshold <= 1:
+        raise ValueError("threshold must be in (0, 1]")
+    signatures = minhash_signatures(texts, num_perm, shingle_size, seed)
+    bands, _ = lsh_bands(num_perm, threshold)
+    return _duplicates(signatures, _as_ns(timestamps), threshold, _window_ns(window), bands, max_candidates)
+
+
+@instrument()
+def drop_near_duplicates(
+    df: pd.DataFrame,
+    text_column: str = "clean_text",
+    time_column: str = "timestamp",
+    **options,
+) -> pd.DataFrame:
+    """Drop rows whose *text_column* near-duplicates an earlier row; see ``near_duplicate_mask`` for *options*."""
+    missing = [col for col in (text_column, time_column) if col not in df.columns]
+    if missing:
+        raise KeyError(f"missing columns {missing}")
+    duplicate = near_duplicate_mask(df[text_column], df[time_column], **options)
+    return df[~duplicate].reset_index(drop=True)
+
+
+@dataclass
+class NearDuplicateIndex:
+    """Incremental near-duplicate check against the signatures of recent batches.
+
+    ``check`` flags the rows of a new batch that near-duplicate an earlier row
+    of the same batch or of the history, then adds the batch to the history.
+    History older than ``window`` before the newest timestamp seen is evicted,
+    so memory stays proportional to the rows inside one window.
+    """
+
+    threshold: float = 0.8
+    window: str | pd.Timedelta = "3D"
+    num_perm: int = 64
+    shingle_size: int = 2
+    max_candidates: int = 8
+    seed: int = 1
+    signatures: np.ndarray = field(init=False, repr=False)
+    times: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0 < self.threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.bands, _ = lsh_bands(self.num_perm, self.threshold)
+        self.signatures = np.empty((0, self.num_perm), dtype=np.uint32)
+        self.times = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def check(self, texts: Iterable[str], timestamps: Iterable) -> np.ndarray:
+        """Duplicate mask for this batch; the whole batch then joins the history."""
+        batch = minhash_signatures(texts, self.num_perm, self.shingle_size, self.seed)
+        times = _as_ns(timestamps)
+        signatures = np.concatenate([self.signatures, batch])
+        all_times = np.concatenate([self.times, times])
+        window_ns = _window_ns(self.window)
+        history = len(self.times)
+        duplicate = _duplicates(signatures, all_times, self.threshold, window_ns, self.bands, self.max_candidates, history)
+        keep = all_times >= all_times.max() - window_ns if len(all_times) else np.zeros(0, dtype=bool)
+        self.signatures, self.times = signatures[keep], all_times[keep]
+        return duplicate[history:]
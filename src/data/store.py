@@ -0,0 +1,189 @@
+"""Partitioned Parquet store for processed news and a query layer over it.
+
+Frames are written as a hive-partitioned dataset with one directory per month
+(``month=2024-01/``), so a time-range query only opens the months it covers.
+Inside a month rows are ordered by ticker and timestamp and split into small
+row groups, so ticker and timestamp filters skip row groups using the Parquet
+statistics. ``pyarrow.dataset`` pushes the column projection and both filters
+down to the reader::
+
+    write_dataset(merged, "data/processed/merged")
+    read_dataset("data/processed/merged", columns=["timestamp", "reaction"], start="2024-03-01", end="2024-04-01")
+"""
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.utils.helpers import ensure_datetime
+
+if TYPE_CHECKING:
+    import pyarrow.dataset as ds
+
+
+PARTITION_COLUMN = "month"
+TICKER_COLUMN = "ticker"
+LAYOUT_FILE = "_layout.json"  # leading underscore: skipped by dataset discovery
+# Small enough that one ticker's rows for a month span few row groups, large enough to keep footers small.
+ROW_GROUP_ROWS = 8_192
+
+
+def _month(values: pd.Series) -> pd.Categorical:
+    """``YYYY-MM`` labels; formatting the few distinct months is far cheaper than ``strftime`` per row."""
+    codes, months = pd.factorize(values.to_numpy().astype("datetime64[M]"))
+    return pd.Categorical.from_codes(codes, np.datetime_as_string(months, unit="M"))
+
+
+def _partitioning() -> ds.Partitioning:
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+
+
+def write_dataset(df: pd.DataFrame, root: Path | str, replace: bool = True, row_group_rows: int = ROW_GROUP_ROWS) -> Path:
+    """Write *df* under *root*, one partition per ``month`` of ``timestamp``, clustered by ``ticker`` when present.
+
+    With *replace* the previous dataset is removed first; otherwise only the
+    months present in *df* are overwritten, for incremental loads.
+    """
+    import pyarrow.dataset as ds
+
+    if "timestamp" not in df.columns:
+        raise KeyError("timestamp column missing")
+    root = Path(root)
+    if replace and root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    frame = ensure_datetime(df, "timestamp")
+    month = _month(frame["timestamp"])
+    frame[PARTITION_COLUMN] = month
+    keys = [frame["timestamp"].to_numpy()]
+    if TICKER_COLUMN in frame.columns:
+        # Plain strings keep min/max statistics comparable with the query's ticker names.
+        frame[TICKER_COLUMN] = frame[TICKER_COLUMN].astype(str)
+        keys.append(pd.factorize(frame[TICKER_COLUMN], sort=True)[0])
+    order = np.lexsort([*keys, month.codes])
+    table = pa.Table.from_pandas(frame.take(order), preserve_index=False)
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=_partitioning(),
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+        min_rows_per_group=row_group_rows,
+        max_rows_per_group=row_group_rows,
+    )
+    layout = {"columns": list(df.columns)}
+    (root / LAYOUT_FILE).write_text(json.dumps(layout), encoding="utf-8")
+    return root
+
+
+def _layout(root: Path | str) -> dict:
+    path = Path(root) / LAYOUT_FILE
+    if not path.exists():
+        raise FileNotFoundError(f"no dataset at {root}")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def open_dataset(root: Path | str) -> ds.Dataset:
+    """Open a dataset written by ``write_dataset``, with ``month`` as a string partition key."""
+    import pyarrow.dataset as ds
+
+    _layout(root)
+    return ds.dataset(Path(root), format="parquet", partitioning=_partitioning())
+
+
+def dataset_filter(
+    dataset: ds.Dataset,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    tickers: Iterable[str] | None = None,
+) -> ds.Expression | None:
+    """Expression selecting ``start <= timestamp < end`` and *tickers*, plus the matching ``month`` bounds."""
+    import pyarrow.dataset as ds
+
+    timestamp, month = ds.field("timestamp"), ds.field(PARTITION_COLUMN)
+    timestamp_type = dataset.schema.field("timestamp").type
+    conditions = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions += [month >= start.strftime("%Y-%m"), timestamp >= pa.scalar(start, timestamp_type)]
+    if end is not None:
+        end = pd.Timestamp(end)
+        # ``end`` is exclusive, so the last month needed is the one holding the instant just before it.
+        last = end - pd.Timedelta(1, "ns")
+        conditions += [month <= last.strftime("%Y-%m"), timestamp < pa.scalar(end, timestamp_type)]
+    if tickers is not None:
+        if TICKER_COLUMN not in dataset.schema.names:
+            raise KeyError(f"{TICKER_COLUMN} column missing")
+        conditions.append(ds.field(TICKER_COLUMN).isin([str(ticker) for ticker in tickers]))
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def read_dataset(
+    root: Path | str,
+    columns: Iterable[str] | None = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    tickers: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """Read *columns* of the rows with ``start <= timestamp < end`` for *tickers*, ordered by timestamp.
+
+    Only months and row groups that can match are read and only the requested
+    columns decoded. By default the written frame's columns come back in their
+    original order; the ``month`` partition key only when asked for.
+    """
+    dataset = open_dataset(root)
+    columns = list(columns) if columns is not None else _layout(root)["columns"]
+    unknown = set(columns) - set(dataset.schema.names)
+    if unknown:
+        raise KeyError(f"unknown columns {sorted(unknown)}")
+    table = dataset.to_table(columns=columns, filter=dataset_filter(dataset, start, end, tickers))
+    frame = table.to_pandas()
+    if "timestamp" in frame.columns:
+        frame = frame.sort_values("timestamp", kind="stable", ignore_index=True)
+    return frame
+
+
+def partitions(root: Path | str) -> list[str]:
+    """The ``YYYY-MM`` months present under *root*, in order."""
+    _layout(root)
+    prefix = f"{PARTITION_COLUMN}="
+    return sorted(path.name.removeprefix(prefix) for path in Path(root).glob(f"{prefix}*") if path.is_dir())
+
+
+def iter_batches(
+    root: Path | str,
+    columns: Iterable[str] | None = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    tickers: Iterable[str] | None = None,
+    batch_rows: int = ROW_GROUP_ROWS * 16,
+) -> Iterator[pd.DataFrame]:
+    """Stream the rows ``read_dataset`` would return as frames of at most *batch_rows* rows.
+
+    Batches follow the storage order (month, ticker, timestamp) rather than
+    timestamp order, and only one batch is decoded at a time.
+    """
+    dataset = open_dataset(root)
+    columns = list(columns) if columns is not None else _layout(root)["columns"]
+    unknown = set(columns) - set(dataset.schema.names)
+    if unknown:
+        raise KeyError(f"unknown columns {sorted(unknown)}")
+    scanner = dataset.scanner(columns=columns, filter=dataset_filter(dataset, start, end, tickers), batch_size=batch_rows)
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield batch.to_pandas()
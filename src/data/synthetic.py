@@ -0,0 +1,192 @@
+"""Synthetic news and market data at realistic scale for tests and benchmarks.
+
+Headlines combine a company name with a positive, neutral or negative event
+phrase and an optional qualifier, so the keyword seed labeller sees roughly
+``sentiment_mix`` of each class and the vocabulary has thousands of terms.
+News arrive irregularly, concentrated in business hours and skewed towards a
+few popular tickers; market bars are irregularly spaced per ticker with
+geometric Brownian motion prices. Everything is vectorised, so millions of
+rows take seconds.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+NAME_PREFIXES = [
+    "Acme", "Apex", "Atlas", "Beacon", "Blue", "Cedar", "Core", "Crest", "Delta", "Eagle", "Ember", "Falcon",
+    "Frontier", "Global", "Granite", "Harbor", "Horizon", "Iron", "Keystone", "Lumen", "Meridian", "Nova",
+    "Orion", "Pacific", "Peak", "Pioneer", "Quantum", "Summit", "Titan", "Vertex",
+]
+NAME_SUFFIXES = ["Corp", "Holdings", "Energy", "Systems", "Bank", "Pharma", "Motors", "Retail", "Semiconductor", "Foods"]
+
+POSITIVE_PHRASES = [
+    "posts record profit", "shares surge on strong demand", "revenue growth tops forecasts",
+    "earnings beat estimates", "raises guidance after record quarter", "margin growth lifts outlook",
+    "shares surge after upgrade", "quarterly profit jumps", "sales beat expectations",
+]
+NEGATIVE_PHRASES = [
+    "reports wider loss", "faces fraud investigation", "sales decline in key markets",
+    "earnings miss estimates", "warns of slow demand", "shares decline after downgrade",
+    "revenue miss weighs on stock", "posts surprise loss", "cuts outlook on slow orders",
+]
+NEUTRAL_PHRASES = [
+    "schedules quarterly earnings call", "announces board changes", "files annual report",
+    "to present at industry conference", "completes debt refinancing", "names new chief financial officer",
+    "declares regular dividend", "opens new regional office", "updates investor presentation",
+    "confirms annual meeting date",
+]
+# Optional clauses as (prefix, slot, suffix); the slot is filled with a quarter, topic, percentage or amount.
+DETAILS = [
+    (None, None, None), (None, None, None), ("by", "pct", "percent"), ("to", "amount", "million"),
+    ("of", "amount", "million dollars"), ("up", "pct", "percent year on year"),
+]
+QUALIFIERS = [
+    (None, None, None), ("in", "quarter", None), ("amid", "topic", "concerns"), ("as analysts weigh", "topic", "outlook"),
+    ("ahead of", "quarter", "results"), ("after", "topic", "update"), ("with", "pct", "percent rise in volume"),
+]
+TOPICS = [
+    "rate", "inflation", "supply chain", "regulation", "tariff", "labor", "pricing", "currency", "credit", "energy",
+    "demand", "merger", "antitrust", "capital spending", "cloud", "consumer", "housing", "shipping",
+]
+SOURCES = ["newswire", "exchange filing", "press release", "market blog", "broker note"]
+QUARTERS = [f"q{quarter} {year}" for year in range(2022, 2026) for quarter in range(1, 5)]
+
+
+def make_universe(tickers: int) -> pd.DataFrame:
+    """Deterministic ``ticker``/``name`` table; the same *tickers* always yields the same companies."""
+    rng = np.random.default_rng(0)
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    width = 3 if tickers <= 26**3 // 2 else 4
+    codes = rng.choice(26**width, size=tickers, replace=False)
+    digits = (codes[:, None] // 26 ** np.arange(width)[::-1]) % 26
+    symbols = ["".join(row) for row in letters[digits]]
+    names = [
+        f"{NAME_PREFIXES[i % len(NAME_PREFIXES)]} {NAME_SUFFIXES[(i // len(NAME_PREFIXES)) % len(NAME_SUFFIXES)]}"
+        + (f" {i // (len(NAME_PREFIXES) * len(NAME_SUFFIXES)) + 1}" if i >= len(NAME_PREFIXES) * len(NAME_SUFFIXES) else "")
+        for i in range(tickers)
+    ]
+    return pd.DataFrame({"ticker": symbols, "name": names})
+
+
+def _take(options: list[str | None], index: np.ndarray) -> pa.Array:
+    return pa.array(options, type=pa.string()).take(pa.array(index))
+
+
+def _clause(rng: np.random.Generator, templates: list[tuple], slots: dict[str, pa.Array], rows: int) -> list[pa.Array]:
+    """Pick one template per row and return its prefix, filled slot and suffix; unused parts are null."""
+    chosen = rng.integers(0, len(templates), rows)
+    prefixes, kinds, suffixes = zip(*templates)
+    names = [None, *slots]
+    values = pc.choose(
+        pa.array(np.asarray([names.index(kind) for kind in kinds], dtype=np.int8)[chosen]),
+        pa.nulls(rows, pa.string()),
+        *slots.values(),
+    )
+    return [_take(list(prefixes), chosen), values, _take(list(suffixes), chosen)]
+
+
+def make_news(
+    rows: int,
+    tickers: int = 50,
+    start: str = "2024-01-01",
+    days: int = 250,
+    sentiment_mix: tuple[float, float, float] = (0.25, 0.5, 0.25),
+    seed: int = 42,
+) -> pd.DataFrame:
+    """Return *rows* headlines with ``timestamp``, ``ticker``, ``headline``, ``source`` and true ``sentiment``.
+
+    ``sentiment_mix`` is the share of negative, neutral and positive headlines.
+    """
+    rng = np.random.default_rng(seed)
+    universe = make_universe(tickers)
+    popularity = 1.0 / np.arange(1, tickers + 1) ** 0.8
+    company = rng.choice(tickers, size=rows, p=popularity / popularity.sum())
+    sentiment = rng.choice([-1, 0, 1], size=rows, p=np.asarray(sentiment_mix) / np.sum(sentiment_mix))
+
+    phrase_lists = [NEGATIVE_PHRASES, NEUTRAL_PHRASES, POSITIVE_PHRASES]
+    sizes = np.array([len(options) for options in phrase_lists])
+    offsets = np.r_[0, np.cumsum(sizes)[:-1]]
+    phrase = offsets[sentiment + 1] + (rng.random(rows) * sizes[sentiment + 1]).astype(np.int64)
+
+    tenths = rng.integers(1, 300, rows)
+    slots = {
+        "quarter": _take(QUARTERS, rng.integers(0, len(QUARTERS), rows)),
+        "topic": _take(TOPICS, rng.integers(0, len(TOPICS), rows)),
+        "pct": pc.binary_join_element_wise(
+            pc.cast(pa.array(tenths // 10), pa.string()), pc.cast(pa.array(tenths % 10), pa.string()), "."
+        ),
+        "amount": pc.cast(pa.array(rng.integers(1, 5_000, rows)), pa.string()),
+    }
+    parts = [
+        _take(list(universe["name"]), company),
+        _take([phrase for options in phrase_lists for phrase in options], phrase),
+        *_clause(rng, DETAILS, slots, rows),
+        *_clause(rng, QUALIFIERS, slots, rows),
+    ]
+    headline = pc.binary_join_element_wise(*parts, " ", null_handling="skip")
+
+    return pd.DataFrame(
+        {
+            "timestamp": _news_times(rng, rows, start, days),
+            "ticker": pd.Categorical.from_codes(company, categories=universe["ticker"]),
+            "headline": pd.Series(headline, dtype="string"),
+            "source": pd.Categorical.from_codes(rng.integers(0, len(SOURCES), rows), categories=SOURCES),
+            "sentiment": sentiment.astype(np.int64),
+        }
+    ).sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+def _news_times(rng: np.random.Generator, rows: int, start: str, days: int) -> pd.Series:
+    """Irregular arrival times: any day of the week, mostly between 07:00 and 19:00."""
+    day = rng.integers(0, days, rows)
+    hour_weights = np.where((np.arange(24) >= 7) & (np.arange(24) < 19), 6.0, 1.0)
+    hour = rng.choice(24, size=rows, p=hour_weights / hour_weights.sum())
+    seconds = day * 86_400 + hour * 3_600 + rng.integers(0, 3_600, rows)
+    return pd.Series(pd.Timestamp(start) + pd.to_timedelta(seconds, unit="s"))
+
+
+def make_market(
+    tickers: int = 50,
+    start: str = "2024-01-01",
+    days: int = 250,
+    bars_per_day: int = 26,
+    volatility: float = 0.02,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """Return irregular ``timestamp``/``ticker``/``close``/``volume`` bars for *tickers* over *days* business days.
+
+    Each ticker gets about ``bars_per_day`` randomly spaced bars per session
+    (09:30 to 16:00) and a daily log-return volatility of ``volatility``.
+    """
+    rng = np.random.default_rng(seed)
+    universe = make_universe(tickers)
+    sessions = pd.bdate_range(start, periods=days).to_numpy()
+    per_ticker = rng.poisson(bars_per_day * days, tickers).clip(min=2)
+    company = np.repeat(np.arange(tickers), per_ticker)
+    n_bars = len(company)
+    offsets = rng.integers(0, len(sessions), n_bars)
+    times = sessions[offsets] + pd.to_timedelta(34_200 + rng.integers(0, 23_400, n_bars), unit="s").to_numpy()
+
+    # Sort by ticker then time to accumulate each ticker's own random walk.
+    order = np.lexsort((times, company))
+    company, times = company[order], times[order]
+    steps = rng.normal(0.0, volatility / np.sqrt(bars_per_day), n_bars)
+    walk = np.cumsum(steps)
+    first = np.r_[0, np.cumsum(per_ticker)[:-1]]
+    walk -= np.repeat(walk[first] - steps[first], per_ticker)
+    base = rng.uniform(10, 500, tickers)
+    close = base[company] * np.exp(walk)
+
+    market = pd.DataFrame(
+        {
+            "timestamp": times,
+            "ticker": pd.Categorical.from_codes(company, categories=universe["ticker"]),
+            "close": close,
+            "volume": np.round(rng.lognormal(8.0, 1.0, n_bars)),
+        }
+    )
+    return market.sort_values("timestamp", kind="stable", ignore_index=True)
@@ -0,0 +1,196 @@
+"""Compact, memory-mappable model artifacts with a pure NumPy inference path.
+
+An artifact is a directory holding ``manifest.json`` (format name, version and
+scalar settings) plus one ``.npy`` file per array. Arrays are opened with
+``mmap_mode="r"`` so forked scoring workers share the same pages, and nothing
+here imports scikit-learn: exporting only reads attributes of fitted models.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+
+FORMAT_NAME = "nlp-market-reaction/compact"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+
+def _write(directory: Path | str, kind: str, settings: dict[str, Any], arrays: dict[str, np.ndarray]) -> Path:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+    manifest = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "kind": kind, "settings": settings, "arrays": sorted(arrays)}
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return directory
+
+
+def _read(directory: Path | str, kind: str, mmap: bool) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST).read_text(encoding="utf-8"))
+    if manifest.get("format") != FORMAT_NAME or manifest.get("kind") != kind:
+        raise ValueError(f"{directory} is not a compact {kind} artifact")
+    if manifest["version"] != FORMAT_VERSION:
+        raise ValueError(f"unsupported artifact version {manifest['version']} (expected {FORMAT_VERSION})")
+    mode = "r" if mmap else None
+    arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mode, allow_pickle=False) for name in manifest["arrays"]}
+    return manifest["settings"], arrays
+
+
+def export_sentiment(model: Any, directory: Path | str) -> Path:
+    """Write a fitted TF-IDF + logistic regression ``SentimentTransformer`` to *directory*."""
+    embedder = model.embedder_model
+    vectorizer = embedder.vectorizer
+    params = vectorizer.get_params()
+    unsupported = {
+        "backend": getattr(embedder, "backend", "tfidf") != "tfidf",
+        "analyzer": params["analyzer"] != "word",
+        "norm": params["norm"] != "l2",
+        "use_idf": not params["use_idf"],
+        "sublinear_tf": params["sublinear_tf"],
+        "binary": params["binary"],
+        "stop_words": params["stop_words"] is not None,
+        "strip_accents": params["strip_accents"] is not None,
+        "preprocessor": params["preprocessor"] is not None or params["tokenizer"] is not None,
+        "classifier": not hasattr(model.classifier, "C"),
+    }
+    if any(unsupported.values()):
+        raise ValueError(f"cannot export model with {[k for k, v in unsupported.items() if v]}")
+
+    terms = vectorizer.get_feature_names_out()
+    encoded = np.array([term.encode("utf-8") for term in terms])
+    order = np.argsort(encoded, kind="stable")
+    settings = {
+        "lowercase": params["lowercase"],
+        "token_pattern": params["token_pattern"],
+        "ngram_range": list(params["ngram_range"]),
+    }
+    arrays = {
+        "vocab_sorted": encoded[order],
+        "vocab_columns": order.astype(np.int64),
+        "idf": vectorizer.idf_.astype(np.float64),
+        "coef": model.classifier.coef_.astype(np.float64),
+        "intercept": model.classifier.intercept_.astype(np.float64),
+        "classes": np.asarray(model.classifier.classes_, dtype=np.int64),
+    }
+    return _write(directory, "sentiment", settings, arrays)
+
+
+def export_reaction(model: Any, directory: Path | str) -> Path:
+    """Write a fitted linear regression (``coef_``/``intercept_``) to *directory*.
+
+    Multi-output regressors keep their ``target_names_`` (see ``train_horizon_models``).
+    """
+    names = list(getattr(model, "feature_names_in_", []))
+    arrays = {
+        "coef": np.atleast_1d(np.asarray(model.coef_, dtype=np.float64)),
+        "intercept": np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64)),
+    }
+    settings = {"feature_names": names, "target_names": list(getattr(model, "target_names_", []))}
+    return _write(directory, "reaction", settings, arrays)
+
+
+class CompactSentimentModel:
+    """NumPy re-implementation of TF-IDF (l2, raw tf) + logistic regression scoring."""
+
+    def __init__(self, settings: dict[str, Any], arrays: dict[str, np.ndarray]) -> None:
+        self.lowercase = settings["lowercase"]
+        self.token_pattern = re.compile(settings["token_pattern"])
+        self.ngram_range = tuple(settings["ngram_range"])
+        self.vocab_sorted = arrays["vocab_sorted"]
+        self.vocab_columns = arrays["vocab_columns"]
+        self.idf = arrays["idf"]
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"]
+        self.classes_ = np.asarray(arrays["classes"])
+
+    @classmethod
+    def load(cls, directory: Path | str, mmap: bool = True) -> "CompactSentimentModel":
+        settings, arrays = _read(directory, "sentiment", mmap)
+        return cls(settings, arrays)
+
+    def _ngrams(self, text: str) -> list[str]:
+        tokens = self.token_pattern.findall(text.lower() if self.lowercase else text)
+        min_n, max_n = self.ngram_range
+        grams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def decision_function(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        doc_ids: list[int] = []
+        grams: list[bytes] = []
+        for doc, text in enumerate(texts):
+            doc_grams = self._ngrams(text)
+            doc_ids.extend([doc] * len(doc_grams))
+            grams.extend(g.encode("utf-8") for g in doc_grams)
+
+        n_docs, n_classes = len(texts), self.coef.shape[0]
+        scores = np.zeros((n_docs, n_classes))
+        if grams:
+            grams_arr = np.asarray(grams)
+            pos = np.searchsorted(self.vocab_sorted, grams_arr.astype(self.vocab_sorted.dtype))
+            pos = np.minimum(pos, len(self.vocab_sorted) - 1)
+            # The cast truncates grams wider than any vocabulary term, so confirm against the originals.
+            known = self.vocab_sorted[pos] == grams_arr
+            docs = np.asarray(doc_ids, dtype=np.int64)[known]
+            cols = self.vocab_columns[pos[known]]
+            cells, counts = np.unique(docs * len(self.idf) + cols, return_counts=True)
+            docs, cols = cells // len(self.idf), cells % len(self.idf)
+            values = counts * self.idf[cols]
+            norms = np.sqrt(np.bincount(docs, weights=values**2, minlength=n_docs))
+            values = values / norms[docs]
+            for k in range(n_classes):
+                scores[:, k] = np.bincount(docs, weights=values * self.coef[k, cols], minlength=n_docs)
+        return scores + self.intercept
+
+    def predict_proba(self, texts: Iterable[str]) -> np.ndarray:
+        scores = self.decision_function(texts)
+        if scores.shape[1] == 1:
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_with_proba(self, texts: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        probas = self.predict_proba(texts)
+        return self.classes_[probas.argmax(axis=1)], probas
+
+    def predict(self, texts: Iterable[str]) -> np.ndarray:
+        return self.predict_with_proba(texts)[0]
+
+
+class CompactReactionModel:
+    """``X @ coef + intercept`` with the training feature names kept for column checks."""
+
+    def __init__(self, settings: dict[str, Any], arrays: dict[str, np.ndarray]) -> None:
+        self.feature_names_in_ = np.asarray(settings["feature_names"], dtype=object)
+        self.target_names_ = list(settings.get("target_names", []))
+        self.coef_ = arrays["coef"]
+        self.intercept_ = arrays["intercept"]
+
+    @classmethod
+    def load(cls, directory: Path | str, mmap: bool = True) -> "CompactReactionModel":
+        settings, arrays = _read(directory, "reaction", mmap)
+        return cls(settings, arrays)
+
+    def predict(self, X: Any) -> np.ndarray:
+        if hasattr(X, "columns") and len(self.feature_names_in_):
+            X = X[list(self.feature_names_in_)]
+        result = np.asarray(X, dtype=np.float64) @ self.coef_.T + self.intercept_
+        return result.ravel() if result.ndim == 2 and result.shape[1] == 1 else result
+
+
+def load_sentiment(directory: Path | str, mmap: bool = True) -> CompactSentimentModel:
+    return CompactSentimentModel.load(directory, mmap=mmap)
+
+
+def load_reaction(directory: Path | str, mmap: bool = True) -> CompactReactionModel:
+    return CompactReactionModel.load(directory, mmap=mmap)
@@ -1,38 +1,418 @@
 """Model relating sentiment features to subsequent market moves."""
 from __future__ import annotations
 
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
 
-import joblib
+import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
+
+from src.data.market_features import MARKET_FEATURES
+from src.models.artifacts import CompactReactionModel
+from src.nlp.feature_engineering import probability_column
+from src.utils.profiling import instrument
+
+if TYPE_CHECKING:
+    from sklearn.linear_model import LinearRegression, Ridge
 
 TARGET_COLUMN = "reaction"
 
+# Data shipped once to each pool worker by ``_init_worker``.
+_WORKER_DATA: dict[str, Any] = {}
+
+
+def feature_columns(df: pd.DataFrame, include_market: bool = False) -> list[str]:
+    """Sentiment columns, plus any pre-event ``MARKET_FEATURES`` present when *include_market* is set."""
+    columns = [col for col in df.columns if col.startswith("sentiment_prob_") or col == "sentiment_pred"]
+    if include_market:
+        columns += [col for col in MARKET_FEATURES if col in df.columns]
+    return columns
 
-def prepare_training_data(df: pd.DataFrame, target_column: str = TARGET_COLUMN) -> tuple[pd.DataFrame, pd.Series]:
-    feature_cols = [col for col in df.columns if col.startswith("sentiment_prob_") or col == "sentiment_pred"]
-    X = df[feature_cols]
+
+def prepare_training_data(
+    df: pd.DataFrame, target_column: str | list[str] = TARGET_COLUMN, include_market: bool = False
+) -> tuple[pd.DataFrame, pd.Series | pd.DataFrame]:
+    """Features and target(s); rows whose target is unknown (e.g. past the data's end) are dropped."""
+    known = df[target_column].notna()
+    df = df[known if known.ndim == 1 else known.all(axis=1)]
+    # Market features are NaN before a ticker's first bar; treat that as a quiet market.
+    X = df[feature_columns(df, include_market)].fillna(0.0)
     y = df[target_column]
     return X, y
 
 
-def train_reaction_model(df: pd.DataFrame, target_column: str = TARGET_COLUMN) -> LinearRegression:
-    X, y = prepare_training_data(df, target_column)
-    model = LinearRegression()
+@instrument()
+def train_reaction_model(
+    df: pd.DataFrame, target_column: str = TARGET_COLUMN, alpha: float = 0.0, include_market: bool = False
+) -> LinearRegression | Ridge:
+    """Ordinary least squares, or ridge regression when ``alpha > 0``."""
+    from sklearn.linear_model import LinearRegression, Ridge
+
+    X, y = prepare_training_data(df, target_column, include_market)
+    model = Ridge(alpha=alpha) if alpha > 0 else LinearRegression()
     model.fit(X, y)
     return model
 
 
+@instrument()
+def train_horizon_models(
+    df: pd.DataFrame,
+    target_columns: list[str],
+    multi_output: bool = False,
+    alpha: float = 0.0,
+    include_market: bool = False,
+) -> dict[str, LinearRegression | Ridge] | LinearRegression | Ridge:
+    """Fit the horizon targets from ``add_horizon_targets`` on one merged frame.
+
+    By default one regressor per target, each on the rows where that target is
+    known. With *multi_output* a single regressor predicts all targets at once
+    from the rows where every target is known; it records the targets in
+    ``target_names_``.
+    """
+    if multi_output:
+        from sklearn.linear_model import LinearRegression, Ridge
+
+        X, y = prepare_training_data(df, list(target_columns), include_market)
+        model = Ridge(alpha=alpha) if alpha > 0 else LinearRegression()
+        model.fit(X, y)
+        model.target_names_ = list(target_columns)
+        return model
+    return {column: train_reaction_model(df, column, alpha, include_market) for column in target_columns}
+
+
+@dataclass
+class ReactionAccumulator:
+    """Streaming sufficient statistics of a (weighted) least-squares reaction fit.
+
+    Each chunk adds its weight total, weighted feature and target means and
+    centred cross products ``Xc^T W Xc`` / ``Xc^T W yc``; chunks and whole
+    accumulators combine with the pairwise update of Chan et al., so the
+    result does not depend on how rows were split. ``fit`` then solves the
+    centred normal equations once, which is what ``LinearRegression`` and
+    ``Ridge`` (unpenalised intercept) solve on the full matrix. Rows are
+    prepared as in ``prepare_training_data``: unknown targets are dropped and
+    missing features read as 0. Feature columns are fixed by the first chunk
+    unless *features* is given.
+    """
+
+    target_column: str | list[str] = TARGET_COLUMN
+    include_market: bool = False
+    weight_column: str | None = None
+    features: list[str] | None = None
+    rows: int = 0
+    weight: float = 0.0
+    mean_x: np.ndarray | None = field(default=None, repr=False)
+    mean_y: np.ndarray | None = field(default=None, repr=False)
+    xtx: np.ndarray | None = field(default=None, repr=False)
+    xty: np.ndarray | None = field(default=None, repr=False)
+
+    @property
+    def targets(self) -> list[str]:
+        return [self.target_column] if isinstance(self.target_column, str) else list(self.target_column)
+
+    def update(self, df: pd.DataFrame) -> "ReactionAccumulator":
+        """Add the rows of one chunk, e.g. one Parquet row group."""
+        if self.features is None:
+            self.features = feature_columns(df, self.include_market)
+        known = df[self.targets].notna().all(axis=1)
+        if not known.all():
+            df = df[known]
+        weights = df[self.weight_column].to_numpy(dtype=np.float64) if self.weight_column else None
+        return self.update_arrays(
+            df[self.features].to_numpy(dtype=np.float64), df[self.targets].to_numpy(dtype=np.float64), weights
+        )
+
+    def update_arrays(self, X: np.ndarray, y: np.ndarray, weights: np.ndarray | None = None) -> "ReactionAccumulator":
+        """Add rows given as arrays whose columns follow ``features`` and ``targets``."""
+        X = np.where(np.isnan(X), 0.0, X)
+        y = y.reshape(len(y), -1)
+        weights = np.ones(len(X)) if weights is None else np.asarray(weights, dtype=np.float64)
+        if (weights < 0).any():
+            raise ValueError("weights must be non-negative")
+        total = weights.sum()
+        if total == 0:
+            return self
+        mean_x, mean_y = weights @ X / total, weights @ y / total
+        Xc, yc = X - mean_x, y - mean_y
+        weighted = Xc * weights[:, None]
+        chunk = ReactionAccumulator(
+            self.target_column, self.include_market, self.weight_column, self.features,
+            len(X), float(total), mean_x, mean_y, weighted.T @ Xc, weighted.T @ yc,
+        )
+        return self.merge(chunk)
+
+    def merge(self, other: "ReactionAccumulator") -> "ReactionAccumulator":
+        """Fold *other*'s rows into this accumulator (in place) and return it."""
+        if other.weight == 0:
+            return self
+        if self.features is not None and other.features is not None and list(self.features) != list(other.features):
+            raise ValueError(f"feature columns differ: {self.features} vs {other.features}")
+        self.features = self.features if self.features is not None else other.features
+        if self.weight == 0:
+            self.rows, self.weight = other.rows, other.weight
+            self.mean_x, self.mean_y = other.mean_x.copy(), other.mean_y.copy()
+            self.xtx, self.xty = other.xtx.copy(), other.xty.copy()
+            return self
+        total = self.weight + other.weight
+        dx, dy = other.mean_x - self.mean_x, other.mean_y - self.mean_y
+        scale = self.weight * other.weight / total
+        self.xtx = self.xtx + other.xtx + scale * np.outer(dx, dx)
+        self.xty = self.xty + other.xty + scale * np.outer(dx, dy)
+        self.mean_x = self.mean_x + dx * (other.weight / total)
+        self.mean_y = self.mean_y + dy * (other.weight / total)
+        self.rows += other.rows
+        self.weight = total
+        return self
+
+    def coefficients(self, alpha: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+        """``(coef, intercept)`` with coef shaped ``(n_targets, n_features)``.
+
+        Without *alpha* the minimum-norm solution is used, as ``lstsq`` picks
+        for collinear columns (the class probabilities sum to one).
+        """
+        if self.weight == 0:
+            raise ValueError("no rows with a known target were added")
+        if alpha > 0:
+            coef = np.linalg.solve(self.xtx + alpha * np.eye(len(self.xtx)), self.xty)
+        else:
+            coef = np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+        return coef.T, self.mean_y - self.mean_x @ coef
+
+    def fit(self, alpha: float = 0.0) -> LinearRegression | Ridge:
+        """Solve once and return a fitted ``LinearRegression`` (or ``Ridge`` when ``alpha > 0``)."""
+        from sklearn.linear_model import LinearRegression, Ridge
+
+        coef, intercept = self.coefficients(alpha)
+        model = Ridge(alpha=alpha) if alpha > 0 else LinearRegression()
+        if isinstance(self.target_column, str):
+            model.coef_, model.intercept_ = coef[0], float(intercept[0])
+        else:
+            model.coef_, model.intercept_ = coef, intercept
+            model.target_names_ = self.targets
+        model.feature_names_in_ = np.asarray(self.features, dtype=object)
+        model.n_features_in_ = len(self.features)
+        return model
+
+
+@instrument()
+def train_reaction_model_streaming(
+    chunks: Iterable[pd.DataFrame],
+    target_column: str | list[str] = TARGET_COLUMN,
+    alpha: float = 0.0,
+    include_market: bool = False,
+    weight_column: str | None = None,
+) -> LinearRegression | Ridge:
+    """``train_reaction_model`` over an iterable of frames, holding one chunk in memory at a time."""
+    accumulator = ReactionAccumulator(target_column, include_market, weight_column)
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator.fit(alpha)
+
+
+def _init_worker(data: dict[str, Any]) -> None:
+    _WORKER_DATA.clear()
+    _WORKER_DATA.update(data)
+
+
+def _month_task(month: str) -> ReactionAccumulator:
+    from src.data import store
+
+    options = _WORKER_DATA
+    first = pd.Timestamp(f"{month}-01")
+    start = first if options["start"] is None else max(first, pd.Timestamp(options["start"]))
+    end = first + pd.offsets.MonthBegin(1)
+    end = end if options["end"] is None else min(end, pd.Timestamp(options["end"]))
+    accumulator = ReactionAccumulator(options["target_column"], options["include_market"], options["weight_column"], options["features"])
+    for chunk in store.iter_batches(options["root"], options["columns"], start, end, options["tickers"]):
+        accumulator.update(chunk)
+    return accumulator
+
+
+@instrument()
+def train_reaction_model_from_store(
+    root: Path | str,
+    target_column: str | list[str] = TARGET_COLUMN,
+    alpha: float = 0.0,
+    include_market: bool = False,
+    weight_column: str | None = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    tickers: Iterable[str] | None = None,
+    n_jobs: int = 1,
+) -> LinearRegression | Ridge:
+    """Fit on a Parquet dataset from ``src.data.store`` without loading it.
+
+    Each month is accumulated by one task, reading only the feature, target
+    and weight columns batch by batch; with ``n_jobs > 1`` tasks run in worker
+    processes and their accumulators are merged here before the single solve.
+    """
+    from src.data import store
+
+    dataset = store.open_dataset(root)
+    targets = [target_column] if isinstance(target_column, str) else list(target_column)
+    names = dataset.schema.names
+    features = feature_columns(pd.DataFrame(columns=names), include_market)
+    columns = features + targets + ([weight_column] if weight_column else [])
+    data = {
+        "root": str(root), "columns": columns, "features": features, "target_column": target_column,
+        "include_market": include_market, "weight_column": weight_column,
+        "start": start, "end": end, "tickers": list(tickers) if tickers is not None else None,
+    }
+    # The same month bounds ``store.dataset_filter`` applies, so out-of-range months get no task.
+    first = pd.Timestamp(start).strftime("%Y-%m") if start is not None else ""
+    last = (pd.Timestamp(end) - pd.Timedelta(1, "ns")).strftime("%Y-%m") if end is not None else "9999-12"
+    months = [month for month in store.partitions(root) if first <= month <= last]
+    accumulator = ReactionAccumulator(target_column, include_market, weight_column, features)
+    if n_jobs <= 1 or len(months) <= 1:
+        _init_worker(data)
+        try:
+            for month in months:
+                accumulator.merge(_month_task(month))
+        finally:
+            _init_worker({})
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(data,)) as pool:
+            for partial in pool.map(_month_task, months):
+                accumulator.merge(partial)
+    return accumulator.fit(alpha)
+
+
 def save_model(model: LinearRegression, path: Path) -> None:
+    import joblib
+
     path.parent.mkdir(parents=True, exist_ok=True)
     joblib.dump(model, path)
 
 
-def load_model(path: Path | str) -> LinearRegression:
+def load_model(path: Path | str) -> LinearRegression | CompactReactionModel:
+    """Load a joblib regressor or, for a directory, a memory-mapped compact artifact."""
+    if Path(path).is_dir():
+        return CompactReactionModel.load(path)
+    import joblib
+
     return joblib.load(path)
 
 
-def predict(model: LinearRegression, df: pd.DataFrame) -> pd.Series:
-    X, _ = prepare_training_data(df)
-    return pd.Series(model.predict(X), index=df.index, name="predicted_reaction")
+@dataclass
+class ReactionPredictor:
+    """A fitted linear reaction model reduced to its feature schema and coefficients.
+
+    ``feature_names`` is the training column order, read from the model's
+    ``feature_names_in_`` (joblib) or the compact artifact's manifest. Column
+    positions are resolved once per input layout and cached, and prediction
+    is a single ``X @ coef.T + intercept`` with missing values read as 0, as in
+    training. Build one with ``reaction_predictor(model)``.
+    """
+
+    feature_names: tuple[str, ...]
+    coef: np.ndarray
+    intercept: np.ndarray
+    target_names: tuple[str, ...] = ()
+    _frame_positions: dict[tuple, np.ndarray] = field(default_factory=dict, init=False, repr=False)
+    _sentiment_weights: dict[tuple, tuple[np.ndarray, np.ndarray, np.ndarray]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    @classmethod
+    def from_model(cls, model: Any) -> "ReactionPredictor":
+        names = getattr(model, "feature_names_in_", None)
+        return cls(
+            feature_names=tuple(names) if names is not None else (),
+            coef=np.atleast_2d(np.asarray(model.coef_, dtype=np.float64)),
+            intercept=np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64)),
+            target_names=tuple(getattr(model, "target_names_", [])),
+        )
+
+    def _finish(self, X: np.ndarray) -> np.ndarray:
+        result = np.where(np.isnan(X), 0.0, X) @ self.coef.T + self.intercept
+        return result[:, 0] if result.shape[1] == 1 and not self.target_names else result
+
+    def predict_array(self, X: Any) -> np.ndarray:
+        """Predict from an ``(n, n_features)`` array whose columns follow ``feature_names``."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.coef.shape[1]:
+            raise ValueError(f"expected {self.coef.shape[1]} feature columns, got {X.shape[1]}")
+        return self._finish(X)
+
+    def predict_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """Predict from the schema's columns of *df*, in any column order."""
+        layout = tuple(df.columns)
+        positions = self._frame_positions.get(layout)
+        if positions is None:
+            # Models without recorded names fall back to the naming convention (in frame order).
+            names = list(self.feature_names) or feature_columns(df)
+            missing = [name for name in names if name not in df.columns]
+            if missing:
+                raise KeyError(f"missing feature columns {missing}")
+            positions = self._frame_positions[layout] = df.columns.get_indexer(names)
+        return self._finish(df.iloc[:, positions].to_numpy(dtype=np.float64))
+
+    def _weights(self, classes: tuple[int, ...], market: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        key = (classes, market)
+        if key not in self._sentiment_weights:
+            if not self.feature_names:
+                raise ValueError("model does not record its feature names")
+            sources = ["sentiment_pred", *(probability_column(c) for c in classes)] + (list(MARKET_FEATURES) if market else [])
+            position = {name: i for i, name in enumerate(sources)}
+            missing = [name for name in self.feature_names if name not in position and name not in MARKET_FEATURES]
+            if missing:
+                raise KeyError(f"features {missing} are not produced from classes {list(classes)}")
+            needs_market = [name for name in self.feature_names if name in MARKET_FEATURES]
+            if needs_market and not market:
+                raise ValueError(f"model was trained on market features {needs_market}; pass them as market")
+            # Scatter the coefficients onto the input layout instead of gathering the inputs on every call.
+            weights = np.zeros((len(sources), self.coef.shape[0]))
+            for j, name in enumerate(self.feature_names):
+                if name in position:
+                    weights[position[name]] = self.coef[:, j]
+            self._sentiment_weights[key] = (weights[0], weights[1:1 + len(classes)], weights[1 + len(classes):])
+        return self._sentiment_weights[key]
+
+    def predict_sentiment(
+        self, preds: Any, probas: Any, classes: Iterable[int], market: Any | None = None
+    ) -> np.ndarray:
+        """Predict from ``SentimentTransformer.predict_with_proba`` output without building a frame.
+
+        *market* holds the ``MARKET_FEATURES`` columns, in that order, and is
+        required when the model was trained on any of them; NaN entries read
+        as 0 (a quiet market).
+        """
+        w_pred, w_probas, w_market = self._weights(tuple(int(c) for c in classes), market is not None)
+        probas = np.asarray(probas, dtype=np.float64)
+        result = np.outer(np.asarray(preds, dtype=np.float64), w_pred) + probas @ w_probas + self.intercept
+        if market is not None:
+            market = np.asarray(market, dtype=np.float64)
+            result += np.where(np.isnan(market), 0.0, market) @ w_market
+        return result[:, 0] if result.shape[1] == 1 and not self.target_names else result
+
+
+_PREDICTORS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def reaction_predictor(model: Any) -> ReactionPredictor:
+    """The cached ``ReactionPredictor`` of *model*, rebuilt when the model is refitted."""
+    if isinstance(model, ReactionPredictor):
+        return model
+    cached = _PREDICTORS.get(model)
+    if cached is None or cached[0] is not model.coef_:
+        cached = _PREDICTORS[model] = (model.coef_, ReactionPredictor.from_model(model))
+    return cached[1]
+
+
+def predict(model: LinearRegression | ReactionPredictor, df: pd.DataFrame) -> pd.Series:
+    """Predict with the columns the model was trained on (``feature_names_in_``) when it records them."""
+    return pd.Series(reaction_predictor(model).predict_frame(df), index=df.index, name="predicted_reaction")
+
+
+def predict_horizons(models: dict[str, LinearRegression] | LinearRegression, df: pd.DataFrame) -> pd.DataFrame:
+    """``predicted_<target>`` columns from ``train_horizon_models`` output, either form."""
+    if isinstance(models, dict):
+        return pd.DataFrame({f"predicted_{column}": predict(model, df) for column, model in models.items()}, index=df.index)
+    predictor = reaction_predictor(models)
+    columns = [f"predicted_{column}" for column in predictor.target_names]
+    return pd.DataFrame(predictor.predict_frame(df), index=df.index, columns=columns)
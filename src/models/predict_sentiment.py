@@ -1,22 +1,239 @@
 """Utilities for batch predictions from trained sentiment model."""
 from __future__ import annotations
 
+import argparse
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping, Union
 
 import pandas as pd
 
-from src.nlp.sentiment_transformer import SentimentTransformer
+from src.data import fetch_data
+from src.models.artifacts import CompactSentimentModel
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from src.nlp.sentiment_transformer import SentimentTransformer
+
+    SentimentModel = Union[SentimentTransformer, CompactSentimentModel]
+
+
+logger = logging.getLogger(__name__)
+
+# Model loaded once per pool worker by ``_init_worker``.
+_WORKER_MODEL: SentimentModel | None = None
+
+
+def load_model(path: Path | str) -> SentimentModel:
+    """Load a joblib ``SentimentTransformer`` or, for a directory, a memory-mapped compact artifact."""
+    if Path(path).is_dir():
+        return CompactSentimentModel.load(path)
+    # Imported here so compact-artifact scoring never loads scikit-learn.
+    from src.nlp.sentiment_transformer import SentimentTransformer
 
-def load_model(path: Path | str) -> SentimentTransformer:
     return SentimentTransformer.load(path)
 
 
-def predict_dataframe(texts: Iterable[str], model_path: Path | str) -> pd.DataFrame:
-    model = load_model(model_path)
-    preds = model.predict(texts)
-    probas = model.predict_proba(texts)
-    df = pd.DataFrame(probas, columns=[f"prob_{cls}" for cls in model.classifier.classes_])
+def score_texts(model: SentimentModel, texts: Iterable[str]) -> pd.DataFrame:
+    """Return predictions and class probabilities for *texts* using a loaded *model*."""
+    preds, probas = model.predict_with_proba(texts)
+    df = pd.DataFrame(probas, columns=[f"prob_{cls}" for cls in model.classes_])
     df.insert(0, "prediction", preds)
     return df
+
+
+def predict_dataframe(texts: Iterable[str], model_path: Path | str) -> pd.DataFrame:
+    return score_texts(load_model(model_path), texts)
+
+
+def iter_input_chunks(
+    path: Path | str,
+    chunk_size: int,
+    columns: list[str],
+    dtypes: Mapping[str, str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield *columns* of *path* (CSV, Parquet or Arrow) in chunks of at most *chunk_size* rows."""
+    yield from fetch_data.iter_table(path, columns, dtypes, chunksize=chunk_size)
+
+
+def _init_worker(model_path: str) -> None:
+    global _WORKER_MODEL
+    _WORKER_MODEL = load_model(model_path)
+
+
+def _score_chunk(
+    chunk: pd.DataFrame, text_column: str, keep_columns: list[str], model: SentimentModel | None = None
+) -> pd.DataFrame:
+    """Score *chunk* with *model*, or in a pool worker with the model ``_init_worker`` loaded."""
+    model = model if model is not None else _WORKER_MODEL
+    if model is None:
+        raise RuntimeError("worker model not initialised")
+    scores = score_texts(model, chunk[text_column].fillna("").astype(str))
+    if keep_columns:
+        scores = pd.concat([chunk[keep_columns].reset_index(drop=True), scores], axis=1)
+    return scores
+
+
+def _output_schema(table: pa.Table, frame: pd.DataFrame, declared: Mapping[str, str]) -> pa.Schema:
+    """Schema every chunk is cast to, fixed from the first chunk.
+
+    Copied columns that the first chunk leaves entirely empty, with no
+    declared dtype, become strings (any later values cast to text), and
+    dictionary indices are widened so later chunks may hold more categories.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field in table.schema:
+        if field.name not in declared and field.name in frame.columns and frame[field.name].isna().all():
+            field = field.with_type(pa.large_string())
+        elif pa.types.is_dictionary(field.type):
+            field = field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def _empty_schema(keep: list[str], declared: Mapping[str, str], model: SentimentModel) -> pa.Schema:
+    """Output schema for an input without rows: declared dtypes (else strings) plus the model's score columns."""
+    import pyarrow as pa
+
+    frame = pd.DataFrame(
+        {
+            col: pd.Series(dtype=declared.get(col, "datetime64[ns]" if col == "timestamp" else "string"))
+            for col in keep
+        }
+    )
+    schema = pa.Schema.from_pandas(frame, preserve_index=False).remove_metadata()
+    scores = [pa.field("prediction", pa.from_numpy_dtype(model.classes_.dtype))]
+    scores += [pa.field(f"prob_{cls}", pa.float64()) for cls in model.classes_]
+    return pa.schema([*schema, *scores])
+
+
+def score_file(
+    input_path: Path | str,
+    output_path: Path | str,
+    model_path: Path | str,
+    text_column: str = "clean_text",
+    keep_columns: Iterable[str] | None = None,
+    chunk_size: int = 100_000,
+    workers: int = 1,
+    dtypes: Mapping[str, str] | None = None,
+) -> dict[str, float]:
+    """Stream *input_path* through the sentiment model and write scores to Parquet.
+
+    Chunks are fanned out to ``workers`` processes, each of which loads the
+    model once. Results are written as they complete but always in input
+    order, with at most ``2 * workers`` chunks in flight. Input columns are
+    read with *dtypes* (default: ``fetch_data.NEWS_DTYPES``), and every chunk
+    is cast to one output schema so types cannot drift between chunks. The
+    file is written under a temporary name and renamed once complete; an
+    input without rows still produces a file with the full schema.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    keep = list(keep_columns or [])
+    columns = list(dict.fromkeys([text_column, *keep]))
+    declared = {col: dtype for col, dtype in {**fetch_data.NEWS_DTYPES, **(dtypes or {})}.items() if col in columns}
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = output_path.with_name(output_path.name + ".partial")
+
+    writer: pq.ParquetWriter | None = None
+    rows = 0
+    start = time.perf_counter()
+
+    def write(frame: pd.DataFrame) -> None:
+        nonlocal writer, rows
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(partial, _output_schema(table, frame, declared))
+        try:
+            table = table.cast(writer.schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as exc:
+            raise ValueError(f"chunk at row {rows} does not match the output schema; declare the column dtypes: {exc}") from exc
+        writer.write_table(table)
+        rows += len(frame)
+
+    chunks = (chunk for chunk in iter_input_chunks(input_path, chunk_size, columns, declared) if len(chunk))
+    # In-process scoring keeps its model local; the module global belongs to pool workers.
+    model: SentimentModel | None = None
+    try:
+        if workers <= 1:
+            model = load_model(model_path)
+            for chunk in chunks:
+                write(_score_chunk(chunk, text_column, keep, model))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(str(model_path),)
+            ) as pool:
+                pending: deque[Future] = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_score_chunk, chunk, text_column, keep))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        model = model if model is not None else load_model(model_path)
+        pq.write_table(_empty_schema(keep, declared, model).empty_table(), partial)
+    partial.replace(output_path)
+
+    elapsed = time.perf_counter() - start
+    stats = {"rows": rows, "seconds": elapsed, "rows_per_second": rows / elapsed if elapsed else 0.0}
+    logger.info("Scored %d rows in %.2fs (%.0f rows/s)", rows, elapsed, stats["rows_per_second"])
+    return stats
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Batch score headlines with a trained sentiment model")
+    parser.add_argument("input", help="CSV or Parquet file with headlines")
+    parser.add_argument("output", help="Destination Parquet file")
+    parser.add_argument(
+        "--model",
+        help="Path to sentiment model (defaults to paths.sentiment_model_compact if exported, else paths.sentiment_model)",
+    )
+    parser.add_argument("--config", default="config.yaml", help="Path to YAML configuration file")
+    parser.add_argument("--text-column", default="clean_text")
+    parser.add_argument("--keep-columns", nargs="*", default=[], help="Input columns copied to the output")
+    parser.add_argument(
+        "--dtypes", nargs="*", default=[], metavar="COLUMN=DTYPE", help="Pandas dtypes for input columns, e.g. id=int64"
+    )
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=1)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    model_path = args.model
+    if model_path is None:
+        from src.utils.config import load_config
+
+        paths = load_config(Path(args.config)).paths
+        compact = getattr(paths, "sentiment_model_compact", None)
+        model_path = compact if compact and Path(compact).is_dir() else paths.sentiment_model
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    score_file(
+        args.input,
+        args.output,
+        model_path,
+        text_column=args.text_column,
+        keep_columns=args.keep_columns,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        dtypes=dict(item.split("=", 1) for item in args.dtypes),
+    )
+
+
+if __name__ == "__main__":
+    main()
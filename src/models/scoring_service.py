@@ -0,0 +1,290 @@
+"""Long-running, micro-batching HTTP scoring service for headlines.
+
+Start a local instance with::
+
+    python -m src.models.scoring_service --config config.yaml --port 8080
+
+``POST /score`` with ``{"headlines": ["..."]}`` returns one result per headline
+with the predicted label, class probabilities and, when a market reaction model
+is available, the predicted reaction. ``GET /metrics`` reports request latency
+percentiles and the current queue depth. ``--unix-socket PATH`` serves on a
+Unix domain socket instead of TCP.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.models import market_reaction_model, predict_sentiment
+from src.models.artifacts import CompactReactionModel, CompactSentimentModel
+from src.nlp.feature_engineering import class_name
+
+if TYPE_CHECKING:
+    from sklearn.linear_model import LinearRegression
+
+    from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1 << 20
+
+
+@dataclass
+class ScoringService:
+    """Keeps the models warm and coalesces concurrent requests into micro-batches.
+
+    A request waits at most ``max_wait_ms`` for other requests to join its
+    batch; batches are capped at ``max_batch`` headlines and scored one at a
+    time on a dedicated worker thread so the event loop keeps accepting.
+    """
+
+    sentiment_model: SentimentTransformer | CompactSentimentModel
+    reaction_model: LinearRegression | CompactReactionModel | None = None
+    max_batch: int = 256
+    max_wait_ms: float = 2.0
+    latency_window: int = 10_000
+    requests: int = field(default=0, init=False)
+    batches: int = field(default=0, init=False)
+    batched_headlines: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self._latencies: deque[float] = deque(maxlen=self.latency_window)
+        self._queue: asyncio.Queue | None = None
+        self._batcher_task: asyncio.Task | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        if self.reaction_model is not None:
+            # Requests carry headlines only, so a model that needs market context cannot be served.
+            needs_market = [
+                name
+                for name in market_reaction_model.reaction_predictor(self.reaction_model).feature_names
+                if name in market_reaction_model.MARKET_FEATURES
+            ]
+            if needs_market:
+                raise ValueError(
+                    f"reaction model uses market features {needs_market}, which headline requests do not provide"
+                )
+
+    @classmethod
+    def from_paths(
+        cls, sentiment_path: Path | str, reaction_path: Path | str | None = None, **kwargs: Any
+    ) -> "ScoringService":
+        """Load joblib models or, for directories, memory-mapped compact artifacts."""
+        reaction = None
+        if reaction_path is not None and Path(reaction_path).exists():
+            reaction = market_reaction_model.load_model(reaction_path)
+        return cls(predict_sentiment.load_model(sentiment_path), reaction, **kwargs)
+
+    def score_batch(self, texts: list[str]) -> list[dict[str, Any]]:
+        """Score *texts* synchronously; used by the batcher and for warm-up."""
+        preds, probas = self.sentiment_model.predict_with_proba(texts)
+        classes = self.sentiment_model.classes_
+        reactions = (
+            market_reaction_model.reaction_predictor(self.reaction_model).predict_sentiment(preds, probas, classes)
+            if self.reaction_model is not None
+            else np.full(len(texts), np.nan)
+        )
+        probs = np.asarray(probas)
+        names = [class_name(c) for c in classes]
+        return [
+            {
+                "prediction": int(preds[i]),
+                "probabilities": dict(zip(names, probs[i].round(6).tolist())),
+                "predicted_reaction": None if np.isnan(reactions[i]) else float(reactions[i]),
+            }
+            for i in range(len(texts))
+        ]
+
+    def warm_up(self) -> None:
+        self.score_batch(["warm up headline"])
+
+    async def score(self, texts: list[str]) -> list[dict[str, Any]]:
+        """Queue *texts* for the next micro-batch and wait for their results."""
+        if self._queue is None:
+            raise RuntimeError("service is not running")
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        result = await future
+        self._latencies.append((time.perf_counter() - start) * 1000)
+        self.requests += 1
+        return result
+
+    async def _batcher(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while size < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            texts = [text for batch_texts, _ in pending for text in batch_texts]
+            try:
+                results = await loop.run_in_executor(self._executor, self.score_batch, texts)
+            except Exception as exc:  # surface model errors to every waiting request
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.batched_headlines += len(texts)
+            offset = 0
+            for batch_texts, future in pending:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(batch_texts)])
+                offset += len(batch_texts)
+
+    def metrics(self) -> dict[str, Any]:
+        latencies = np.fromiter(self._latencies, dtype=float)
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (float("nan"), float("nan"))
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_headlines / self.batches if self.batches else 0.0,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "latency_ms_p50": float(p50),
+            "latency_ms_p99": float(p99),
+        }
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("ascii")
+            + body
+        )
+        await writer.drain()
+
+    async def _handle(self, method: str, target: str, body: bytes) -> tuple[str, Any]:
+        if method == "GET" and target == "/metrics":
+            return "200 OK", self.metrics()
+        if method == "GET" and target == "/health":
+            return "200 OK", {"status": "ok"}
+        if method == "POST" and target == "/score":
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                payload = None
+            texts = None
+            if isinstance(payload, dict):
+                texts = payload["headlines"] if "headlines" in payload else [payload.get("headline")]
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                return "400 Bad Request", {"error": "expected JSON with a 'headline' string or a 'headlines' list"}
+            return "200 OK", {"results": await self.score(texts) if texts else []}
+        return "404 Not Found", {"error": f"no route for {method} {target}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one keep-alive connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) < 2:
+                    await self._respond(writer, "400 Bad Request", {"error": "malformed request line"})
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, "400 Bad Request", {"error": "invalid Content-Length"})
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, "413 Payload Too Large", {"error": "body too large"})
+                    break
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, payload = await self._handle(parts[0].upper(), parts[1], body)
+                except Exception as exc:
+                    logger.exception("Scoring request failed")
+                    status, payload = "500 Internal Server Error", {"error": str(exc)}
+                await self._respond(writer, status, payload)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 8080, unix_socket: str | None = None
+    ) -> asyncio.AbstractServer:
+        """Start the batcher and listener; returns the asyncio server."""
+        self._queue = asyncio.Queue()
+        self._batcher_task = asyncio.create_task(self._batcher())
+        if unix_socket:
+            return await asyncio.start_unix_server(self.handle_connection, path=unix_socket)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def stop(self) -> None:
+        if self._batcher_task is not None:
+            self._batcher_task.cancel()
+            try:
+                await self._batcher_task
+            except asyncio.CancelledError:
+                pass
+        self._batcher_task = None
+        self._queue = None
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8080, unix_socket: str | None = None) -> None:
+        server = await self.start(host, port, unix_socket)
+        logger.info("Scoring service listening on %s", unix_socket or f"{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve low-latency sentiment and reaction scores")
+    parser.add_argument("--config", default="config.yaml", help="Path to YAML configuration file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix-socket", help="Serve on this Unix socket path instead of TCP")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    from src.utils.config import load_config
+    from src.utils.logger import configure_logging
+
+    args = parse_args(argv)
+    config = load_config(Path(args.config))
+    configure_logging(config)
+    service = ScoringService.from_paths(
+        config.paths.sentiment_model,
+        config.paths.market_model,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+    )
+    service.warm_up()
+    asyncio.run(service.serve_forever(args.host, args.port, args.unix_socket))
+
+
+if __name__ == "__main__":
+    main()
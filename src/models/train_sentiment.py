@@ -5,8 +5,6 @@ from pathlib import Path
 from typing import Iterable
 
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
 
 from src.nlp.embedder import NewsEmbedder
 from src.nlp.sentiment_transformer import SentimentTransformer
@@ -18,6 +16,9 @@ def train_model(
     test_size: float = 0.2,
     embedder: NewsEmbedder | None = None,
 ) -> tuple[SentimentTransformer, float]:
+    from sklearn.metrics import accuracy_score
+    from sklearn.model_selection import train_test_split
+
     model = SentimentTransformer(embedder_model=embedder)
     X_train, X_test, y_train, y_test = train_test_split(list(texts), list(labels), test_size=test_size, random_state=42)
     model.fit(X_train, y_train)
@@ -26,6 +27,30 @@ def train_model(
     return model, float(acc)
 
 
+def train_model_incremental(
+    batches: Iterable[tuple[Iterable[str], Iterable[int]]],
+    model: SentimentTransformer | None = None,
+    alpha: float = 1e-6,
+) -> tuple[SentimentTransformer, float]:
+    """Fold a stream of ``(texts, labels)`` batches into an online model.
+
+    Pass an existing online *model* to continue training it, e.g. with the next
+    day of news. Accuracy is measured test-then-train: each batch is scored
+    before the model learns from it, so it never sees its own evaluation data.
+    """
+    model = model or SentimentTransformer(online=True, alpha=alpha)
+    correct = seen = 0
+    for texts, labels in batches:
+        texts, labels = list(texts), np.asarray(list(labels))
+        if not len(texts):
+            continue
+        if hasattr(model.classifier, "classes_"):
+            correct += int((model.predict(texts) == labels).sum())
+            seen += len(labels)
+        model.partial_fit(texts, labels)
+    return model, float(correct / seen) if seen else np.nan
+
+
 def save_model(model: SentimentTransformer, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     model.save(path)
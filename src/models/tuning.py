@@ -0,0 +1,238 @@
+"""Hyperparameter search with time-ordered cross-validation.
+
+Candidates are scored on expanding-window folds whose test rows are all
+published after their training rows, so no fold learns from the future. Work
+is split into one task per fold and embedder setting: each task fits the
+TF-IDF vocabulary once and reuses the vectors for every classifier setting,
+and tasks run on a process pool. Scores are "higher is better" (accuracy for
+the sentiment model, negative RMSE for the reaction model). The reaction search
+refits the sentiment model inside every fold, so its features are out of sample.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from src.data.market_features import MARKET_FEATURES
+from src.models import market_reaction_model
+from src.nlp import feature_engineering
+from src.nlp.embedder import NewsEmbedder
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+EMBEDDER_PARAMS = ("max_features", "ngram_range")
+LEADERBOARD_COLUMNS = ["model", "rank", "metric", "mean_score", "std_score", "n_folds", "params", "fold_scores"]
+
+# Data shipped once to each pool worker by ``_init_worker``.
+_WORKER_DATA: dict[str, Any] = {}
+
+
+def time_ordered_folds(timestamps: Iterable, n_splits: int = 4) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Expanding-window ``(train_idx, test_idx)`` folds over rows sorted by time.
+
+    Rows are cut into ``n_splits + 1`` blocks; fold *k* trains on blocks
+    ``0..k`` and tests on block ``k + 1``. Rows sharing a timestamp always land
+    in the same block.
+    """
+    times = pd.to_datetime(pd.Series(list(timestamps))).to_numpy()
+    order = np.argsort(times, kind="stable")
+    sorted_times = times[order]
+    n_rows = len(order)
+    cuts = np.linspace(0, n_rows, n_splits + 2).astype(np.int64)[1:-1]
+    cuts = np.searchsorted(sorted_times, sorted_times[np.minimum(cuts, n_rows - 1)], side="left") if n_rows else cuts
+    bounds = np.unique(np.append(cuts, n_rows))
+    folds = [(order[:start], order[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:]) if start > 0]
+    if not folds:
+        raise ValueError("not enough distinct timestamps for time-ordered folds")
+    return folds
+
+
+def candidate_grid(space: dict[str, list], n_iter: int | None = None, seed: int = 42) -> list[dict[str, Any]]:
+    """Every combination in *space*, or ``n_iter`` of them sampled without replacement."""
+    keys = sorted(space)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+    if n_iter is not None and n_iter < len(grid):
+        picked = np.random.default_rng(seed).choice(len(grid), size=n_iter, replace=False)
+        grid = [grid[i] for i in sorted(picked)]
+    return grid
+
+
+def _init_worker(data: dict[str, Any]) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def _make_embedder(params: dict[str, Any]) -> NewsEmbedder:
+    params = dict(params)
+    if "ngram_range" in params:
+        params["ngram_range"] = tuple(params["ngram_range"])
+    return NewsEmbedder(**params)
+
+
+def _sentiment_task(
+    train_idx: np.ndarray, test_idx: np.ndarray, embedder_params: dict[str, Any], classifier_grid: list[dict[str, Any]]
+) -> list[float]:
+    texts, labels = _WORKER_DATA["texts"], _WORKER_DATA["labels"]
+    y_train, y_test = labels[train_idx], labels[test_idx]
+    if len(np.unique(y_train)) < 2:
+        return [np.nan] * len(classifier_grid)
+    embedder = _make_embedder(embedder_params)
+    X_train = embedder.fit_transform(texts[train_idx])
+    X_test = embedder.transform(texts[test_idx])
+    scores = []
+    for params in classifier_grid:
+        model = SentimentTransformer(embedder_model=embedder, **params)
+        model.classifier.fit(X_train, y_train)
+        scores.append(float((model.classifier.predict(X_test) == y_test).mean()))
+    return scores
+
+
+def _reaction_task(train_idx: np.ndarray, test_idx: np.ndarray, grid: list[dict[str, Any]]) -> list[float]:
+    merged, target = _WORKER_DATA["merged"], _WORKER_DATA["target_column"]
+    include_market = _WORKER_DATA["include_market"]
+    train, test = merged.iloc[train_idx], merged.iloc[test_idx]
+    if train["sentiment_seed"].nunique() < 2:
+        return [np.nan] * len(grid)
+    # The sentiment model only sees this fold's training rows, so the test rows' probabilities are out of sample.
+    classifier_params = dict(_WORKER_DATA["sentiment_params"])
+    embedder = _make_embedder({key: classifier_params.pop(key) for key in EMBEDDER_PARAMS if key in classifier_params})
+    sentiment = SentimentTransformer(embedder_model=embedder, **classifier_params)
+    sentiment.fit(train["clean_text"], train["sentiment_seed"])
+    train_features = feature_engineering.build_features(train, sentiment)
+    X_test, y_test = market_reaction_model.prepare_training_data(
+        feature_engineering.build_features(test, sentiment), target, include_market
+    )
+    scores = []
+    for params in grid:
+        model = market_reaction_model.train_reaction_model(
+            train_features, target, include_market=include_market, **params
+        )
+        error = model.predict(X_test) - y_test.to_numpy()
+        scores.append(-float(np.sqrt(np.mean(error**2))))
+    return scores
+
+
+def _run_tasks(
+    task: Callable[..., list[float]], arguments: list[tuple], data: dict[str, Any], n_jobs: int
+) -> list[list[float]]:
+    if n_jobs <= 1 or len(arguments) <= 1:
+        _init_worker(data)
+        try:
+            return [task(*args) for args in arguments]
+        finally:
+            _init_worker({})
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(data,)) as pool:
+        futures = [pool.submit(task, *args) for args in arguments]
+        return [future.result() for future in futures]
+
+
+def _leaderboard(model_name: str, metric: str, candidates: list[dict[str, Any]], scores: np.ndarray) -> pd.DataFrame:
+    """*scores* has one row per candidate and one column per fold; NaN marks skipped folds."""
+    valid = ~np.isnan(scores)
+    counts = valid.sum(axis=1)
+    sums = np.where(valid, scores, 0.0).sum(axis=1)
+    means = np.divide(sums, counts, out=np.full(len(candidates), np.nan), where=counts > 0)
+    spreads = np.sqrt(np.where(valid, (scores - means[:, None]) ** 2, 0.0).sum(axis=1) / np.maximum(counts, 1))
+    board = pd.DataFrame(
+        {
+            "model": model_name,
+            "metric": metric,
+            "mean_score": means,
+            "std_score": spreads,
+            "n_folds": counts,
+            "params": [json.dumps(params, sort_keys=True) for params in candidates],
+            "fold_scores": [json.dumps([None if np.isnan(s) else round(float(s), 6) for s in row]) for row in scores],
+        }
+    )
+    board = board.sort_values("mean_score", ascending=False, kind="stable", na_position="last").reset_index(drop=True)
+    board["rank"] = np.arange(1, len(board) + 1)
+    return board[LEADERBOARD_COLUMNS]
+
+
+def search_sentiment(
+    texts: Iterable[str],
+    labels: Iterable[int],
+    timestamps: Iterable,
+    space: dict[str, list],
+    n_splits: int = 4,
+    n_iter: int | None = None,
+    n_jobs: int = 1,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """Rank sentiment settings (``max_features``, ``ngram_range``, ``regularization``) by fold accuracy."""
+    unknown = set(space) - set(EMBEDDER_PARAMS) - {"regularization"}
+    if unknown:
+        raise KeyError(f"unsupported sentiment parameters {sorted(unknown)}")
+    data = {"texts": np.asarray(list(texts), dtype=object), "labels": np.asarray(list(labels))}
+    folds = time_ordered_folds(timestamps, n_splits)
+    candidates = candidate_grid(space, n_iter, seed)
+
+    groups: dict[str, list[int]] = {}
+    for position, params in enumerate(candidates):
+        embedder_params = {key: params[key] for key in EMBEDDER_PARAMS if key in params}
+        groups.setdefault(json.dumps(embedder_params, sort_keys=True), []).append(position)
+    arguments, slots = [], []
+    for key, members in groups.items():
+        classifier_grid = [{k: v for k, v in candidates[i].items() if k not in EMBEDDER_PARAMS} for i in members]
+        for fold, (train_idx, test_idx) in enumerate(folds):
+            arguments.append((train_idx, test_idx, json.loads(key), classifier_grid))
+            slots.append((fold, members))
+
+    scores = np.full((len(candidates), len(folds)), np.nan)
+    for (fold, members), fold_scores in zip(slots, _run_tasks(_sentiment_task, arguments, data, n_jobs)):
+        scores[members, fold] = fold_scores
+    return _leaderboard("sentiment", "accuracy", candidates, scores)
+
+
+def search_reaction(
+    merged: pd.DataFrame,
+    space: dict[str, list],
+    sentiment_params: dict[str, Any] | None = None,
+    n_splits: int = 4,
+    n_iter: int | None = None,
+    n_jobs: int = 1,
+    seed: int = 42,
+    time_column: str = "timestamp",
+    target_column: str = market_reaction_model.TARGET_COLUMN,
+    include_market: bool = False,
+) -> pd.DataFrame:
+    """Rank reaction model settings (``alpha``) by fold RMSE on *merged* ordered by ``time_column``.
+
+    *merged* holds ``clean_text`` and ``sentiment_seed`` rather than sentiment features: each fold
+    refits the sentiment model (``sentiment_params``) on its training rows and scores its test rows
+    with it, so no fold's features come from a model that saw the test period. Rows without a known
+    *target_column* (e.g. horizons past the data's end) are left out.
+    """
+    unknown = set(space) - {"alpha"}
+    if unknown:
+        raise KeyError(f"unsupported reaction parameters {sorted(unknown)}")
+    merged = merged[merged[target_column].notna()]
+    columns = ["clean_text", "sentiment_seed", target_column]
+    if include_market:
+        columns += [col for col in MARKET_FEATURES if col in merged.columns]
+    data = {
+        "merged": merged[columns].reset_index(drop=True),
+        "target_column": target_column,
+        "include_market": include_market,
+        "sentiment_params": dict(sentiment_params or {}),
+    }
+    folds = time_ordered_folds(merged[time_column], n_splits)
+    candidates = candidate_grid(space, n_iter, seed)
+    arguments = [(train_idx, test_idx, candidates) for train_idx, test_idx in folds]
+    scores = np.column_stack(_run_tasks(_reaction_task, arguments, data, n_jobs))
+    return _leaderboard("market_reaction", "neg_rmse", candidates, scores)
+
+
+def write_leaderboard(boards: Iterable[pd.DataFrame], path: Path | str) -> pd.DataFrame:
+    """Concatenate per-model leaderboards and write them to *path* as CSV."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    board = pd.concat(list(boards), ignore_index=True)
+    board.to_csv(path, index=False)
+    return board
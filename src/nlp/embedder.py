@@ -1,30 +1,85 @@
-"""Lightweight text embedding using TF-IDF."""
+"""Lightweight text embedding using TF-IDF or feature hashing."""
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Literal, Union
 
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+    Embedding = Union[np.ndarray, sparse.csr_matrix]
+
+Backend = Literal["tfidf", "hashing"]
 
 
 @dataclass
 class NewsEmbedder:
+    """Text vectorizer with a fitted TF-IDF or a stateless hashing backend.
+
+    With ``backend="hashing"`` ``max_features`` is the number of hash buckets,
+    no fitting is needed and batches can be embedded independently, which is
+    what incremental training relies on.
+    """
+
     max_features: int = 1000
     ngram_range: tuple[int, int] = (1, 2)
+    dense: bool = False
+    backend: Backend = "tfidf"
 
     def __post_init__(self) -> None:
-        self.vectorizer = TfidfVectorizer(max_features=self.max_features, ngram_range=self.ngram_range)
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+        if self.backend == "hashing":
+            self.vectorizer = HashingVectorizer(
+                n_features=self.max_features, ngram_range=self.ngram_range, alternate_sign=False, norm="l2"
+            )
+        elif self.backend == "tfidf":
+            self.vectorizer = TfidfVectorizer(max_features=self.max_features, ngram_range=self.ngram_range)
+        else:
+            raise ValueError(f"unknown backend {self.backend}")
+
+    @property
+    def stateless(self) -> bool:
+        return self.backend == "hashing"
+
+    @property
+    def n_features(self) -> int:
+        if self.stateless:
+            return self.max_features
+        return len(self.vectorizer.vocabulary_)
+
+    def _format(self, matrix: sparse.csr_matrix, dense: bool | None) -> Embedding:
+        dense = self.dense if dense is None else dense
+        return matrix.toarray() if dense else matrix
 
     def fit(self, corpus: Iterable[str]) -> "NewsEmbedder":
         self.vectorizer.fit(corpus)
+        self._fingerprint = None
         return self
 
-    def transform(self, corpus: Iterable[str]) -> np.ndarray:
-        return self.vectorizer.transform(corpus).toarray()
+    def transform(self, corpus: Iterable[str], dense: bool | None = None) -> Embedding:
+        """Embed *corpus*; sparse CSR unless ``dense`` (or ``self.dense``) is set."""
+        return self._format(self.vectorizer.transform(corpus), dense)
+
+    def fit_transform(self, corpus: Iterable[str], dense: bool | None = None) -> Embedding:
+        matrix = self.vectorizer.fit_transform(corpus)
+        self._fingerprint = None
+        return self._format(matrix, dense)
 
-    def fit_transform(self, corpus: Iterable[str]) -> np.ndarray:
-        return self.vectorizer.fit_transform(corpus).toarray()
+    def fingerprint(self) -> str:
+        """Hash of the fitted vocabulary, idf weights and tokenizer settings."""
+        if getattr(self, "_fingerprint", None) is None:
+            digest = hashlib.sha1(repr(sorted(self.vectorizer.get_params().items())).encode("utf-8"))
+            if not self.stateless:
+                digest.update("\0".join(self.vectorizer.get_feature_names_out()).encode("utf-8"))
+                digest.update(np.ascontiguousarray(self.vectorizer.idf_).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
 
     def vocab(self) -> list[str]:
+        if self.stateless:
+            raise ValueError("hashing backend has no vocabulary")
         return list(self.vectorizer.get_feature_names_out())
@@ -0,0 +1,240 @@
+"""Persistent, content-addressed cache of TF-IDF embeddings."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+from scipy import sparse
+
+if TYPE_CHECKING:
+    from .embedder import Embedding, NewsEmbedder
+
+
+INDEX_FILE = "index.json"
+SHARD_PARTS = ("data", "indices", "indptr")
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+# New rows are buffered in memory and written as one shard once this many are pending.
+SHARD_ROWS = 50_000
+
+
+def text_key(text: str, fingerprint: str, lowercase: bool = True, collapse_whitespace: bool = True) -> str:
+    """Cache key of *text* embedded by a vectorizer with *fingerprint*.
+
+    Case and whitespace runs are normalised only as far as the vectorizer
+    itself ignores them; see ``normalization``.
+    """
+    if lowercase:
+        text = text.lower()
+    if collapse_whitespace:
+        text = " ".join(text.split())
+    return hashlib.sha1(f"{fingerprint}\0{text}".encode("utf-8")).hexdigest()
+
+
+def normalization(params: dict) -> dict[str, bool]:
+    """``text_key`` options that cannot change the rows a vectorizer with *params* produces.
+
+    Case folding is safe when the vectorizer lowercases itself (a custom
+    preprocessor replaces that step); whitespace runs only for the default
+    word tokenizer, whose tokens never span whitespace.
+    """
+    plain = params.get("preprocessor") is None and params.get("tokenizer") is None
+    return {
+        "lowercase": bool(params.get("lowercase", False)) and plain,
+        "collapse_whitespace": plain
+        and params.get("analyzer") == "word"
+        and params.get("token_pattern") == DEFAULT_TOKEN_PATTERN,
+    }
+
+
+class EmbeddingCache:
+    """Sparse embedding rows stored as memory-mapped ``.npy`` shards plus a JSON index.
+
+    ``put`` buffers new rows in memory; once ``shard_rows`` are pending they
+    are written as one shard holding their CSR arrays, together with the index.
+    Call ``flush`` (or ``close``) to persist a partial buffer; rows that were
+    never flushed are simply recomputed next time. The index keeps entries in
+    least-recently-used order and evicts the oldest once ``max_entries`` is
+    exceeded; shards with no live rows are deleted. The cache assumes a single
+    writer process.
+    """
+
+    def __init__(self, directory: Path | str, max_entries: int = 1_000_000, shard_rows: int = SHARD_ROWS) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if shard_rows <= 0:
+            raise ValueError("shard_rows must be positive")
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.shard_rows = shard_rows
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[int, int]] = OrderedDict()
+        self._shard_shapes: dict[int, tuple[int, int]] = {}
+        self._live: dict[int, int] = {}
+        self._open_shards: dict[int, sparse.csr_matrix] = {}
+        self._next_shard = 0
+        # Buffered rows belong to shard ``_next_shard`` until written.
+        self._pending_keys: list[str] = []
+        self._pending_rows: list[sparse.csr_matrix] = []
+        # Evicted shards whose files go once the index no longer points at them.
+        self._dropped: list[int] = []
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _shard_path(self, shard: int, part: str) -> Path:
+        return self.directory / f"shard_{shard:06d}.{part}.npy"
+
+    def _load_index(self) -> None:
+        index_path = self.directory / INDEX_FILE
+        if not index_path.exists():
+            return
+        payload = json.loads(index_path.read_text(encoding="utf-8"))
+        self._next_shard = payload["next_shard"]
+        self._shard_shapes = {int(k): tuple(v) for k, v in payload["shards"].items()}
+        for key, shard, row in payload["entries"]:
+            self._entries[key] = (shard, row)
+            self._live[shard] = self._live.get(shard, 0) + 1
+
+    def flush(self) -> None:
+        """Write buffered rows as a shard and persist the index (LRU order included) atomically."""
+        self._write_pending()
+        self._write_index()
+        for shard in self._dropped:
+            for part in SHARD_PARTS:
+                self._shard_path(shard, part).unlink(missing_ok=True)
+        self._dropped = []
+
+    def close(self) -> None:
+        self.flush()
+
+    def _write_index(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "next_shard": self._next_shard,
+            "shards": {str(k): list(v) for k, v in self._shard_shapes.items()},
+            "entries": [[key, shard, row] for key, (shard, row) in self._entries.items()],
+        }
+        tmp_path = self.directory / f"{INDEX_FILE}.tmp"
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, self.directory / INDEX_FILE)
+
+    def _shard(self, shard: int) -> sparse.csr_matrix:
+        if shard == self._next_shard:
+            if shard not in self._open_shards:
+                self._open_shards[shard] = sparse.vstack(self._pending_rows, format="csr")
+            return self._open_shards[shard]
+        if shard not in self._open_shards:
+            data, indices, indptr = (np.load(self._shard_path(shard, part), mmap_mode="r") for part in SHARD_PARTS)
+            self._open_shards[shard] = sparse.csr_matrix((data, indices, indptr), shape=self._shard_shapes[shard], copy=False)
+        return self._open_shards[shard]
+
+    def lookup(self, keys: list[str], n_features: int) -> tuple[np.ndarray, sparse.csr_matrix]:
+        """Return positions in *keys* that are cached and their rows, in matching order."""
+        by_shard: dict[int, tuple[list[int], list[int]]] = {}
+        for position, key in enumerate(keys):
+            location = self._entries.get(key)
+            if location is None:
+                continue
+            self._entries.move_to_end(key)
+            positions, rows = by_shard.setdefault(location[0], ([], []))
+            positions.append(position)
+            rows.append(location[1])
+
+        hit_positions = [p for positions, _ in by_shard.values() for p in positions]
+        self.hits += len(hit_positions)
+        self.misses += len(keys) - len(hit_positions)
+        if not by_shard:
+            return np.empty(0, dtype=np.int64), sparse.csr_matrix((0, n_features))
+        rows = sparse.vstack([self._shard(shard)[rows] for shard, (_, rows) in by_shard.items()], format="csr")
+        return np.asarray(hit_positions, dtype=np.int64), rows
+
+    def put(self, keys: list[str], rows: sparse.csr_matrix) -> None:
+        """Buffer *rows* (one per key), writing a shard once ``shard_rows`` are pending, and evict beyond ``max_entries``."""
+        new = [(i, key) for i, key in enumerate(keys) if key not in self._entries]
+        if not new:
+            return
+        shard, offset = self._next_shard, len(self._pending_keys)
+        self._pending_rows.append(sparse.csr_matrix(rows)[[i for i, _ in new]])
+        self._open_shards.pop(shard, None)
+        for row, (_, key) in enumerate(new, start=offset):
+            self._pending_keys.append(key)
+            self._entries[key] = (shard, row)
+        self._live[shard] = self._live.get(shard, 0) + len(new)
+        self._evict()
+        if len(self._pending_keys) >= self.shard_rows:
+            self.flush()
+
+    def _write_pending(self) -> None:
+        """Write the live buffered rows as shard ``_next_shard``, renumbering past evicted ones."""
+        shard = self._next_shard
+        live = [(row, key) for row, key in enumerate(self._pending_keys) if self._entries.get(key) == (shard, row)]
+        if live:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            matrix = self._shard(shard)[[row for row, _ in live]]
+            for part in SHARD_PARTS:
+                np.save(self._shard_path(shard, part), getattr(matrix, part))
+            self._shard_shapes[shard] = matrix.shape
+            for row, (_, key) in enumerate(live):
+                self._entries[key] = (shard, row)
+            self._next_shard += 1
+        self._open_shards.pop(shard, None)
+        self._pending_keys, self._pending_rows = [], []
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            _, (shard, _) = self._entries.popitem(last=False)
+            self._live[shard] -= 1
+            if self._live[shard] == 0:
+                self._drop_shard(shard)
+
+    def _drop_shard(self, shard: int) -> None:
+        if shard == self._next_shard:
+            # Every buffered row was evicted before it was written.
+            self._pending_keys, self._pending_rows = [], []
+            self._live.pop(shard, None)
+            self._open_shards.pop(shard, None)
+            return
+        self._open_shards.pop(shard, None)
+        self._shard_shapes.pop(shard, None)
+        self._live.pop(shard, None)
+        self._dropped.append(shard)
+
+    def transform(self, embedder: "NewsEmbedder", texts: Iterable[str], dense: bool | None = None) -> "Embedding":
+        """Embed *texts* with *embedder*, computing only rows missing from the cache."""
+        texts = list(texts)
+        fingerprint = embedder.fingerprint()
+        options = normalization(embedder.vectorizer.get_params())
+        keys = [text_key(text, fingerprint, **options) for text in texts]
+        n_features = embedder.n_features
+        hit_positions, hit_rows = self.lookup(keys, n_features)
+        if len(hit_positions) == len(keys):
+            return embedder._format(hit_rows[np.argsort(hit_positions)], dense)
+
+        missing = np.ones(len(keys), dtype=bool)
+        missing[hit_positions] = False
+        miss_positions = np.flatnonzero(missing)
+        # Embed each distinct missing text once, then fan the rows back out to every position.
+        miss_keys = np.array([keys[i] for i in miss_positions])
+        unique_keys, first, inverse = np.unique(miss_keys, return_index=True, return_inverse=True)
+        fresh = embedder.transform([texts[miss_positions[i]] for i in first], dense=False)
+        self.put(unique_keys.tolist(), fresh)
+
+        rows = sparse.vstack([hit_rows, fresh[inverse]], format="csr")
+        order = np.argsort(np.concatenate([hit_positions, miss_positions]))
+        return embedder._format(rows[order], dense)
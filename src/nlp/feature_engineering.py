@@ -1,28 +1,42 @@
 """Feature generation utilities for downstream models."""
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import pandas as pd
 
-from .sentiment_transformer import SentimentTransformer
+from src.utils.profiling import instrument
+
+if TYPE_CHECKING:
+    from .sentiment_transformer import SentimentTransformer
 
 
 CLASSES = {-1: "negative", 0: "neutral", 1: "positive"}
 
 
-def _class_to_name(label: int) -> str:
+def class_name(label: int) -> str:
+    """Readable name of sentiment class *label* (``-1`` is ``negative``)."""
     return CLASSES.get(int(label), f"class_{label}")
 
 
+def probability_column(label: int) -> str:
+    """Feature column holding the probability of class *label*, e.g. ``sentiment_prob_positive``."""
+    return f"sentiment_prob_{class_name(label)}"
+
+
+def sentiment_feature_frame(preds, probas, class_order) -> pd.DataFrame:
+    """Return ``sentiment_pred`` plus one ``sentiment_prob_<class>`` column per class."""
+    prob_df = pd.DataFrame(probas, columns=[class_name(int(c)) for c in class_order])
+    prob_df = prob_df.add_prefix("sentiment_prob_")
+    prob_df.insert(0, "sentiment_pred", preds)
+    return prob_df
+
+
+@instrument()
 def build_features(df: pd.DataFrame, model: SentimentTransformer) -> pd.DataFrame:
     """Return regression ready features with probabilities from the sentiment model."""
     if "clean_text" not in df.columns:
         raise KeyError("clean_text column missing")
-    features = df.copy().reset_index(drop=True)
-    features["sentiment_pred"] = model.predict(features["clean_text"])
-
-    probas = model.predict_proba(features["clean_text"])
-    class_order = model.classifier.classes_
-    prob_df = pd.DataFrame(probas, columns=[_class_to_name(int(c)) for c in class_order])
-    prob_df = prob_df.add_prefix("sentiment_prob_")
-    features = pd.concat([features, prob_df], axis=1)
-    return features
+    features = df.reset_index(drop=True)
+    preds, probas = model.predict_with_proba(features["clean_text"])
+    return pd.concat([features, sentiment_feature_frame(preds, probas, model.classes_)], axis=1)
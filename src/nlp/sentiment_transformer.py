@@ -3,48 +3,118 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
-import joblib
 import numpy as np
-from sklearn.linear_model import LogisticRegression
+
+from src.utils.profiling import rows, track
 
 from .embedder import NewsEmbedder
 
+if TYPE_CHECKING:
+    from .embedder import Embedding
+    from .embedding_cache import EmbeddingCache
+
+
+SEED_CLASSES = np.array([-1, 0, 1])
+# Hash buckets used when online mode builds its own embedder.
+ONLINE_HASH_FEATURES = 2**18
+
 
 @dataclass
 class SentimentTransformer:
+    """TF-IDF + logistic regression sentiment model.
+
+    With ``online=True`` the classifier is an ``SGDClassifier`` with log loss
+    and the default embedder uses the stateless hashing backend, so the model
+    can be updated batch by batch with ``partial_fit``. ``alpha`` is the SGD
+    regularisation strength and is only used in online mode.
+    """
+
     embedder_model: NewsEmbedder | None = None
     regularization: float = 1.0
+    embedding_cache: EmbeddingCache | None = None
+    online: bool = False
+    alpha: float = 1e-6
 
     def __post_init__(self) -> None:
-        self.embedder_model = self.embedder_model or NewsEmbedder()
-        self.classifier = LogisticRegression(max_iter=500, C=self.regularization, multi_class="auto")
+        from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+        if self.online:
+            self.embedder_model = self.embedder_model or NewsEmbedder(
+                max_features=ONLINE_HASH_FEATURES, backend="hashing"
+            )
+            self.classifier = SGDClassifier(loss="log_loss", alpha=self.alpha, random_state=0)
+        else:
+            self.embedder_model = self.embedder_model or NewsEmbedder()
+            self.classifier = LogisticRegression(max_iter=500, C=self.regularization)
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.classifier.classes_
+
+    def embed(self, texts: Iterable[str], dense: bool | None = None) -> Embedding:
+        """Return embedder vectors, sparse unless the caller or embedder asks for dense.
+
+        With an ``embedding_cache`` only texts missing from the cache are embedded.
+        """
+        if self.embedding_cache is not None:
+            return self.embedding_cache.transform(self.embedder_model, texts, dense=dense)
+        return self.embedder_model.transform(texts, dense=dense)
 
     def fit(self, texts: Iterable[str], labels: Iterable[int]) -> "SentimentTransformer":
-        vectors = self.embedder_model.fit_transform(texts)
-        self.classifier.fit(vectors, labels)
+        with track("embedder_fit", rows_in=rows(texts)):
+            vectors = self.embedder_model.fit_transform(texts)
+        with track("classifier_fit", rows_in=vectors.shape[0]):
+            self.classifier.fit(vectors, labels)
+        return self
+
+    def partial_fit(
+        self, texts: Iterable[str], labels: Iterable[int], classes: np.ndarray = SEED_CLASSES
+    ) -> "SentimentTransformer":
+        """Fold one more batch into an online model without revisiting earlier batches."""
+        if not self.online or not self.embedder_model.stateless:
+            raise ValueError("partial_fit requires online=True and a stateless (hashing) embedder")
+        vectors = self.embedder_model.transform(texts, dense=False)
+        self.classifier.partial_fit(vectors, np.asarray(list(labels)), classes=classes)
         return self
 
     def predict(self, texts: Iterable[str]) -> np.ndarray:
-        vectors = self.embedder_model.transform(texts)
-        return self.classifier.predict(vectors)
+        return self.classifier.predict(self.embed(texts))
 
     def predict_proba(self, texts: Iterable[str]) -> np.ndarray:
-        vectors = self.embedder_model.transform(texts)
-        return self.classifier.predict_proba(vectors)
+        return self.classifier.predict_proba(self.embed(texts))
+
+    def predict_with_proba(self, texts: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Embed *texts* once and return ``(labels, probabilities)``.
+
+        Labels are the argmax of the probabilities, which matches ``predict``.
+        """
+        probas = self.predict_proba(texts)
+        return self.classifier.classes_[probas.argmax(axis=1)], probas
 
     def save(self, path: Path | str) -> None:
+        import joblib
+
         payload = {
             "embedder": self.embedder_model,
             "classifier": self.classifier,
             "regularization": self.regularization,
+            "online": self.online,
+            "alpha": self.alpha,
         }
         joblib.dump(payload, path)
 
     @classmethod
     def load(cls, path: Path | str) -> "SentimentTransformer":
+        import joblib
+
         payload = joblib.load(path)
-        model = cls(embedder_model=payload["embedder"], regularization=payload["regularization"])
+        model = cls(
+            embedder_model=payload["embedder"],
+            regularization=payload["regularization"],
+            online=payload.get("online", False),
+            alpha=payload.get("alpha", 1e-6),
+        )
         model.classifier = payload["classifier"]
         return model
@@ -1,6 +1,7 @@
 """YAML based configuration utilities."""
 from __future__ import annotations
 
+import copy
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
@@ -16,14 +17,36 @@ def _to_namespace(obj: Any) -> Any:
     return obj
 
 
+def config_from_dict(data: dict[str, Any], root_dir: Path) -> SimpleNamespace:
+    """Namespace view of an already parsed config, as returned by ``load_config``."""
+    namespace = _to_namespace(data)
+    namespace._raw = data  # type: ignore[attr-defined]
+    namespace.root_dir = root_dir
+    return namespace
+
+
 def load_config(path: Path) -> SimpleNamespace:
     """Load YAML config at *path* and expose nested keys as attributes."""
     with path.open("r", encoding="utf-8") as fh:
         data = yaml.safe_load(fh)
-    namespace = _to_namespace(data)
-    namespace._raw = data  # type: ignore[attr-defined]
-    namespace.root_dir = path.parent
-    return namespace
+    return config_from_dict(data, path.parent)
+
+
+def apply_overrides(data: dict[str, Any], overrides: dict[str, Any]) -> dict[str, Any]:
+    """Copy of *data* with dotted keys replaced, e.g. ``{"training.sentiment.max_features": 1000}``.
+
+    Every key must already exist, so a typo fails instead of silently running the base config.
+    """
+    data = copy.deepcopy(data)
+    for key, value in overrides.items():
+        *parents, leaf = key.split(".")
+        section = data
+        for part in parents:
+            section = section.get(part) if isinstance(section, dict) else None
+        if not isinstance(section, dict) or leaf not in section:
+            raise KeyError(f"unknown config key {key}")
+        section[leaf] = value
+    return data
 
 
 def resolve_path(base: Path, relative_path: str) -> Path:
@@ -6,20 +6,21 @@ import pandas as pd
 
 
 def ensure_datetime(df: pd.DataFrame, column: str) -> pd.DataFrame:
-    """Return a copy of *df* ensuring column is datetime typed."""
-    result = df.copy()
-    result[column] = pd.to_datetime(result[column], errors="coerce")
-    return result.dropna(subset=[column])
+    """Return *df* with *column* datetime typed and rows where it is missing dropped.
+
+    The result is a shallow copy: it shares the caller's column data, and
+    assigning columns to it never writes through to *df*. A column that is
+    already ``datetime64`` is not converted, and nothing is copied unless rows
+    have to be dropped.
+    """
+    result = df.copy(deep=False)
+    if not pd.api.types.is_datetime64_any_dtype(result[column].dtype):
+        result[column] = pd.to_datetime(result[column], errors="coerce")
+    missing = result[column].isna().to_numpy()
+    return result[~missing] if missing.any() else result
 
 
 def safe_divide(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
     """Element wise division that avoids division by zero."""
     denom = denominator.replace(0, np.nan)
     return numerator / denom.fillna(1.0)
-
-
-def rolling_apply(series: pd.Series, window: int, func) -> pd.Series:
-    """Helper around pandas rolling that returns aligned series."""
-    if window <= 0:
-        raise ValueError("window must be positive")
-    return series.rolling(window=window, min_periods=1).apply(func, raw=False)
@@ -0,0 +1,219 @@
+"""Minimal stage runner that caches each stage's output on disk."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+from src.utils import profiling
+
+
+def save_frame(df: pd.DataFrame, path: Path) -> None:
+    df.to_parquet(path, index=False)
+
+
+def load_frame(path: Path) -> pd.DataFrame:
+    return pd.read_parquet(path)
+
+
+def share_frame(df: pd.DataFrame, path: Path) -> Path:
+    """Write *df* as an uncompressed Arrow IPC file that ``open_shared_frame`` maps without copying."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return path
+
+
+def open_shared_frame(path: Path) -> pd.DataFrame:
+    """Memory-map a ``share_frame`` file; processes opening the same file share its pages.
+
+    Columns without nulls are read-only views of the mapping; pandas copies
+    them on first write.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def file_signature(path: Path | str) -> dict[str, Any]:
+    """Cheap change detector for a raw input file (size and mtime, not content)."""
+    path = Path(path)
+    if not path.exists():
+        return {"path": str(path), "exists": False}
+    stat = path.stat()
+    return {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+@dataclass
+class Stage:
+    """One pipeline step.
+
+    ``run`` receives the outputs of ``inputs`` as positional arguments. ``params``
+    must be JSON serialisable; together with the upstream stage keys it forms
+    the cache key, so a stage reruns only when its config or an upstream
+    stage changed.
+
+    ``publish`` writes the output to the files named in ``targets`` (model
+    artifacts, datasets other tools read). The runner calls it whether the
+    output was computed or taken from the cache, so the targets always hold
+    the current configuration's output; it is skipped when they already do.
+    """
+
+    name: str
+    run: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    params: Any = None
+    save: Callable[[Any, Path], None] = save_frame
+    load: Callable[[Path], Any] = load_frame
+    suffix: str = ".parquet"
+    publish: Callable[[Any], None] | None = None
+    targets: tuple[str, ...] = ()
+
+
+@dataclass
+class StageResult:
+    name: str
+    key: str
+    status: str
+    seconds: float
+
+
+@dataclass
+class PipelineRunner:
+    stages: list[Stage]
+    cache_dir: Path
+    logger: logging.Logger = field(default_factory=lambda: logging.getLogger(__name__))
+    results: list[StageResult] = field(default_factory=list, init=False)
+
+    def __post_init__(self) -> None:
+        self._by_name = {stage.name: stage for stage in self.stages}
+        if len(self._by_name) != len(self.stages):
+            raise ValueError("stage names must be unique")
+
+    @property
+    def names(self) -> list[str]:
+        return [stage.name for stage in self.stages]
+
+    def _position(self, name: str | None, default: int) -> int:
+        if name is None:
+            return default
+        if name not in self._by_name:
+            raise KeyError(f"unknown stage {name}")
+        return self.names.index(name)
+
+    def _path(self, stage: Stage, key: str) -> Path:
+        return self.cache_dir / f"{stage.name}-{key}{stage.suffix}"
+
+    def _marker(self, stage: Stage) -> Path:
+        targets = json.dumps(sorted(str(target) for target in stage.targets))
+        return self.cache_dir / "published" / f"{stage.name}-{hashlib.sha1(targets.encode('utf-8')).hexdigest()[:16]}"
+
+    def _publish(self, stage: Stage, key: str, output: Callable[[], Any], fresh: bool) -> None:
+        """Publish *stage*'s output unless its targets already hold the output for *key*."""
+        marker = self._marker(stage)
+        if not fresh and marker.exists() and marker.read_text(encoding="utf-8") == key:
+            if all(Path(target).exists() for target in stage.targets):
+                return
+        # Drop the marker first so an interrupted publish is redone on the next run.
+        marker.unlink(missing_ok=True)
+        start = time.perf_counter()
+        stage.publish(output())
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        partial = marker.with_name(f"{marker.name}.{os.getpid()}.partial")
+        partial.write_text(key, encoding="utf-8")
+        os.replace(partial, marker)
+        self.logger.info("Stage %s: published in %.2fs", stage.name, time.perf_counter() - start)
+
+    def stage_keys(self) -> dict[str, str]:
+        keys: dict[str, str] = {}
+        for stage in self.stages:
+            payload = json.dumps(
+                {"stage": stage.name, "params": stage.params, "inputs": [keys[i] for i in stage.inputs]},
+                sort_keys=True,
+                default=str,
+            )
+            keys[stage.name] = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+        return keys
+
+    def load(self, name: str) -> Any:
+        """Load the cached output of stage *name* as of the current configuration."""
+        if name not in self._by_name:
+            raise KeyError(f"unknown stage {name}")
+        stage = self._by_name[name]
+        path = self._path(stage, self.stage_keys()[name])
+        if not path.exists():
+            raise FileNotFoundError(f"stage {name} has no cached output at {path}")
+        return stage.load(path)
+
+    def run(
+        self, from_stage: str | None = None, to_stage: str | None = None, provided: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Run stages up to *to_stage*, recomputing from *from_stage* on and reusing cached outputs before it.
+
+        Stages named in *provided* take that output as is (status ``shared``),
+        e.g. frames another process already computed. Every stage run up to
+        *to_stage* is published, whatever its status. Returns the outputs of
+        every stage that was computed, provided, published or needed as an input.
+        """
+        provided = provided or {}
+        first = self._position(from_stage, len(self.stages))
+        last = self._position(to_stage, len(self.stages) - 1)
+        keys = self.stage_keys()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.results = []
+        outputs: dict[str, Any] = {}
+
+        def resolve(name: str) -> Any:
+            if name not in outputs:
+                stage = self._by_name[name]
+                start = time.perf_counter()
+                with profiling.track(f"{name}.cached") as record:
+                    outputs[name] = stage.load(self._path(stage, keys[name]))
+                    if record is not None:
+                        record.rows_out = profiling.rows(outputs[name])
+                self.logger.info("Stage %s: loaded cached output in %.2fs", name, time.perf_counter() - start)
+            return outputs[name]
+
+        for position, stage in enumerate(self.stages[: last + 1]):
+            if stage.name in provided:
+                outputs[stage.name] = provided[stage.name]
+                self.results.append(StageResult(stage.name, keys[stage.name], "shared", 0.0))
+                if stage.publish is not None:
+                    self._publish(stage, keys[stage.name], lambda: outputs[stage.name], fresh=False)
+                continue
+            path = self._path(stage, keys[stage.name])
+            if position < first and path.exists():
+                self.results.append(StageResult(stage.name, keys[stage.name], "cached", 0.0))
+                if stage.publish is not None:
+                    self._publish(stage, keys[stage.name], lambda: resolve(stage.name), fresh=False)
+                continue
+            inputs = [resolve(name) for name in stage.inputs]
+            start = time.perf_counter()
+            counts = [count for count in map(profiling.rows, inputs) if count is not None]
+            with profiling.track(stage.name, rows_in=sum(counts) if counts else None) as record:
+                output = stage.run(*inputs)
+                # Write then rename, so concurrent runs sharing the cache never read a partial file.
+                partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+                stage.save(output, partial)
+                os.replace(partial, path)
+                if record is not None:
+                    record.rows_out = profiling.rows(output)
+            outputs[stage.name] = output
+            elapsed = time.perf_counter() - start
+            self.results.append(StageResult(stage.name, keys[stage.name], "computed", elapsed))
+            self.logger.info("Stage %s: computed in %.2fs", stage.name, elapsed)
+            if stage.publish is not None:
+                self._publish(stage, keys[stage.name], lambda: output, fresh=True)
+        return outputs
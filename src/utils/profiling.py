@@ -0,0 +1,199 @@
+"""Opt-in timing, memory and cProfile instrumentation for pipeline stages.
+
+Code marks hot paths with ``track("name")`` blocks or the ``@instrument()``
+decorator. Both are no-ops unless a ``Profiler`` is active::
+
+    profiler = Profiler(profile_dir=Path("logs/profiles"))
+    with profiler.activate():
+        run_pipeline()
+    profiler.write_report(Path("logs/run_report.json"))
+
+Nested blocks are recorded with ``/``-joined names (``preprocess/clean_news``).
+Peak RSS comes from ``VmHWM`` in ``/proc/self/status``, reset between blocks
+via ``/proc/self/clear_refs`` where the kernel allows it; elsewhere the memory
+fields are ``None`` or, if the reset is refused, only count growth of the
+process-wide high-water mark.
+"""
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_ACTIVE: "Profiler | None" = None
+_DISABLED = contextlib.nullcontext()
+
+
+def _memory() -> tuple[int, int] | None:
+    """Current and peak resident set size in bytes, or ``None`` without ``/proc``."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            fields = dict(line.split(":", 1) for line in fh if line.startswith(("VmRSS", "VmHWM")))
+    except OSError:
+        return None
+    return int(fields["VmRSS"].split()[0]) * 1024, int(fields["VmHWM"].split()[0]) * 1024
+
+
+def _reset_peak() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def rows(obj: Any) -> int | None:
+    """Row count of a frame, array or other sized object; ``None`` for models and scalars."""
+    shape = getattr(obj, "shape", None)
+    if shape:
+        return int(shape[0])
+    if isinstance(obj, (list, tuple)):
+        return len(obj)
+    return None
+
+
+@dataclass
+class StageRecord:
+    name: str
+    depth: int
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows_in: int | None = None
+    rows_out: int | None = None
+    peak_rss_delta_bytes: int | None = None
+    profile: str | None = None
+
+
+@dataclass
+class _Frame:
+    record: StageRecord
+    rss_start: int
+    hwm_start: int
+    peak: int
+
+
+@dataclass
+class Profiler:
+    """Collects a ``StageRecord`` per tracked block while active.
+
+    With ``profile_dir`` every top-level block also runs under ``cProfile``
+    and dumps ``<name>.prof`` there (readable with ``pstats`` or snakeviz).
+    """
+
+    profile_dir: Path | None = None
+    records: list[StageRecord] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._stack: list[_Frame] = []
+        self._started = time.perf_counter()
+        self._created = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._resettable = _memory() is not None and _reset_peak()
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["Profiler"]:
+        global _ACTIVE
+        previous, _ACTIVE = _ACTIVE, self
+        try:
+            yield self
+        finally:
+            _ACTIVE = previous
+
+    def _fold_peak(self) -> None:
+        """Credit the peak since the last reset to every open block, then reset it."""
+        memory = _memory()
+        if memory is None:
+            return
+        for frame in self._stack:
+            frame.peak = max(frame.peak, memory[1])
+        if self._resettable:
+            _reset_peak()
+
+    @contextlib.contextmanager
+    def track(self, name: str, rows_in: int | None = None) -> Iterator[StageRecord]:
+        """Record wall/CPU time and peak RSS growth of the block; set ``rows_out`` on the yielded record."""
+        if self._stack:
+            name = f"{self._stack[-1].record.name}/{name}"
+        record = StageRecord(name, depth=len(self._stack), rows_in=rows_in)
+        self.records.append(record)
+        self._fold_peak()
+        memory = _memory()
+        rss, hwm = memory or (0, 0)
+        frame = _Frame(record, rss_start=rss, hwm_start=hwm, peak=hwm)
+        self._stack.append(frame)
+
+        profile = None
+        if self.profile_dir is not None and record.depth == 0:
+            import cProfile
+
+            profile = cProfile.Profile()
+            profile.enable()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - wall
+            record.cpu_seconds = time.process_time() - cpu
+            if profile is not None:
+                profile.disable()
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                path = self.profile_dir / f"{name.replace('/', '.')}.prof"
+                profile.dump_stats(path)
+                record.profile = str(path)
+            self._fold_peak()
+            self._stack.pop()
+            if memory is not None:
+                baseline = frame.rss_start if self._resettable else frame.hwm_start
+                record.peak_rss_delta_bytes = max(frame.peak - baseline, 0)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "created": self._created,
+            "total_wall_seconds": time.perf_counter() - self._started,
+            "stages": [asdict(record) for record in self.records],
+        }
+
+    def write_report(self, path: Path) -> Path:
+        """Write ``report()`` to *path* as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        return path
+
+
+def active() -> Profiler | None:
+    return _ACTIVE
+
+
+def track(name: str, rows_in: int | None = None) -> contextlib.AbstractContextManager:
+    """``Profiler.track`` on the active profiler; yields ``None`` and costs one check when profiling is off."""
+    if _ACTIVE is None:
+        return _DISABLED
+    return _ACTIVE.track(name, rows_in)
+
+
+def instrument(name: str | None = None) -> Callable[[F], F]:
+    """Decorator tracking every call; rows in/out come from the first argument and the result."""
+
+    def decorate(func: F) -> F:
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _ACTIVE is None:
+                return func(*args, **kwargs)
+            with _ACTIVE.track(label, rows(args[0]) if args else None) as record:
+                result = func(*args, **kwargs)
+                record.rows_out = rows(result)
+                return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
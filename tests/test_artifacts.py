@@ -0,0 +1,134 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models import artifacts, market_reaction_model, predict_sentiment
+from src.nlp import feature_engineering
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+TEXTS = ["good profit", "bad loss", "record growth", "fraud investigation", "flat day", "quiet session"]
+LABELS = [1, -1, 1, -1, 0, 0]
+QUERIES = ["Profit beats, record GROWTH!", "loss widens after fraud", "unseen words only", ""]
+
+
+def test_compact_sentiment_matches_sklearn(tmp_path):
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    artifacts.export_sentiment(model, tmp_path / "sentiment")
+    compact = predict_sentiment.load_model(tmp_path / "sentiment")
+
+    assert isinstance(compact, artifacts.CompactSentimentModel)
+    np.testing.assert_allclose(compact.predict_proba(QUERIES), model.predict_proba(QUERIES), atol=1e-12)
+    np.testing.assert_array_equal(compact.predict(QUERIES), model.predict(QUERIES))
+    assert isinstance(compact.vocab_sorted, np.memmap)
+
+
+def test_compact_reaction_matches_sklearn(tmp_path):
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    features = feature_engineering.build_features(
+        pd.DataFrame({"clean_text": TEXTS, "reaction": np.linspace(-0.01, 0.02, len(TEXTS))}), model
+    )
+    regressor = market_reaction_model.train_reaction_model(features)
+    artifacts.export_reaction(regressor, tmp_path / "reaction")
+    compact = market_reaction_model.load_model(tmp_path / "reaction")
+
+    pd.testing.assert_series_equal(
+        market_reaction_model.predict(compact, features), market_reaction_model.predict(regressor, features)
+    )
+
+
+def test_version_header_is_checked(tmp_path):
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    path = artifacts.export_sentiment(model, tmp_path / "sentiment")
+    manifest = path / artifacts.MANIFEST
+    manifest.write_text(manifest.read_text().replace('"version": 1', '"version": 99'))
+    with pytest.raises(ValueError, match="version"):
+        artifacts.load_sentiment(path)
+    with pytest.raises(ValueError):
+        artifacts.load_reaction(path)
+
+
+def test_compact_inference_does_not_import_sklearn(tmp_path):
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    artifacts.export_sentiment(model, tmp_path / "sentiment")
+    code = (
+        "import sys; from src.models import artifacts; "
+        f"artifacts.load_sentiment({str(tmp_path / 'sentiment')!r}).predict_proba(['record profit']); "
+        "assert 'sklearn' not in sys.modules"
+    )
+    root = Path(__file__).resolve().parents[1]
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)
+
+
+def test_horizon_models_per_target_and_multi_output(tmp_path):
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    frame = pd.DataFrame(
+        {
+            "clean_text": TEXTS,
+            "forward_return_1d": np.linspace(-0.01, 0.02, len(TEXTS)),
+            "forward_return_3d": [0.03, -0.02, np.nan, -0.04, 0.0, 0.01],
+        }
+    )
+    features = feature_engineering.build_features(frame, model)
+    targets = ["forward_return_1d", "forward_return_3d"]
+
+    separate = market_reaction_model.train_horizon_models(features, targets)
+    joint = market_reaction_model.train_horizon_models(features, targets, multi_output=True)
+    per_target = market_reaction_model.predict_horizons(separate, features)
+    assert list(per_target.columns) == ["predicted_forward_return_1d", "predicted_forward_return_3d"]
+    assert per_target.notna().all().all()
+
+    artifacts.export_reaction(joint, tmp_path / "horizons")
+    compact = market_reaction_model.load_model(tmp_path / "horizons")
+    assert compact.target_names_ == targets
+    pd.testing.assert_frame_equal(
+        market_reaction_model.predict_horizons(compact, features), market_reaction_model.predict_horizons(joint, features)
+    )
+    # Both forms agree on the 3-day target when fitted on the same rows.
+    known = features[features["forward_return_3d"].notna()]
+    np.testing.assert_allclose(
+        market_reaction_model.predict_horizons(joint, known)["predicted_forward_return_3d"],
+        market_reaction_model.predict_horizons(market_reaction_model.train_horizon_models(known, targets), known)[
+            "predicted_forward_return_3d"
+        ],
+        atol=1e-10,
+    )
+
+
+def test_reaction_predictor_paths_match_sklearn(tmp_path):
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    frame = pd.DataFrame({"clean_text": TEXTS, "reaction": np.linspace(-0.01, 0.02, len(TEXTS))})
+    features = feature_engineering.build_features(frame, model)
+    features["realized_volatility"] = np.linspace(0.0, 0.05, len(TEXTS))
+    regressor = market_reaction_model.train_reaction_model(features, include_market=True)
+    expected = regressor.predict(features[list(regressor.feature_names_in_)])
+
+    compact = market_reaction_model.load_model(artifacts.export_reaction(regressor, tmp_path / "reaction"))
+    predictor = market_reaction_model.reaction_predictor(compact)
+    assert predictor.feature_names == tuple(regressor.feature_names_in_)
+    # Frame columns in another order, a raw array and the sentiment model's output all agree.
+    shuffled = features[features.columns[::-1]]
+    np.testing.assert_allclose(predictor.predict_frame(shuffled), expected, atol=1e-12)
+    np.testing.assert_allclose(predictor.predict_array(features[list(predictor.feature_names)].to_numpy()), expected, atol=1e-12)
+    preds, probas = model.predict_with_proba(TEXTS)
+    market = np.zeros((len(TEXTS), len(market_reaction_model.MARKET_FEATURES)))
+    market[:, market_reaction_model.MARKET_FEATURES.index("realized_volatility")] = features["realized_volatility"]
+    np.testing.assert_allclose(predictor.predict_sentiment(preds, probas, model.classes_, market), expected, atol=1e-12)
+    assert predictor.predict_array(features[list(predictor.feature_names)].to_numpy()[0]).shape == (1,)
+
+    with pytest.raises(KeyError):
+        predictor.predict_frame(features.drop(columns="sentiment_prob_neutral"))
+    with pytest.raises(KeyError):
+        predictor.predict_sentiment(preds, probas[:, :2], model.classes_[:2])
+    with pytest.raises(ValueError, match="market features"):
+        predictor.predict_sentiment(preds, probas, model.classes_)
+
+    # Refitting replaces the coefficients, so the cached predictor is rebuilt.
+    first = market_reaction_model.reaction_predictor(regressor)
+    assert market_reaction_model.reaction_predictor(regressor) is first
+    regressor.fit(features[list(regressor.feature_names_in_)], -features["reaction"])
+    assert market_reaction_model.reaction_predictor(regressor) is not first
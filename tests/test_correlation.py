@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse, stats
+
+from src.analysis import correlation
+
+
+@pytest.fixture()
+def frame():
+    rng = np.random.default_rng(0)
+    n = 3_000
+    df = pd.DataFrame(
+        {
+            "sentiment_prob_positive": rng.random(n),
+            "sentiment_prob_negative": rng.random(n) + 1e6,  # far from zero: exercises the shifted sums
+            "ticker": rng.choice(["AAA", "BBB", "CCC"], n),
+        }
+    )
+    df["reaction"] = 0.2 * df["sentiment_prob_positive"] + rng.normal(0, 0.1, n)
+    df.loc[::7, "sentiment_prob_positive"] = np.nan
+    df.loc[::11, "reaction"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_grouped_correlations_match_pandas_and_scipy(frame, method):
+    features = ["sentiment_prob_positive", "sentiment_prob_negative"]
+    result = correlation.correlate(frame, features, method=method, by="ticker").set_index(["ticker", "feature"])
+    for ticker, group in frame.groupby("ticker"):
+        expected = group[features + ["reaction"]].corr(method=method)["reaction"]
+        for feature in features:
+            assert result.loc[(ticker, feature), "correlation"] == pytest.approx(expected[feature], abs=1e-10)
+    pairs = frame[frame["ticker"] == "AAA"].dropna()
+    scipy_result = stats.pearsonr(pairs["sentiment_prob_positive"], pairs["reaction"])
+    row = correlation.correlate(frame, ["sentiment_prob_positive"], by="ticker").iloc[0]
+    assert row["n"] == len(pairs)
+    assert row["p_value"] == pytest.approx(scipy_result.pvalue, rel=1e-6)
+
+
+def test_sparse_features_match_dense():
+    rng = np.random.default_rng(1)
+    X = sparse.random(500, 20, density=0.05, random_state=1, format="csr")
+    y, groups = rng.normal(size=500), rng.choice(["a", "b"], 500)
+    dense = correlation.correlate_matrix(X.toarray(), y, groups=groups)
+    pd.testing.assert_frame_equal(correlation.correlate_matrix(X, y, groups=groups), dense, atol=1e-12)
+
+
+def test_accumulator_batches_and_merges_match_one_pass(frame):
+    features = ["sentiment_prob_positive", "sentiment_prob_negative"]
+    expected = correlation.correlate(frame, features, by="ticker")
+    streamed = correlation.CorrelationAccumulator(features, by="ticker")
+    for start in range(0, len(frame), 700):
+        streamed.update(frame.iloc[start:start + 700])
+    left = correlation.CorrelationAccumulator(features, by="ticker").update(frame.iloc[:1000])
+    right = correlation.CorrelationAccumulator(features, by="ticker").update(frame.iloc[1000:])
+    for result in (streamed.result(), right.merge(left).result()):
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, atol=1e-9)
+
+
+def test_bootstrap_ci_covers_estimate_and_ignores_n_jobs(frame):
+    one = correlation.bootstrap_ci(frame, by="ticker", n_boot=120, seed=3)
+    two = correlation.bootstrap_ci(frame, by="ticker", n_boot=120, seed=3, n_jobs=2)
+    pd.testing.assert_frame_equal(one, two)
+    assert ((one["ci_low"] <= one["correlation"]) & (one["correlation"] <= one["ci_high"])).all()
+    assert correlation.sentiment_reaction_correlation(frame).index[0] == "sentiment_prob_positive"
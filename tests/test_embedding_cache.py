@@ -0,0 +1,84 @@
+import numpy as np
+
+from src.nlp.embedder import NewsEmbedder
+from src.nlp.embedding_cache import EmbeddingCache, normalization, text_key
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+TEXTS = ["good profit", "bad loss", "record growth", "fraud investigation", "flat day", "quiet session"]
+LABELS = [1, -1, 1, -1, 0, 0]
+
+
+def test_cache_returns_same_vectors_and_counts_hits(tmp_path):
+    embedder = NewsEmbedder().fit(TEXTS)
+    cache = EmbeddingCache(tmp_path)
+    queries = ["good profit", "Bad  LOSS", "good profit", "new words"]
+
+    first = cache.transform(embedder, queries)
+    np.testing.assert_allclose(first.toarray(), embedder.transform(queries).toarray())
+    assert cache.stats()["misses"] == 4 and len(cache) == 3
+
+    cache.flush()
+    reopened = EmbeddingCache(tmp_path)
+    second = reopened.transform(embedder, queries, dense=True)
+    np.testing.assert_allclose(second, first.toarray())
+    assert reopened.stats()["hits"] == 4
+
+
+def test_cache_keys_change_with_vectorizer(tmp_path):
+    cache = EmbeddingCache(tmp_path)
+    cache.transform(NewsEmbedder().fit(TEXTS), ["good profit"])
+    cache.transform(NewsEmbedder().fit(TEXTS[:3]), ["good profit"])
+    assert cache.stats()["hits"] == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    embedder = NewsEmbedder().fit(TEXTS)
+    cache = EmbeddingCache(tmp_path, max_entries=2, shard_rows=1)
+    cache.transform(embedder, ["good profit"])
+    cache.transform(embedder, ["bad loss"])
+    cache.transform(embedder, ["good profit"])  # refresh
+    cache.transform(embedder, ["record growth"])  # evicts "bad loss"
+    assert len(cache) == 2
+    assert len(list(tmp_path.glob("shard_*.data.npy"))) == 2
+
+    cache.hits = cache.misses = 0
+    cache.transform(embedder, ["good profit", "bad loss"])
+    assert cache.stats()["hits"] == 1
+
+
+def test_sentiment_transformer_uses_cache(tmp_path):
+    cache = EmbeddingCache(tmp_path)
+    model = SentimentTransformer(embedding_cache=cache).fit(TEXTS, LABELS)
+    uncached = SentimentTransformer().fit(TEXTS, LABELS)
+    for _ in range(2):
+        np.testing.assert_allclose(model.predict_proba(TEXTS), uncached.predict_proba(TEXTS))
+    assert cache.stats()["hits"] == len(TEXTS)
+
+
+def test_small_puts_are_buffered_until_a_full_shard_or_flush(tmp_path):
+    embedder = NewsEmbedder().fit(TEXTS)
+    cache = EmbeddingCache(tmp_path, shard_rows=4)
+    for text in TEXTS[:3]:
+        cache.transform(embedder, [text])
+    assert not list(tmp_path.glob("*"))
+    assert cache.transform(embedder, TEXTS[:1]).shape[0] == 1 and cache.stats()["hits"] == 1
+
+    cache.transform(embedder, TEXTS[3:5])  # fifth row fills the shard
+    assert len(list(tmp_path.glob("shard_*.data.npy"))) == 1
+    cache.transform(embedder, TEXTS[5:])
+    cache.close()
+    reopened = EmbeddingCache(tmp_path)
+    np.testing.assert_allclose(reopened.transform(embedder, TEXTS).toarray(), embedder.transform(TEXTS).toarray())
+    assert reopened.stats()["hits"] == len(TEXTS)
+
+
+def test_keys_normalise_only_what_the_vectorizer_ignores():
+    params = NewsEmbedder().fit(TEXTS).vectorizer.get_params()
+    options = normalization(params)
+    assert options == {"lowercase": True, "collapse_whitespace": True}
+    assert text_key("Good  Profit", "f", **options) == text_key("good profit", "f", **options)
+
+    strict = normalization({**params, "lowercase": False, "analyzer": "char"})
+    assert strict == {"lowercase": False, "collapse_whitespace": False}
+    assert text_key("Good  Profit", "f", **strict) != text_key("good profit", "f", **strict)
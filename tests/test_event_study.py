@@ -1,3 +1,56 @@
-"""Placeholder file – user will supply tests."""
+import numpy as np
+import pandas as pd
+import pytest
 
-pass
+from src.analysis import event_study
+
+
+def _daily_market(days: int = 30) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01 16:00", periods=days, freq="D"),
+            "close": 100 + rng.normal(size=days).cumsum(),
+        }
+    )
+
+
+def _reference_windows(events: pd.DataFrame, market: pd.DataFrame, window: int) -> pd.DataFrame:
+    market = market.sort_values("timestamp").set_index("timestamp")
+    market["return"] = market["close"].pct_change().fillna(0.0)
+    windows = []
+    for event_time in events["timestamp"]:
+        slice_df = market.loc[event_time - pd.Timedelta(days=window):event_time + pd.Timedelta(days=window), "return"]
+        if not slice_df.empty:
+            windows.append(pd.Series(slice_df.values, index=(slice_df.index - event_time).days))
+    avg = pd.concat(windows, axis=1).mean(axis=1).sort_index()
+    return pd.DataFrame({"avg_abnormal_return": avg, "cumulative_abnormal_return": avg.cumsum()})
+
+
+def test_compute_event_windows_matches_loop_reference():
+    market = _daily_market()
+    events = pd.DataFrame(
+        {"timestamp": pd.to_datetime(["2024-01-01 10:00", "2024-01-05 12:00", "2024-01-05 18:00", "2024-01-28 09:00"])}
+    )
+    result = event_study.compute_event_windows(events, market, window=3, block_size=2)
+    expected = _reference_windows(events, market, window=3)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_index_type=False, check_names=False)
+    assert result.loc[0, "n_events"] == 4
+
+
+def test_compute_event_cars_and_t_statistic():
+    market = _daily_market()
+    events = pd.DataFrame({"timestamp": pd.to_datetime(["2024-01-05 12:00", "2024-01-10 12:00", "2025-06-01 12:00"])})
+    cars = event_study.compute_event_cars(events, market, window=2)
+    matrix = event_study.event_return_matrix(events, market, window=2)
+
+    assert len(cars) == 2  # the 2025 event has no bars in its window
+    np.testing.assert_allclose(cars["cumulative_abnormal_return"], matrix.iloc[:2].sum(axis=1))
+    values = cars["cumulative_abnormal_return"]
+    assert event_study.car_t_statistic(values) == pytest.approx(values.mean() / (values.std() / np.sqrt(2)))
+
+
+def test_compute_event_windows_empty_when_no_overlap():
+    market = _daily_market()
+    events = pd.DataFrame({"timestamp": pd.to_datetime(["2030-01-01"])})
+    assert event_study.compute_event_windows(events, market).empty
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from src.models import predict_sentiment
+from src.nlp import feature_engineering
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+TEXTS = ["good profit", "bad loss", "record growth", "fraud investigation", "flat day", "quiet session"]
+LABELS = [1, -1, 1, -1, 0, 0]
+
+
+def test_build_features_matches_predict_and_predict_proba():
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    df = pd.DataFrame({"clean_text": TEXTS + ["profit beats"]})
+    features = feature_engineering.build_features(df, model)
+
+    np.testing.assert_array_equal(features["sentiment_pred"], model.predict(df["clean_text"]))
+    expected = model.predict_proba(df["clean_text"])
+    prob_cols = ["sentiment_prob_negative", "sentiment_prob_neutral", "sentiment_prob_positive"]
+    np.testing.assert_array_equal(features[prob_cols].to_numpy(), expected)
+
+
+def test_predict_dataframe_matches_predict_and_predict_proba(tmp_path):
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    model_path = tmp_path / "sentiment.joblib"
+    model.save(model_path)
+    queries = ["profit beats", "loss widens", "flat"]
+    result = predict_sentiment.predict_dataframe(queries, model_path)
+
+    np.testing.assert_array_equal(result["prediction"], model.predict(queries))
+    np.testing.assert_array_equal(result.drop(columns="prediction").to_numpy(), model.predict_proba(queries))
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from src.data import fetch_data
+
+
+@pytest.fixture()
+def news_frame():
+    return pd.DataFrame(
+        {
+            "timestamp": ["2024-01-01 10:00", "2024-01-01 12:00", "2024-01-02 09:00"],
+            "headline": ["Record profit", "Fraud probe", "Flat day"],
+            "source": ["wire", "wire", "blog"],
+            "body": ["x" * 50] * 3,
+        }
+    )
+
+
+def test_load_news_projects_columns_and_parses_timestamps(tmp_path, news_frame):
+    path = tmp_path / "news.csv"
+    news_frame.to_csv(path, index=False)
+    loaded = fetch_data.load_news(path)
+    assert list(loaded.columns) == fetch_data.DEFAULT_NEWS_COLUMNS
+    assert pd.api.types.is_datetime64_any_dtype(loaded["timestamp"])
+    assert loaded["source"].dtype == "category"
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".feather"])
+def test_iter_news_chunks_match_full_load(tmp_path, news_frame, suffix):
+    path = tmp_path / f"news{suffix}"
+    if suffix == ".csv":
+        news_frame.to_csv(path, index=False)
+    else:
+        typed = news_frame.assign(timestamp=pd.to_datetime(news_frame["timestamp"]))
+        getattr(typed, "to_parquet" if suffix == ".parquet" else "to_feather")(path)
+
+    chunks = list(fetch_data.iter_news(path, chunksize=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    streamed = pd.concat(chunks, ignore_index=True)
+    expected = fetch_data.load_news(path)
+    pd.testing.assert_frame_equal(
+        streamed.astype({"source": str}), expected.astype({"source": str}), check_dtype=False
+    )
+
+
+def test_load_market_simulates_when_missing(tmp_path):
+    market = fetch_data.load_market(tmp_path / "missing.csv")
+    assert list(market.columns) == fetch_data.DEFAULT_MARKET_COLUMNS
+    assert market["close"].dtype == "float64"
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+# Generous default so slow CI machines pass; importing scikit-learn alone costs more.
+BUDGET_SECONDS = float(os.environ.get("IMPORT_TIME_BUDGET_S", "1.5"))
+HEAVY = ("sklearn", "matplotlib", "src.models.train_sentiment", "src.nlp.embedding_cache")
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """Cumulative microseconds per module from ``python -X importtime``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.mark.parametrize("entry_point", ["score", "src.models.scoring_service"])
+def test_scoring_entry_points_skip_heavy_imports(entry_point):
+    profile = import_profile(entry_point)
+    loaded = [name for name in profile if name.split(".")[0] in HEAVY or name in HEAVY]
+    assert loaded == []
+    assert profile[entry_point] / 1e6 < BUDGET_SECONDS
+
+
+def test_train_entry_point_defers_model_libraries():
+    profile = import_profile("train")
+    assert not any(name.split(".")[0] in ("sklearn", "matplotlib") for name in profile)
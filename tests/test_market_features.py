@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import synthetic
+from src.data.market_features import MARKET_FEATURES, add_market_features, market_features
+
+
+def _rolling_reference(market: pd.DataFrame, window: str) -> pd.DataFrame:
+    """Per-window Python kernels, the slow path the engine replaces."""
+    frames = []
+    for _, group in market.sort_values(["ticker", "timestamp"], kind="stable").groupby("ticker", sort=False, observed=True):
+        group = group.set_index("timestamp")
+        log_returns = np.log(group["close"]).diff().fillna(0.0).rolling(window)
+        volume_std = lambda x: x.std(ddof=1) if len(x) > 1 else np.nan
+        frames.append(
+            pd.DataFrame(
+                {
+                    "lookback_return": group["close"].rolling(window).apply(lambda x: x[-1] / x[0] - 1, raw=True),
+                    "realized_volatility": log_returns.apply(lambda x: np.sqrt((x[1:] ** 2).sum()), raw=True),
+                    "baseline_return": log_returns.apply(lambda x: x[1:].mean() if len(x) > 1 else np.nan, raw=True),
+                    "volume_zscore": group["volume"].rolling(window).apply(
+                        lambda x: (x[-1] - x.mean()) / volume_std(x) if volume_std(x) > 0 else np.nan, raw=True
+                    ),
+                }
+            ).reset_index(drop=True)
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("lookback_days", [0.5, 2, 7])
+def test_market_features_match_rolling_reference(lookback_days):
+    market = synthetic.make_market(tickers=3, days=15, bars_per_day=10, seed=1)
+    features = market_features(market, lookback_days, by="ticker")
+    expected = _rolling_reference(market, f"{int(lookback_days * 24)}h")
+    for column in MARKET_FEATURES:
+        np.testing.assert_allclose(features[column], expected[column], rtol=1e-8, atol=1e-12, err_msg=column)
+
+
+def test_add_market_features_uses_only_earlier_bars():
+    market = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2024-01-01 10:00", "2024-01-01 11:00", "2024-01-01 12:00", "2024-01-01 10:00"]),
+            "ticker": ["AAA", "AAA", "AAA", "BBB"],
+            "close": [100.0, 110.0, 121.0, 50.0],
+            "volume": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+    news = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2024-01-01 12:00", "2024-01-01 10:30", "2024-01-01 09:00"]),
+            "ticker": ["AAA", "BBB", "AAA"],
+            "clean_text": ["c", "b", "a"],
+        }
+    )
+    joined = add_market_features(news, market, lookback_days=1, by="ticker")
+    assert list(joined["clean_text"]) == ["c", "b", "a"]
+    # The 12:00 bar is not visible to 12:00 news; the 11:00 bar is (one +10% step).
+    assert joined["lookback_return"].iloc[0] == pytest.approx(0.1)
+    assert joined["lookback_return"].iloc[1] == 0.0
+    assert joined[MARKET_FEATURES].iloc[2].isna().all()
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+
+from src.data import store
+from src.models import market_reaction_model
+
+
+@pytest.fixture()
+def features():
+    rng = np.random.default_rng(0)
+    rows = 3_000
+    probas = rng.dirichlet(np.ones(3), rows)
+    frame = pd.DataFrame(
+        {
+            "timestamp": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 120 * 24, rows), unit="h"),
+            "ticker": rng.choice(["AAA", "BBB", "CCC"], rows),
+            "sentiment_pred": probas.argmax(axis=1) - 1,
+            "sentiment_prob_negative": probas[:, 0],
+            "sentiment_prob_neutral": probas[:, 1],
+            "sentiment_prob_positive": probas[:, 2],
+            "realized_volatility": np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows) * 0.02),
+            "reaction": probas @ np.array([-0.01, 0.0, 0.01]) + rng.normal(0, 0.005, rows),
+            "weight": rng.random(rows),
+        }
+    )
+    frame.loc[::9, "reaction"] = np.nan
+    return frame
+
+
+def _chunks(df, size=700):
+    return (df.iloc[i:i + size] for i in range(0, len(df), size))
+
+
+@pytest.mark.parametrize("alpha", [0.0, 0.5])
+def test_streaming_fit_matches_in_memory(features, alpha):
+    expected = market_reaction_model.train_reaction_model(features, alpha=alpha, include_market=True)
+    streamed = market_reaction_model.train_reaction_model_streaming(_chunks(features), alpha=alpha, include_market=True)
+    assert type(streamed) is type(expected)
+    assert list(streamed.feature_names_in_) == list(expected.feature_names_in_)
+    np.testing.assert_allclose(streamed.coef_, expected.coef_, atol=1e-10)
+    assert streamed.intercept_ == pytest.approx(expected.intercept_, abs=1e-10)
+    pd.testing.assert_series_equal(
+        market_reaction_model.predict(streamed, features), market_reaction_model.predict(expected, features)
+    )
+
+
+def test_weighted_accumulators_merge_in_any_order(features):
+    X, y = market_reaction_model.prepare_training_data(features)
+    expected = Ridge(alpha=0.5).fit(X, y, sample_weight=features.loc[y.index, "weight"])
+
+    parts = [market_reaction_model.ReactionAccumulator(weight_column="weight").update(chunk) for chunk in _chunks(features)]
+    forward = market_reaction_model.ReactionAccumulator(weight_column="weight")
+    backward = market_reaction_model.ReactionAccumulator(weight_column="weight")
+    for part in parts:
+        forward.merge(part)
+    for part in reversed(parts):
+        backward.merge(part)
+    assert forward.rows == backward.rows == len(y)
+    for accumulator in (forward, backward):
+        np.testing.assert_allclose(accumulator.fit(alpha=0.5).coef_, expected.coef_, atol=1e-10)
+
+    with pytest.raises(ValueError):
+        market_reaction_model.ReactionAccumulator().fit()
+
+
+def test_store_training_in_worker_processes(tmp_path, features):
+    root = store.write_dataset(features, tmp_path / "features", row_group_rows=256)
+    assert store.partitions(root) == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    assert sum(len(batch) for batch in store.iter_batches(root, ["reaction"], batch_rows=500)) == len(features)
+
+    window = features[(features["timestamp"] >= "2024-02-15") & (features["timestamp"] < "2024-04-01")]
+    expected = LinearRegression().fit(*market_reaction_model.prepare_training_data(window))
+    fitted = market_reaction_model.train_reaction_model_from_store(root, start="2024-02-15", end="2024-04-01", n_jobs=2)
+    np.testing.assert_allclose(fitted.coef_, expected.coef_, atol=1e-10)
+    assert fitted.intercept_ == pytest.approx(expected.intercept_, abs=1e-10)
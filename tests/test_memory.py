@@ -0,0 +1,86 @@
+"""Peak allocation of each preprocessing stage as a multiple of its input's size.
+
+Only NumPy allocations are traced (Arrow-backed strings live in Arrow's own
+pool), so the inputs carry a numeric payload that any full copy would show.
+"""
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import merge_news_market, preprocess, synthetic
+from src.nlp import feature_engineering
+from src.utils.helpers import ensure_datetime
+
+
+PAYLOAD_COLUMNS = 16
+
+
+def _with_payload(df: pd.DataFrame) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    payload = pd.DataFrame(rng.normal(size=(len(df), PAYLOAD_COLUMNS)), columns=[f"x{i}" for i in range(PAYLOAD_COLUMNS)])
+    return pd.concat([df, payload], axis=1)
+
+
+def _amplification(func, *frames, **kwargs):
+    """Run *func* and return (peak traced bytes / input bytes, result)."""
+    size = sum(int(frame.memory_usage(deep=True).sum()) for frame in frames)
+    tracemalloc.start()
+    try:
+        result = func(*frames, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak / size, result
+
+
+@pytest.fixture(scope="module")
+def news():
+    return _with_payload(synthetic.make_news(50_000, tickers=10, days=30, seed=0))
+
+
+@pytest.fixture(scope="module")
+def market():
+    return _with_payload(synthetic.make_market(tickers=10, days=30, bars_per_day=26, seed=0))
+
+
+def test_ensure_datetime_shares_data_and_never_writes_through(news):
+    amplification, result = _amplification(ensure_datetime, news, column="timestamp")
+    assert amplification < 0.05
+    assert np.shares_memory(result["x0"].to_numpy(), news["x0"].to_numpy())
+    result["x0"] = 0.0
+    assert (news["x0"] != 0.0).any()
+
+    text_times = pd.DataFrame({"timestamp": ["2024-01-02", "not a date", "2024-01-01"], "value": [1, 2, 3]})
+    converted = ensure_datetime(text_times, "timestamp")
+    assert list(converted["value"]) == [1, 3]
+    assert text_times["timestamp"].dtype != converted["timestamp"].dtype
+
+
+@pytest.mark.parametrize(
+    "stage, limit",
+    [
+        (preprocess.clean_news, 1.0),
+        (preprocess.add_sentiment_seed, 0.2),
+    ],
+)
+def test_preprocessing_stage_memory_amplification(news, stage, limit):
+    frame = preprocess.clean_news(news) if stage is preprocess.add_sentiment_seed else news
+    amplification, _ = _amplification(stage, frame)
+    assert amplification < limit, f"{stage.__name__} peaked at {amplification:.2f}x its input"
+
+
+def test_merge_and_feature_memory_amplification(news, market):
+    clean = preprocess.add_sentiment_seed(preprocess.clean_news(news))
+    amplification, merged = _amplification(merge_news_market.merge_on_timestamps, clean, market, by="ticker")
+    assert amplification < 0.8
+
+    class Model:
+        classes_ = np.array([-1, 0, 1])
+
+        def predict_with_proba(self, texts):
+            return np.zeros(len(texts), dtype=np.int64), np.full((len(texts), 3), 1 / 3)
+
+    amplification, _ = _amplification(feature_engineering.build_features, merged, model=Model())
+    assert amplification < 0.5
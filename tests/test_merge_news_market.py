@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -22,4 +23,74 @@ def test_merge_aligns_news_with_future_returns():
     assert "reaction" in merged.columns
     # first event should align with next close change 102->101 = -0.0098 approx for second event
     assert len(merged) == 2
-    assert merged.iloc[0]["reaction"] == pytest.approx((102.0 - 101.0) / 102.0, rel=1e-5)
+    assert merged.iloc[0]["reaction"] == pytest.approx((101.0 - 102.0) / 102.0, rel=1e-5)
+
+
+def _multi_ticker_frames():
+    news = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2024-01-01 10:00", "2024-01-01 10:30", "2024-01-02 11:00", "2024-01-01 12:00"]),
+            "ticker": ["AAA", "BBB", "AAA", "CCC"],
+            "clean_text": ["record profit", "fraud discovered", "slow quarter", "no bars for this one"],
+        }
+    )
+    market = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(
+                ["2024-01-01 09:30", "2024-01-01 16:00", "2024-01-02 16:00", "2024-01-01 11:00", "2024-01-01 16:00", "2024-01-02 16:00"]
+            ),
+            "ticker": ["AAA", "AAA", "AAA", "BBB", "BBB", "BBB"],
+            "close": [100.0, 102.0, 101.0, 50.0, 40.0, 44.0],
+            "volume": [1000, 1100, 1200, 500, 600, 700],
+        }
+    )
+    return news, market
+
+
+def test_prepare_market_computes_returns_per_ticker():
+    _, market = _multi_ticker_frames()
+    prepared = merge_news_market.prepare_market(market, by="ticker")
+    bbb = prepared[prepared["ticker"] == "BBB"]
+    assert list(bbb["return"]) == pytest.approx([0.0, -0.2, 0.1])
+    assert list(bbb["future_return"]) == pytest.approx([-0.2, 0.1, 0.0])
+
+
+def test_grouped_merge_matches_per_ticker_loop():
+    news, market = _multi_ticker_frames()
+    merged = merge_news_market.merge_on_timestamps(news, market, by="ticker")
+
+    for ticker, group in news.groupby("ticker"):
+        expected = merge_news_market.merge_on_timestamps(
+            group.drop(columns="ticker"), market[market["ticker"] == ticker].drop(columns="ticker")
+        )
+        actual = merged[merged["ticker"] == ticker].reset_index(drop=True)
+        assert list(actual["reaction"]) == pytest.approx(list(expected["reaction"]))
+    assert merged.set_index("clean_text").loc["fraud discovered", "reaction"] == pytest.approx(-0.2)
+    assert merged.set_index("clean_text").loc["no bars for this one", "reaction"] == 0.0
+
+
+def test_horizon_targets_match_per_row_reference():
+    from src.data import synthetic
+    from src.data.market_features import market_features
+
+    market = synthetic.make_market(tickers=3, days=12, bars_per_day=6, seed=2)
+    news = synthetic.make_news(200, tickers=3, days=14, seed=2)
+    targets = merge_news_market.add_horizon_targets(news, market, [0.5, 2], by="ticker", lookback_days=3)
+    assert list(targets["headline"]) == list(news["headline"])
+
+    features = market_features(market, 3, by="ticker")
+    bars = market.sort_values(["ticker", "timestamp"], kind="stable").reset_index(drop=True)
+    bars["baseline"] = features["baseline_return"].shift(1).where(bars["ticker"].eq(bars["ticker"].shift(1)), 0.0).fillna(0.0)
+    for row in news.itertuples():
+        own = bars[bars["ticker"] == row.ticker].reset_index(drop=True)
+        after = own[own["timestamp"] >= row.timestamp]
+        for horizon in [0.5, 2]:
+            window = after[after["timestamp"] <= row.timestamp + pd.Timedelta(days=horizon)]
+            forward = targets.at[row.Index, merge_news_market.horizon_column("forward_return", horizon)]
+            car = targets.at[row.Index, merge_news_market.horizon_column("car", horizon)]
+            if window.empty:
+                assert pd.isna(forward) and pd.isna(car)
+                continue
+            move = np.log(window["close"].iloc[-1] / window["close"].iloc[0])
+            assert forward == pytest.approx(np.expm1(move), abs=1e-12)
+            assert car == pytest.approx(move - window["baseline"].iloc[0] * (len(window) - 1), abs=1e-12)
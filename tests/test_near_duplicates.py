@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.near_duplicates import (
+    NearDuplicateIndex,
+    drop_near_duplicates,
+    minhash_signatures,
+    near_duplicate_mask,
+    shingle_hashes,
+)
+
+
+BASE = "acme corp beats quarterly earnings estimates as cloud revenue grows strongly in the second quarter"
+
+
+def _times(*hours):
+    return pd.Timestamp("2024-01-02 09:00") + pd.to_timedelta(list(hours), unit="h")
+
+
+def test_edited_reprints_are_flagged_and_unrelated_kept():
+    texts = [
+        BASE,
+        "globex shares slump after regulator opens probe into accounting practices",
+        BASE + " 2024",
+        BASE.replace("beats", "misses").replace("strongly", "weakly"),
+        "initech announces buyback",
+    ]
+    mask = near_duplicate_mask(texts, _times(0, 1, 2, 3, 4), threshold=0.8)
+    # Appending a word keeps 15 of 16 bigrams; two swapped words leave a Jaccard of 11/19.
+    assert mask.tolist() == [False, False, True, False, False]
+
+
+def test_window_limits_which_earlier_rows_count():
+    texts = [BASE, BASE, BASE]
+    times = _times(0, 50, 51)
+    assert near_duplicate_mask(texts, times, window="3D").tolist() == [False, True, True]
+    assert near_duplicate_mask(texts, times, window="1D").tolist() == [False, False, True]
+    assert near_duplicate_mask(texts, times, window=None).tolist() == [False, True, True]
+
+
+def test_drop_near_duplicates_keeps_first_occurrence():
+    df = pd.DataFrame({"timestamp": _times(1, 0), "clean_text": [BASE + " update", BASE], "ticker": ["A", "B"]})
+    kept = drop_near_duplicates(df)
+    assert kept["ticker"].tolist() == ["B"]
+    with pytest.raises(KeyError):
+        drop_near_duplicates(df.drop(columns="clean_text"))
+
+
+def test_signature_agreement_estimates_jaccard():
+    rng = np.random.default_rng(0)
+    vocabulary = np.array([f"w{i}" for i in range(40)])
+    texts = [" ".join(rng.choice(vocabulary, 30)) for _ in range(20)]
+    hashes, starts = shingle_hashes(texts)
+    sets = [set(hashes[starts[i]:starts[i + 1]]) for i in range(len(texts))]
+    signatures = minhash_signatures(texts, num_perm=256)
+    errors = [
+        (signatures[i] == signatures[j]).mean() - len(sets[i] & sets[j]) / len(sets[i] | sets[j])
+        for i in range(len(texts))
+        for j in range(i)
+    ]
+    assert abs(np.mean(errors)) < 0.02
+    assert np.max(np.abs(errors)) < 0.15
+
+
+def test_index_matches_one_pass_and_evicts_old_history():
+    rng = np.random.default_rng(3)
+    words = np.array([f"w{i}" for i in range(300)])
+    stories = [" ".join(rng.choice(words, 12)) for _ in range(60)]
+    texts = [stories[i] if rng.random() < 0.5 else stories[i] + " update" for i in rng.integers(0, 60, 400)]
+    times = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 10 * 24 * 60, 400)), unit="min")
+    expected = near_duplicate_mask(texts, times, window="2D", max_candidates=400)
+
+    index = NearDuplicateIndex(window="2D", max_candidates=400)
+    flagged = np.concatenate([index.check(texts[i:i + 50], times[i:i + 50]) for i in range(0, 400, 50)])
+    np.testing.assert_array_equal(flagged, expected)
+    assert len(index) == int((times >= times.max() - pd.Timedelta("2D")).sum())
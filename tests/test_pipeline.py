@@ -0,0 +1,93 @@
+import pandas as pd
+
+from src.utils.pipeline import PipelineRunner, Stage, open_shared_frame, share_frame
+
+
+def _stages(calls, scale=1):
+    def source():
+        calls.append("source")
+        return pd.DataFrame({"x": [1, 2, 3]})
+
+    def double(df):
+        calls.append("double")
+        return df.assign(x=df["x"] * 2 * scale)
+
+    def total(df):
+        calls.append("total")
+        return pd.DataFrame({"total": [df["x"].sum()]})
+
+    return [
+        Stage("source", source),
+        Stage("double", double, inputs=("source",), params={"scale": scale}),
+        Stage("total", total, inputs=("double",)),
+    ]
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    calls = []
+    outputs = PipelineRunner(_stages(calls), tmp_path).run()
+    assert calls == ["source", "double", "total"]
+    assert outputs["total"]["total"].iloc[0] == 12
+
+    calls.clear()
+    runner = PipelineRunner(_stages(calls), tmp_path)
+    runner.run()
+    assert calls == []
+    assert [r.status for r in runner.results] == ["cached"] * 3
+
+
+def test_param_change_reruns_stage_and_downstream_only(tmp_path):
+    PipelineRunner(_stages([]), tmp_path).run()
+    calls = []
+    outputs = PipelineRunner(_stages(calls, scale=10), tmp_path).run()
+    assert calls == ["double", "total"]
+    assert outputs["total"]["total"].iloc[0] == 120
+
+
+def test_from_and_to_stage(tmp_path):
+    PipelineRunner(_stages([]), tmp_path).run()
+    calls = []
+    PipelineRunner(_stages(calls), tmp_path).run(from_stage="double", to_stage="double")
+    assert calls == ["double"]
+
+
+def test_provided_outputs_replace_stages_and_round_trip_through_arrow(tmp_path):
+    frame = pd.DataFrame({"x": [5.0, 6.0], "name": ["a", "b"], "when": pd.to_datetime(["2024-01-01", "2024-01-02"])})
+    shared = open_shared_frame(share_frame(frame, tmp_path / "shared" / "source.arrow"))
+    pd.testing.assert_frame_equal(shared, frame, check_dtype=False)
+
+    calls = []
+    runner = PipelineRunner(_stages(calls), tmp_path / "cache")
+    outputs = runner.run(provided={"source": shared})
+    assert calls == ["double", "total"]
+    assert outputs["total"]["total"].iloc[0] == 22
+    assert [r.status for r in runner.results] == ["shared", "computed", "computed"]
+    assert not list((tmp_path / "cache").glob("*.partial"))
+
+
+def test_cached_outputs_are_republished_after_another_config(tmp_path):
+    published = tmp_path / "published.csv"
+    calls = []
+
+    def stages(scale):
+        built = _stages(calls, scale)
+        built[1].publish = lambda df: (calls.append("publish"), df.to_csv(published, index=False))
+        built[1].targets = (str(published),)
+        return built
+
+    for scale in (1, 10):
+        PipelineRunner(stages(scale), tmp_path / "cache").run()
+    calls.clear()
+    runner = PipelineRunner(stages(1), tmp_path / "cache")
+    runner.run()
+    # Config A is served from the cache, but the published file held config B's output.
+    assert [r.status for r in runner.results] == ["cached"] * 3
+    assert pd.read_csv(published)["x"].tolist() == [2, 4, 6]
+    assert calls == ["publish"]
+
+    calls.clear()
+    PipelineRunner(stages(1), tmp_path / "cache").run()
+    assert calls == []
+    published.unlink()
+    PipelineRunner(stages(1), tmp_path / "cache").run()
+    assert calls == ["publish"] and published.exists()
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from src.models import predict_sentiment
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+TEXTS = ["good profit", "bad loss", "record growth", "fraud investigation", "flat day", "quiet session"]
+LABELS = [1, -1, 1, -1, 0, 0]
+
+
+@pytest.fixture()
+def model_path(tmp_path):
+    path = tmp_path / "sentiment.joblib"
+    SentimentTransformer().fit(TEXTS, LABELS).save(path)
+    return path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_file_streams_chunks_in_order(tmp_path, model_path, workers):
+    texts = [TEXTS[i % len(TEXTS)] + f" item{i}" for i in range(25)]
+    source = tmp_path / "news.csv"
+    pd.DataFrame({"id": range(25), "clean_text": texts}).to_csv(source, index=False)
+    output = tmp_path / "scores.parquet"
+
+    stats = predict_sentiment.score_file(
+        source, output, model_path, keep_columns=["id"], chunk_size=4, workers=workers
+    )
+
+    result = pd.read_parquet(output)
+    expected = predict_sentiment.predict_dataframe(texts, model_path)
+    assert stats["rows"] == 25
+    assert list(result["id"]) == list(range(25))
+    pd.testing.assert_frame_equal(result.drop(columns="id"), expected)
+
+
+def test_iter_input_chunks_reads_parquet(tmp_path):
+    source = tmp_path / "news.parquet"
+    pd.DataFrame({"clean_text": TEXTS, "other": range(6)}).to_parquet(source)
+    chunks = list(predict_sentiment.iter_input_chunks(source, 4, columns=["clean_text"]))
+    assert [len(c) for c in chunks] == [4, 2]
+    assert list(chunks[0].columns) == ["clean_text"]
+
+
+def test_score_file_keeps_one_schema_and_writes_empty_inputs(tmp_path, model_path):
+    source = tmp_path / "news.csv"
+    # ``note`` is empty for the whole first chunk and text later; ``source`` gains categories as it goes.
+    pd.DataFrame(
+        {
+            "clean_text": TEXTS * 2,
+            "note": [None] * 4 + ["wire", "update"] * 4,
+            "source": [f"s{i}" for i in range(12)],
+        }
+    ).to_csv(source, index=False)
+    output = tmp_path / "scores.parquet"
+    predict_sentiment.score_file(source, output, model_path, keep_columns=["note", "source"], chunk_size=4)
+    result = pd.read_parquet(output)
+    assert result["note"].tolist()[4:6] == ["wire", "update"] and result["note"].iloc[:4].isna().all()
+    assert result["source"].astype(str).tolist() == [f"s{i}" for i in range(12)]
+
+    empty = tmp_path / "empty.csv"
+    pd.DataFrame({"clean_text": [], "source": []}).to_csv(empty, index=False)
+    predict_sentiment.score_file(empty, tmp_path / "empty.parquet", model_path, keep_columns=["source"])
+    written = pd.read_parquet(tmp_path / "empty.parquet")
+    assert len(written) == 0
+    assert list(written.columns) == ["source", "prediction", "prob_-1", "prob_0", "prob_1"]
+
+
+def test_empty_input_takes_its_schema_from_the_given_model(tmp_path, model_path):
+    source = tmp_path / "news.csv"
+    pd.DataFrame({"clean_text": TEXTS}).to_csv(source, index=False)
+    predict_sentiment.score_file(source, tmp_path / "scores.parquet", model_path)
+    assert predict_sentiment._WORKER_MODEL is None
+
+    binary_path = tmp_path / "binary.joblib"
+    SentimentTransformer().fit(TEXTS[:4], LABELS[:4]).save(binary_path)
+    empty = tmp_path / "empty.csv"
+    pd.DataFrame({"clean_text": []}).to_csv(empty, index=False)
+    predict_sentiment.score_file(empty, tmp_path / "empty.parquet", binary_path, workers=2)
+    assert list(pd.read_parquet(tmp_path / "empty.parquet").columns) == ["prediction", "prob_-1", "prob_1"]
@@ -23,3 +23,45 @@ def test_add_sentiment_seed_applies_keywords():
     df = pd.DataFrame({"clean_text": ["record profit", "fraud and loss", "flat results" ]})
     labeled = preprocess.add_sentiment_seed(df)
     assert list(labeled["sentiment_seed"]) == [1, -1, 0]
+
+
+SAMPLES = [
+    "Hello, WORLD!!!",
+    "  Record   profit; growth\tsurge  ",
+    "Q3 EPS beat -- shares +5%",
+    "Fraud probe: loss widens, decline seen",
+    "Café déjà-vu résumé",
+    "miss miss beat",
+    "",
+    "!!!",
+    "profitable growthy record",
+]
+
+
+def _reference_seed(text: str) -> int:
+    tokens = set(text.split())
+    pos = len(tokens & preprocess.POSITIVE_TOKENS)
+    neg = len(tokens & preprocess.NEGATIVE_TOKENS)
+    return 1 if pos > neg else -1 if neg > pos else 0
+
+
+def test_normalize_series_matches_normalize_text():
+    result = preprocess.normalize_series(pd.Series(SAMPLES))
+    assert list(result) == [preprocess.normalize_text(s) for s in SAMPLES]
+
+
+def test_sentiment_seed_labels_match_reference():
+    texts = SAMPLES + [preprocess.normalize_text(s) for s in SAMPLES]
+    result = preprocess.sentiment_seed_labels(pd.Series(texts))
+    assert list(result) == [_reference_seed(t) for t in texts]
+
+
+def test_parallel_paths_match_serial(monkeypatch):
+    monkeypatch.setattr(preprocess, "MIN_ROWS_PER_JOB", 2)
+    texts = pd.Series(SAMPLES * 3)
+    pd.testing.assert_series_equal(
+        preprocess.normalize_series(texts, n_jobs=3), preprocess.normalize_series(texts)
+    )
+    pd.testing.assert_series_equal(
+        preprocess.sentiment_seed_labels(texts, n_jobs=3), preprocess.sentiment_seed_labels(texts)
+    )
@@ -0,0 +1,60 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import profiling
+from src.utils.pipeline import PipelineRunner, Stage
+
+
+@profiling.instrument()
+def _double(df):
+    return pd.concat([df, df])
+
+
+def test_disabled_instrumentation_records_nothing():
+    assert profiling.active() is None
+    assert profiling.track("a") is profiling.track("b")
+    assert len(_double(pd.DataFrame({"x": [1]}))) == 2
+
+
+def test_nested_blocks_and_decorator_rows():
+    profiler = profiling.Profiler()
+    with profiler.activate():
+        with profiling.track("stage", rows_in=3):
+            _double(pd.DataFrame({"x": [1, 2, 3]}))
+    assert profiling.active() is None
+    records = {record.name: record for record in profiler.records}
+    assert set(records) == {"stage", "stage/_double"}
+    assert (records["stage/_double"].rows_in, records["stage/_double"].rows_out) == (3, 6)
+    assert records["stage/_double"].depth == 1
+    assert records["stage"].wall_seconds >= records["stage/_double"].wall_seconds
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs /proc")
+def test_peak_rss_delta_sees_transient_allocation():
+    profiler = profiling.Profiler()
+    with profiler.activate():
+        with profiling.track("allocate"):
+            block = np.ones(50_000_000 // 8)
+            del block
+    assert profiler.records[0].peak_rss_delta_bytes > 40_000_000
+
+
+def test_pipeline_stages_report_and_cprofile(tmp_path):
+    stages = [
+        Stage("source", lambda: pd.DataFrame({"x": range(5)})),
+        Stage("double", _double, inputs=("source",)),
+    ]
+    profiler = profiling.Profiler(profile_dir=tmp_path / "profiles")
+    with profiler.activate():
+        PipelineRunner(stages, tmp_path / "cache").run()
+
+    report = json.loads(profiler.write_report(tmp_path / "report.json").read_text())
+    by_name = {stage["name"]: stage for stage in report["stages"]}
+    assert list(by_name) == ["source", "double", "double/_double"]
+    assert (by_name["double"]["rows_in"], by_name["double"]["rows_out"]) == (5, 10)
+    assert (tmp_path / "profiles" / "double.prof").exists()
+    assert by_name["double/_double"]["profile"] is None
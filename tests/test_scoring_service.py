@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models import market_reaction_model
+from src.models.scoring_service import ScoringService
+from src.nlp import feature_engineering
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+TEXTS = ["good profit", "bad loss", "record growth", "fraud investigation", "flat day", "quiet session"]
+LABELS = [1, -1, 1, -1, 0, 0]
+
+
+@pytest.fixture()
+def service():
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    features = feature_engineering.build_features(
+        pd.DataFrame({"clean_text": TEXTS, "reaction": np.linspace(-0.02, 0.02, len(TEXTS))}), model
+    )
+    return ScoringService(model, market_reaction_model.train_reaction_model(features), max_wait_ms=5)
+
+
+def test_score_batch_matches_offline_models(service):
+    results = service.score_batch(["profit beats", "loss widens"])
+    probas = service.sentiment_model.predict_proba(["profit beats", "loss widens"])
+    assert [r["prediction"] for r in results] == list(service.sentiment_model.predict(["profit beats", "loss widens"]))
+    assert results[0]["probabilities"]["positive"] == pytest.approx(probas[0, 2], abs=1e-6)
+    assert results[1]["predicted_reaction"] is not None
+
+
+def test_service_rejects_models_that_need_market_features():
+    model = SentimentTransformer().fit(TEXTS, LABELS)
+    features = feature_engineering.build_features(
+        pd.DataFrame({"clean_text": TEXTS, "reaction": np.linspace(-0.02, 0.02, len(TEXTS))}), model
+    )
+    features["volume_zscore"] = np.linspace(-1.0, 1.0, len(TEXTS))
+    with pytest.raises(ValueError, match="volume_zscore"):
+        ScoringService(model, market_reaction_model.train_reaction_model(features, include_market=True))
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    return head.split(b" ")[1].decode(), json.loads(body)
+
+
+def test_http_round_trip_batches_concurrent_requests(service):
+    async def scenario():
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            responses = await asyncio.gather(
+                *(_request(port, "POST", "/score", {"headline": text}) for text in TEXTS)
+            )
+            bad = await _request(port, "POST", "/score", {"nope": 1})
+            letters = await _request(port, "POST", "/score", {"headlines": "good profit"})
+            number = await _request(port, "POST", "/score", {"headline": 5})
+            metrics = await _request(port, "GET", "/metrics")
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+        return responses, [bad, letters, number], metrics
+
+    responses, rejected, (_, metrics) = asyncio.run(scenario())
+    assert all(status == "200" for status, _ in responses)
+    expected = service.score_batch(TEXTS)
+    assert [body["results"][0]["prediction"] for _, body in responses] == [r["prediction"] for r in expected]
+    assert [status for status, _ in rejected] == ["400"] * 3
+    assert metrics["requests"] == len(TEXTS)
+    assert metrics["batches"] < len(TEXTS)
+    assert metrics["latency_ms_p99"] >= metrics["latency_ms_p50"] > 0
+
+
+@pytest.mark.parametrize("length", ["abc", "-1"])
+def test_invalid_content_length_gets_bad_request(service, length):
+    async def scenario():
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"POST /score HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+            await writer.drain()
+            raw = await reader.read()
+            writer.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+        return raw
+
+    assert asyncio.run(scenario()).split(b" ")[1] == b"400"
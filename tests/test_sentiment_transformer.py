@@ -1,7 +1,9 @@
 from pathlib import Path
 
 import numpy as np
+from scipy import sparse
 
+from src.nlp.embedder import NewsEmbedder
 from src.nlp.sentiment_transformer import SentimentTransformer
 
 
@@ -19,3 +21,34 @@ def test_transformer_fits_simple_dataset(tmp_path: Path):
     loaded = SentimentTransformer.load(model_path)
     loaded_preds = loaded.predict(["profit beats", "loss widens"])
     np.testing.assert_array_equal(preds, loaded_preds)
+
+
+def test_embedder_is_sparse_unless_dense_requested():
+    texts = ["good profit", "bad loss", "record growth", "fraud investigation"]
+    embedder = NewsEmbedder().fit(texts)
+    assert sparse.issparse(embedder.transform(texts))
+    dense = embedder.transform(texts, dense=True)
+    assert isinstance(dense, np.ndarray)
+    np.testing.assert_allclose(dense, embedder.transform(texts).toarray())
+
+
+def test_sparse_and_dense_modes_agree():
+    texts = ["good profit", "bad loss", "record growth", "fraud investigation"]
+    labels = [1, -1, 1, -1]
+    sparse_model = SentimentTransformer().fit(texts, labels)
+    dense_model = SentimentTransformer(embedder_model=NewsEmbedder(dense=True)).fit(texts, labels)
+    np.testing.assert_allclose(
+        sparse_model.predict_proba(["profit beats"]),
+        dense_model.predict_proba(["profit beats"]),
+        rtol=1e-4,
+    )
+
+
+def test_predict_with_proba_matches_separate_calls():
+    texts = ["good profit", "bad loss", "record growth", "fraud investigation", "flat day", "quiet session"]
+    labels = [1, -1, 1, -1, 0, 0]
+    model = SentimentTransformer().fit(texts, labels)
+    queries = texts + ["profit beats", "loss widens", "unseen words"]
+    preds, probas = model.predict_with_proba(queries)
+    np.testing.assert_array_equal(preds, model.predict(queries))
+    np.testing.assert_array_equal(probas, model.predict_proba(queries))
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.data import preprocess, store, synthetic
+
+
+@pytest.fixture()
+def news():
+    return preprocess.add_sentiment_seed(preprocess.clean_news(synthetic.make_news(5_000, tickers=8, days=90, seed=4)))
+
+
+def test_round_trip_keeps_rows_columns_and_order(tmp_path, news):
+    root = store.write_dataset(news, tmp_path / "news", row_group_rows=256)
+    assert sorted(path.name for path in root.iterdir())[:2] == ["_layout.json", "month=2024-01"]
+    loaded = store.read_dataset(root)
+    assert list(loaded.columns) == list(news.columns)
+    assert loaded["timestamp"].is_monotonic_increasing
+    # Rows sharing a timestamp come back ordered by ticker, so compare on a full sort.
+    key = ["timestamp", "ticker", "clean_text"]
+    expected = news.astype({"ticker": str}).sort_values(key, ignore_index=True)
+    pd.testing.assert_frame_equal(loaded.sort_values(key, ignore_index=True), expected, check_dtype=False, check_categorical=False)
+
+
+def test_query_prunes_months_and_matches_in_memory_filter(tmp_path, news):
+    root = store.write_dataset(news, tmp_path / "news", row_group_rows=256)
+    tickers = list(news["ticker"].astype(str).unique()[:2])
+    columns = ["timestamp", "ticker", "sentiment_seed"]
+    result = store.read_dataset(root, columns, start="2024-02-10", end="2024-03-01", tickers=tickers)
+
+    mask = news["timestamp"].between(pd.Timestamp("2024-02-10"), pd.Timestamp("2024-03-01"), inclusive="left")
+    expected = news.loc[mask & news["ticker"].astype(str).isin(tickers), columns]
+    assert list(result.columns) == columns
+    pd.testing.assert_frame_equal(
+        result.sort_values(columns, ignore_index=True),
+        expected.astype({"ticker": str}).sort_values(columns, ignore_index=True),
+        check_dtype=False,
+    )
+
+    dataset = store.open_dataset(root)
+    fragments = list(dataset.get_fragments(filter=store.dataset_filter(dataset, "2024-02-10", "2024-03-01")))
+    assert [Path(fragment.path).parent.name for fragment in fragments] == ["month=2024-02"]
+
+
+def test_incremental_write_replaces_only_written_months(tmp_path, news):
+    root = tmp_path / "news"
+    store.write_dataset(news, root)
+    january = news[news["timestamp"] < "2024-02-01"]
+    store.write_dataset(january.head(10), root, replace=False)
+    loaded = store.read_dataset(root, ["timestamp"])
+    assert len(loaded) == 10 + (news["timestamp"] >= "2024-02-01").sum()
+    with pytest.raises(KeyError):
+        store.read_dataset(root, ["nope"])
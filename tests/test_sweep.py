@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+import train
+from src.utils.config import apply_overrides, load_config
+from src.utils.pipeline import PipelineRunner
+
+
+def test_apply_overrides_rejects_unknown_keys():
+    base = {"merge": {"tolerance": "2D"}, "training": {"sentiment": {"max_features": 500}}}
+    updated = apply_overrides(base, {"merge.tolerance": "1D", "training.sentiment.max_features": 50})
+    assert updated["merge"]["tolerance"] == "1D" and updated["training"]["sentiment"]["max_features"] == 50
+    assert base["merge"]["tolerance"] == "2D"
+    with pytest.raises(KeyError):
+        apply_overrides(base, {"training.sentiment.max_feature": 50})
+
+
+def test_embedding_cache_size_only_keys_the_features_stage(tmp_path):
+    base = yaml.safe_load((Path(__file__).resolve().parents[1] / "config.yaml").read_text(encoding="utf-8"))
+    keys = [
+        PipelineRunner(train.build_stages(train.variant_config(base, tmp_path, overrides)), tmp_path).stage_keys()
+        for overrides in ({}, {"training.sentiment.embedding_cache_entries": 10})
+    ]
+    assert [name for name in train.STAGES if keys[0][name] != keys[1][name]] == ["features", "reaction"]
+
+
+def test_sweep_shares_preprocessing_and_reports_every_variant(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = yaml.safe_load((Path(__file__).resolve().parents[1] / "config.yaml").read_text(encoding="utf-8"))
+    # Missing raw files make the loaders simulate data.
+    config["paths"] = {key: str(tmp_path / "out" / key) for key in config["paths"]}
+    config["logging"]["log_file"] = str(tmp_path / "pipeline.log")
+    (tmp_path / "config.yaml").write_text(yaml.safe_dump(config))
+    sweep = [
+        {"name": "base"},
+        {"name": "tight", "merge.tolerance": "1D"},
+        {"name": "vocab", "training.sentiment.max_features": 50},
+    ]
+    (tmp_path / "grid.yaml").write_text(yaml.safe_dump(sweep))
+
+    results = train.run_sweep(load_config(tmp_path / "config.yaml"), tmp_path / "grid.yaml", n_jobs=1)
+    assert results["variant"].tolist() == ["base", "tight", "vocab"]
+    assert (results["status"] == "ok").all()
+    assert results["reaction_r2"].notna().all()
+    # Preprocessing ran once up front; variants receive it and only compute their own stages.
+    assert not results["computed"].str.contains("preprocess").any()
+    assert list((tmp_path / "out" / "sweeps" / "grid" / "_shared").glob("preprocess-*.arrow"))
+    assert (tmp_path / "out" / "sweeps" / "grid" / "vocab" / "market_model").exists()
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "out" / "sweeps" / "grid" / "results.csv"), results, check_dtype=False)
+
+
+def test_sweep_writes_cached_models_into_every_variant(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = yaml.safe_load((Path(__file__).resolve().parents[1] / "config.yaml").read_text(encoding="utf-8"))
+    config["paths"] = {key: str(tmp_path / "out" / key) for key in config["paths"]}
+    config["logging"]["log_file"] = str(tmp_path / "pipeline.log")
+    (tmp_path / "config.yaml").write_text(yaml.safe_dump(config))
+    # Both variants share the sentiment model, which the parent trains once.
+    sweep = [{"name": "ols"}, {"name": "ridge", "training.market_reaction.alpha": 1.0}]
+    for stem in ("first", "again"):
+        (tmp_path / f"{stem}.yaml").write_text(yaml.safe_dump(sweep))
+
+    train.run_sweep(load_config(tmp_path / "config.yaml"), tmp_path / "first.yaml", n_jobs=1)
+    # Second run under another name: every stage is a cache hit.
+    results = train.run_sweep(load_config(tmp_path / "config.yaml"), tmp_path / "again.yaml", n_jobs=1)
+    assert (results["status"] == "ok").all()
+    assert (results["computed"] == "").all()
+    variant_dirs = [tmp_path / "out" / "sweeps" / "again" / name for name in ("ols", "ridge")]
+    for variant_dir in variant_dirs:
+        for artifact in ("sentiment_model", "sentiment_model_compact", "market_model", "market_model_compact"):
+            assert (variant_dir / artifact).exists()
+    assert results["market_model"].tolist() == [str(variant_dir / "market_model") for variant_dir in variant_dirs]
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks import suite
+from src.data import fetch_data, preprocess, synthetic
+
+
+def test_make_news_mix_tickers_and_seed_labels():
+    news = synthetic.make_news(5_000, tickers=20, sentiment_mix=(0.2, 0.5, 0.3), seed=1)
+    assert list(news.columns) == ["timestamp", "ticker", "headline", "source", "sentiment"]
+    assert news["timestamp"].is_monotonic_increasing
+    assert set(news["ticker"].unique()) <= set(synthetic.make_universe(20)["ticker"])
+    shares = news["sentiment"].value_counts(normalize=True)
+    assert abs(shares[1] - 0.3) < 0.03 and abs(shares[-1] - 0.2) < 0.03
+    # The seed keyword labeller recovers the generated sentiment.
+    labelled = preprocess.add_sentiment_seed(preprocess.clean_news(news))
+    assert (labelled["sentiment_seed"] == labelled["sentiment"]).mean() > 0.95
+    assert news["headline"].nunique() > 0.8 * len(news)
+    pd.testing.assert_frame_equal(news, synthetic.make_news(5_000, tickers=20, sentiment_mix=(0.2, 0.5, 0.3), seed=1))
+
+
+def test_make_market_irregular_bars_per_ticker():
+    market = synthetic.make_market(tickers=4, days=10, bars_per_day=20, seed=3)
+    assert market["timestamp"].is_monotonic_increasing
+    assert market["ticker"].nunique() == 4
+    one = market[market["ticker"] == market["ticker"].iloc[0]]
+    gaps = one["timestamp"].diff().dropna()
+    assert gaps.nunique() > 10
+    assert one["timestamp"].dt.dayofweek.max() < 5
+    assert (market["close"] > 0).all() and (market["volume"] > 0).all()
+
+
+def test_simulated_news_has_all_sentiment_classes(tmp_path):
+    news = fetch_data.load_news(tmp_path / "missing.csv")
+    labels = preprocess.add_sentiment_seed(preprocess.clean_news(news))["sentiment_seed"]
+    assert set(labels) == {-1, 0, 1}
+
+
+def test_benchmark_suite_flags_regressions():
+    current = suite.run_suite("tiny", cases=["preprocess", "event_study"], repeat=1)
+    assert set(current["results"]) == {"preprocess", "event_study"}
+    slower = {"results": {name: {"min_seconds": stats["min_seconds"] * 3} for name, stats in current["results"].items()}}
+    assert suite.compare(current, slower) == []
+    faster = {"results": {"preprocess": {"min_seconds": current["results"]["preprocess"]["min_seconds"] / 3}}}
+    assert [line.split(":")[0] for line in suite.compare(current, faster)] == ["preprocess"]
+    assert np.isfinite(current["results"]["preprocess"]["median_seconds"])
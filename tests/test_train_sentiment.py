@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.models import train_sentiment
+from src.nlp.embedder import NewsEmbedder
+from src.nlp.sentiment_transformer import SentimentTransformer
+
+
+POSITIVE = ["record profit", "growth surge", "profit beat", "record growth"]
+NEGATIVE = ["fraud loss", "decline miss", "loss widens", "fraud probe"]
+NEUTRAL = ["flat day", "quiet session", "board meeting", "annual report"]
+
+
+def _batches(days: int = 6):
+    for day in range(days):
+        texts = [f"{t} day{day}" for t in POSITIVE + NEGATIVE + NEUTRAL]
+        labels = [1] * len(POSITIVE) + [-1] * len(NEGATIVE) + [0] * len(NEUTRAL)
+        yield texts, labels
+
+
+def test_hashing_embedder_is_stateless():
+    embedder = NewsEmbedder(max_features=64, backend="hashing")
+    assert embedder.stateless
+    assert embedder.transform(["record profit"]).shape == (1, 64)
+    with pytest.raises(ValueError):
+        embedder.vocab()
+
+
+def test_incremental_training_learns_from_stream(tmp_path):
+    model, accuracy = train_sentiment.train_model_incremental(_batches())
+    assert accuracy > 0.8
+    assert list(model.predict(["record profit today", "fraud loss today"])) == [1, -1]
+
+    model_path = tmp_path / "online.joblib"
+    model.save(model_path)
+    loaded = SentimentTransformer.load(model_path)
+    assert loaded.online
+    # Continue training the reloaded model with another day.
+    resumed, _ = train_sentiment.train_model_incremental(_batches(1), model=loaded)
+    np.testing.assert_array_equal(resumed.classifier.classes_, [-1, 0, 1])
+
+
+def test_partial_fit_rejects_fitted_vocabulary_models():
+    with pytest.raises(ValueError):
+        SentimentTransformer().partial_fit(["record profit"], [1])
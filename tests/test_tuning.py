@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models import tuning
+
+
+POSITIVE = ["record profit", "growth surge", "profit beat"]
+NEGATIVE = ["fraud loss", "decline miss", "loss widens"]
+NEUTRAL = ["flat day", "quiet session", "board meeting"]
+
+
+def _news(days: int = 10) -> pd.DataFrame:
+    rows = []
+    for day in range(days):
+        for label, texts in ((1, POSITIVE), (-1, NEGATIVE), (0, NEUTRAL)):
+            rows += [(pd.Timestamp("2024-01-01") + pd.Timedelta(days=day), f"{text} day{day}", label) for text in texts]
+    return pd.DataFrame(rows, columns=["timestamp", "clean_text", "sentiment_seed"])
+
+
+def test_time_ordered_folds_never_look_ahead():
+    timestamps = pd.Series(pd.date_range("2024-01-01", periods=10, freq="D").repeat(3)).sample(frac=1, random_state=0)
+    folds = tuning.time_ordered_folds(timestamps, n_splits=3)
+    assert len(folds) == 3
+    times = timestamps.to_numpy()
+    for train_idx, test_idx in folds:
+        assert times[train_idx].max() < times[test_idx].min()
+    assert sum(len(test) for _, test in folds) + len(folds[0][0]) == len(timestamps)
+
+
+def test_candidate_grid_and_random_sample():
+    space = {"max_features": [10, 20], "regularization": [0.1, 1.0, 10.0]}
+    assert len(tuning.candidate_grid(space)) == 6
+    sample = tuning.candidate_grid(space, n_iter=3, seed=1)
+    assert len(sample) == 3
+    assert sample == tuning.candidate_grid(space, n_iter=3, seed=1)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_search_sentiment_ranks_candidates(n_jobs):
+    news = _news()
+    space = {"max_features": [5, 200], "ngram_range": [[1, 1]], "regularization": [0.01, 10.0]}
+    board = tuning.search_sentiment(
+        news["clean_text"], news["sentiment_seed"], news["timestamp"], space, n_splits=3, n_jobs=n_jobs
+    )
+    assert list(board["rank"]) == [1, 2, 3, 4]
+    assert board["mean_score"].is_monotonic_decreasing
+    assert json.loads(board["params"].iloc[0])["max_features"] == 200
+    assert (board["n_folds"] == 3).all()
+
+
+def test_search_reaction_refits_sentiment_per_fold(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    merged = _news()
+    merged["volume_zscore"] = rng.normal(size=len(merged))
+    merged["reaction"] = 0.01 * merged["sentiment_seed"] + rng.normal(0, 1e-4, len(merged))
+    merged["reaction_market"] = merged["reaction"] + 0.02 * merged["volume_zscore"]
+    fitted = []
+    fit = tuning.SentimentTransformer.fit
+
+    def recording_fit(self, texts, labels):
+        fitted.append(list(texts))
+        return fit(self, texts, labels)
+
+    monkeypatch.setattr(tuning.SentimentTransformer, "fit", recording_fit)
+
+    space = {"alpha": [0.0, 100.0]}
+    board = tuning.search_reaction(merged, space, {"max_features": 50, "regularization": 1.0}, n_splits=3)
+    assert json.loads(board["params"].iloc[0]) == {"alpha": 0.0}
+    assert len(fitted) == 3
+    assert not any("day9" in text for texts in fitted for text in texts)
+
+    options = {"n_splits": 3, "target_column": "reaction_market"}
+    with_market = tuning.search_reaction(merged, space, include_market=True, **options)
+    assert with_market["mean_score"].iloc[0] > tuning.search_reaction(merged, space, **options)["mean_score"].iloc[0]
+
+    path = tmp_path / "leaderboard.csv"
+    tuning.write_leaderboard([board, board], path)
+    assert list(pd.read_csv(path).columns) == tuning.LEADERBOARD_COLUMNS
@@ -2,54 +2,404 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import logging
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 
-from src.utils.config import load_config
+import pandas as pd
+import yaml
+
+from src.utils.config import apply_overrides, config_from_dict, load_config
 from src.utils.logger import configure_logging
-from src.data import fetch_data, preprocess, merge_news_market
+from src.utils.pipeline import PipelineRunner, Stage, file_signature, open_shared_frame, share_frame
+from src.utils.profiling import Profiler
+from src.data import fetch_data, preprocess, merge_news_market, market_features, near_duplicates, store
 from src.nlp import sentiment_transformer, embedder, feature_engineering
-from src.models import train_sentiment, market_reaction_model
+from src.models import artifacts, train_sentiment, market_reaction_model
+
+
+STAGES = ["load_news", "load_market", "preprocess", "merge", "sentiment", "features", "reaction"]
+# ``training.sentiment`` settings that only affect how features are computed, not the fitted model.
+FEATURE_PARAMS = ("embedding_cache_entries",)
+# Inputs and the stage cache are shared by sweep variants; every other path gets a per-variant directory.
+SHARED_PATHS = {"data_raw", "data_market", "stage_cache", "sweeps"}
+
+# Data shipped once to each sweep worker by ``_init_worker``.
+_WORKER_DATA: dict[str, Any] = {}
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Train sentiment and market reaction models")
     parser.add_argument("--config", default="config.yaml", help="Path to YAML configuration file")
+    parser.add_argument("--from-stage", choices=STAGES, help="Recompute this stage and everything after it")
+    parser.add_argument("--to-stage", choices=STAGES, help="Stop after this stage")
+    parser.add_argument(
+        "--tune", action="store_true", help="Run the hyperparameter search and write the leaderboard instead of training"
+    )
+    parser.add_argument("--profile", action="store_true", help="Record per-stage timings and memory in paths.run_report")
+    parser.add_argument("--profile-dir", type=Path, help="Also dump a cProfile file per stage into this directory")
+    parser.add_argument(
+        "--sweep", type=Path, help="YAML list of config overrides; train every variant and write a combined results table"
+    )
+    parser.add_argument("--sweep-jobs", type=int, help="Worker processes for --sweep (default: sweep.n_jobs)")
     return parser.parse_args()
 
 
-def main() -> None:
-    args = parse_args()
-    config = load_config(Path(args.config))
-    configure_logging(config)
+def target_horizons(config: SimpleNamespace) -> list[float]:
+    """Horizons the merge stage computes targets for: ``target_horizons`` plus the trained ``horizon_days``."""
+    reaction_cfg = config.training.market_reaction
+    return sorted({*getattr(reaction_cfg, "target_horizons", []), reaction_cfg.horizon_days})
+
+
+def reaction_target(config: SimpleNamespace) -> str:
+    """Column the reaction model is trained on; ``reaction`` is the next-bar move from the merge."""
+    reaction_cfg = config.training.market_reaction
+    target = getattr(reaction_cfg, "target", market_reaction_model.TARGET_COLUMN)
+    if target == market_reaction_model.TARGET_COLUMN:
+        return target
+    return merge_news_market.horizon_column(target, reaction_cfg.horizon_days)
+
+
+def _save_sentiment(transformer: Any, paths: SimpleNamespace) -> None:
+    train_sentiment.save_model(transformer, Path(paths.sentiment_model))
+    artifacts.export_sentiment(transformer, Path(paths.sentiment_model_compact))
+
+
+def _save_reaction(regressor: Any, paths: SimpleNamespace) -> None:
+    market_reaction_model.save_model(regressor, Path(paths.market_model))
+    artifacts.export_reaction(regressor, Path(paths.market_model_compact))
+
+
+def build_stages(config: SimpleNamespace) -> list[Stage]:
+    """Describe the training pipeline; each stage is keyed by its config section and upstream stages."""
+    paths = config.paths
+    raw = config._raw
+
+    def run_preprocess(news_df):
+        news_df = preprocess.clean_news(news_df)
+        dedup_cfg = getattr(config, "preprocessing", None)
+        threshold = getattr(dedup_cfg, "near_duplicate_threshold", None)
+        if threshold is not None:
+            days = getattr(dedup_cfg, "near_duplicate_window_days", None)
+            window = f"{days}D" if days is not None else None
+            news_df = near_duplicates.drop_near_duplicates(news_df, threshold=threshold, window=window)
+        return preprocess.add_sentiment_seed(news_df)
+
+    def run_merge(news_df, market_df):
+        reaction_cfg = config.training.market_reaction
+        merge_cfg = getattr(config, "merge", None)
+        merged = merge_news_market.merge_on_timestamps(
+            news_df,
+            market_df,
+            reaction=getattr(merge_cfg, "reaction", "close_to_next"),
+            tolerance=getattr(merge_cfg, "tolerance", "2D"),
+        )
+        merged = merge_news_market.add_horizon_targets(
+            merged, market_df, target_horizons(config), lookback_days=reaction_cfg.lookback_days
+        )
+        return market_features.add_market_features(merged, market_df, reaction_cfg.lookback_days)
+
+    def run_sentiment(merged_df):
+        sentiment_cfg = config.training.sentiment
+        embedder_model = embedder.NewsEmbedder(max_features=sentiment_cfg.max_features)
+        transformer = sentiment_transformer.SentimentTransformer(
+            embedder_model=embedder_model, regularization=sentiment_cfg.regularization
+        )
+        return transformer.fit(merged_df["clean_text"], merged_df["sentiment_seed"])
+
+    def run_features(merged_df, transformer):
+        from src.nlp import embedding_cache
+
+        transformer.embedding_cache = embedding_cache.EmbeddingCache(
+            Path(paths.embeddings), max_entries=config.training.sentiment.embedding_cache_entries
+        )
+        features = feature_engineering.build_features(merged_df, transformer)
+        transformer.embedding_cache.flush()
+        logging.getLogger(__name__).info("Embedding cache: %s", transformer.embedding_cache.stats())
+        return features
+
+    def run_reaction(features):
+        return market_reaction_model.train_reaction_model(
+            features,
+            reaction_target(config),
+            alpha=getattr(config.training.market_reaction, "alpha", 0.0),
+            include_market=getattr(config.training.market_reaction, "use_market_features", False),
+        )
+
+    return [
+        Stage("load_news", lambda: fetch_data.load_news(Path(paths.data_raw)), params=file_signature(paths.data_raw)),
+        Stage(
+            "load_market",
+            lambda: fetch_data.load_market(Path(paths.data_market)),
+            params=file_signature(paths.data_market),
+        ),
+        Stage(
+            "preprocess",
+            run_preprocess,
+            inputs=("load_news",),
+            params=raw.get("preprocessing"),
+            publish=lambda news_df: store.write_dataset(news_df, Path(paths.data_processed)),
+            targets=(paths.data_processed,),
+        ),
+        Stage(
+            "merge",
+            run_merge,
+            inputs=("preprocess", "load_market"),
+            params={
+                "merge": raw.get("merge"),
+                "lookback_days": raw["training"]["market_reaction"]["lookback_days"],
+                "horizons": target_horizons(config),
+            },
+            publish=lambda merged: store.write_dataset(merged, Path(paths.data_merged)),
+            targets=(paths.data_merged,),
+        ),
+        Stage(
+            "sentiment",
+            run_sentiment,
+            inputs=("merge",),
+            params={key: value for key, value in raw["training"]["sentiment"].items() if key not in FEATURE_PARAMS},
+            save=lambda model, path: model.save(path),
+            load=sentiment_transformer.SentimentTransformer.load,
+            suffix=".joblib",
+            publish=lambda model: _save_sentiment(model, paths),
+            targets=(paths.sentiment_model, paths.sentiment_model_compact),
+        ),
+        Stage(
+            "features",
+            run_features,
+            inputs=("merge", "sentiment"),
+            params={key: raw["training"]["sentiment"].get(key) for key in FEATURE_PARAMS},
+        ),
+        Stage(
+            "reaction",
+            run_reaction,
+            inputs=("features",),
+            params=raw["training"]["market_reaction"],
+            save=market_reaction_model.save_model,
+            load=market_reaction_model.load_model,
+            suffix=".joblib",
+            publish=lambda regressor: _save_reaction(regressor, paths),
+            targets=(paths.market_model, paths.market_model_compact),
+        ),
+    ]
+
+
+def tune(config: SimpleNamespace, runner: PipelineRunner) -> None:
+    """Search the ``tuning`` grids on the cached merge output and write the leaderboard."""
+    from src.models import tuning
+
+    logger = logging.getLogger(__name__)
+    settings = config.tuning
+    outputs = runner.run(to_stage="merge")
+    merged = outputs["merge"] if "merge" in outputs else runner.load("merge")
+    options = {"n_splits": settings.n_splits, "n_iter": settings.n_iter, "n_jobs": settings.n_jobs, "seed": config.random_seed}
+    raw = config._raw["tuning"]
+    boards = [
+        tuning.search_sentiment(
+            merged["clean_text"], merged["sentiment_seed"], merged["timestamp"], raw["sentiment"], **options
+        ),
+        tuning.search_reaction(
+            merged,
+            raw["market_reaction"],
+            sentiment_params={
+                "max_features": config.training.sentiment.max_features,
+                "regularization": config.training.sentiment.regularization,
+            },
+            target_column=reaction_target(config),
+            include_market=getattr(config.training.market_reaction, "use_market_features", False),
+            **options,
+        ),
+    ]
+    board = tuning.write_leaderboard(boards, Path(config.paths.leaderboard))
+    for model_name, rows in board.groupby("model", sort=False):
+        best = rows.iloc[0]
+        logger.info("Best %s: %s (%s %.4f)", model_name, best["params"], best["metric"], best["mean_score"])
+    logger.info("Leaderboard written to %s", config.paths.leaderboard)
+
+
+def load_sweep(path: Path) -> list[tuple[str, dict[str, Any]]]:
+    """``(name, overrides)`` per variant of a sweep file.
+
+    The file is a YAML list (or a mapping with a ``variants`` list) of dotted
+    config overrides; an optional ``name`` labels the variant::
+
+        - name: base
+        - name: tight-merge
+          merge.tolerance: 1D
+        - training.sentiment.max_features: 1000
+    """
+    with path.open("r", encoding="utf-8") as fh:
+        data = yaml.safe_load(fh)
+    items = data["variants"] if isinstance(data, dict) else data
+    if not items:
+        raise ValueError(f"{path} lists no variants")
+    variants = []
+    for position, item in enumerate(items):
+        overrides = dict(item or {})
+        variants.append((str(overrides.pop("name", f"v{position:02d}")), overrides))
+    names = [name for name, _ in variants]
+    if len(set(names)) != len(names):
+        raise ValueError(f"duplicate variant names in {path}")
+    return variants
+
+
+def variant_config(
+    base: dict[str, Any], root_dir: Path, overrides: dict[str, Any], output_dir: Path | None = None
+) -> SimpleNamespace:
+    """*base* with *overrides* applied and, given *output_dir*, every non-shared path moved under it."""
+    data = apply_overrides(base, overrides)
+    if output_dir is not None:
+        for key, value in data["paths"].items():
+            if key not in SHARED_PATHS:
+                data["paths"][key] = str(output_dir / Path(value).name)
+    return config_from_dict(data, root_dir)
+
+
+def _init_worker(data: dict[str, Any]) -> None:
+    _WORKER_DATA.clear()
+    _WORKER_DATA.update(data)
+
+
+def _variant_summary(config: SimpleNamespace, runner: PipelineRunner, outputs: dict[str, Any]) -> dict[str, Any]:
+    """Rows trained on and in-sample fit of the variant's models."""
+    features = outputs["features"] if "features" in outputs else runner.load("features")
+    regressor = outputs["reaction"] if "reaction" in outputs else runner.load("reaction")
+    target = reaction_target(config)
+    include_market = getattr(config.training.market_reaction, "use_market_features", False)
+    _, y = market_reaction_model.prepare_training_data(features, target, include_market)
+    predicted = market_reaction_model.predict(regressor, features.loc[y.index])
+    total = float(((y - y.mean()) ** 2).sum())
+    return {
+        "rows": len(features),
+        "target": target,
+        "sentiment_accuracy": float((features["sentiment_pred"] == features["sentiment_seed"]).mean()),
+        "reaction_r2": 1 - float(((y - predicted) ** 2).sum()) / total if total > 0 else float("nan"),
+    }
+
+
+def _sweep_task(position: int) -> dict[str, Any]:
+    data = _WORKER_DATA
+    name, overrides = data["variants"][position]
+    config = variant_config(data["base"], data["root_dir"], overrides, data["output_dir"] / name)
+    runner = PipelineRunner(build_stages(config), Path(config.paths.stage_cache), logger=logging.getLogger(f"{__name__}.{name}"))
+    provided = {stage: open_shared_frame(path) for stage, path in data["shared"].items()}
+    start = time.perf_counter()
+    outputs = runner.run(provided=provided)
+    missing = [target for stage in runner.stages for target in stage.targets if not Path(target).exists()]
+    if missing:
+        raise FileNotFoundError(f"variant artifacts missing: {missing}")
+    return {
+        "seconds": time.perf_counter() - start,
+        "computed": ",".join(result.name for result in runner.results if result.status == "computed"),
+        **_variant_summary(config, runner, outputs),
+        "sentiment_model": config.paths.sentiment_model,
+        "market_model": config.paths.market_model,
+    }
+
+
+def run_sweep(config: SimpleNamespace, sweep_path: Path, n_jobs: int | None = None) -> pd.DataFrame:
+    """Train every variant of *sweep_path*, preparing the stages they all share once.
+
+    Stages whose cache key is the same for every variant (typically loading
+    and preprocessing) run once here. Their frames that variant-specific
+    stages consume are written as Arrow files that every worker memory-maps
+    instead of recomputing or re-reading them; the remaining stages run per
+    variant in a process pool. Every variant's models are written under
+    ``<paths.sweeps>/<sweep>/<variant>/``, including models taken from the
+    cache, and results land in ``<paths.sweeps>/<sweep>/results.csv``.
+    """
     logger = logging.getLogger(__name__)
+    variants = load_sweep(sweep_path)
+    output_dir = Path(getattr(config.paths, "sweeps", "data/sweeps")) / sweep_path.stem
+    n_jobs = n_jobs or getattr(getattr(config, "sweep", None), "n_jobs", 1)
+    cache_dir = Path(config.paths.stage_cache)
 
-    logger.info("Loading raw datasets")
-    news_df = fetch_data.load_news(Path(config.paths.data_raw))
-    market_df = fetch_data.load_market(Path(config.paths.data_market))
+    configs = [variant_config(config._raw, config.root_dir, overrides) for _, overrides in variants]
+    keys = [PipelineRunner(build_stages(variant), cache_dir).stage_keys() for variant in configs]
+    shared: list[str] = []
+    for name in STAGES:
+        if len({variant_keys[name] for variant_keys in keys}) > 1:
+            break
+        shared.append(name)
 
-    logger.info("Preprocessing news data")
-    news_df = preprocess.clean_news(news_df)
-    news_df = preprocess.add_sentiment_seed(news_df)
+    shared_files: dict[str, Path] = {}
+    if shared:
+        # Shared stages write their side outputs (the processed store) to the base config's paths.
+        stages = build_stages(configs[0])
+        runner = PipelineRunner(stages, cache_dir, logger=logger)
+        outputs = runner.run(to_stage=shared[-1])
+        needed = {name for stage in stages if stage.name not in shared for name in stage.inputs if name in shared}
+        for name in sorted(needed):
+            output = outputs[name] if name in outputs else runner.load(name)
+            if isinstance(output, pd.DataFrame):
+                shared_files[name] = share_frame(output, output_dir / "_shared" / f"{name}-{keys[0][name]}.arrow")
+        logger.info("Sweep: %s shared by all %d variants", ", ".join(shared), len(variants))
 
-    logger.info("Merging news and market data")
-    merged_df = merge_news_market.merge_on_timestamps(news_df, market_df)
+    data = {"base": config._raw, "root_dir": config.root_dir, "output_dir": output_dir, "variants": variants, "shared": shared_files}
+    if n_jobs <= 1:
+        _init_worker(data)
+        try:
+            outcomes = []
+            for position in range(len(variants)):
+                try:
+                    outcomes.append(_sweep_task(position))
+                except Exception as exc:  # one broken variant should not lose the others' results
+                    outcomes.append(exc)
+        finally:
+            _init_worker({})
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(data,)) as pool:
+            futures = [pool.submit(_sweep_task, position) for position in range(len(variants))]
+            outcomes = [future.exception() or future.result() for future in futures]
+    rows = []
+    for (name, overrides), outcome in zip(variants, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error("Sweep variant %s failed: %s", name, outcome)
+            rows.append({"variant": name, "status": f"failed: {outcome}", **overrides})
+        else:
+            rows.append({"variant": name, "status": "ok", **overrides, **outcome})
+    front = ["variant", "status", *dict.fromkeys(key for _, overrides in variants for key in overrides)]
+    results = pd.DataFrame(rows)
+    results = results[front + [column for column in results.columns if column not in front]]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results.to_csv(output_dir / "results.csv", index=False)
+    logger.info("Sweep results written to %s\n%s", output_dir / "results.csv", results.to_string(index=False))
+    return results
 
-    logger.info("Training sentiment transformer")
-    embedder_model = embedder.NewsEmbedder(max_features=config.training.sentiment.max_features)
-    transformer = sentiment_transformer.SentimentTransformer(embedder_model=embedder_model)
-    transformer.fit(merged_df["clean_text"], merged_df["sentiment_seed"])
-    train_sentiment.save_model(transformer, Path(config.paths.sentiment_model))
 
-    logger.info("Generating features for market reaction model")
-    features = feature_engineering.build_features(merged_df, transformer)
+def main() -> None:
+    args = parse_args()
+    config = load_config(Path(args.config))
+    configure_logging(config)
+    logger = logging.getLogger(__name__)
+
+    if args.sweep:
+        run_sweep(config, args.sweep, args.sweep_jobs)
+        return
 
-    logger.info("Training market reaction regression")
-    regressor = market_reaction_model.train_reaction_model(features)
-    market_reaction_model.save_model(regressor, Path(config.paths.market_model))
+    runner = PipelineRunner(build_stages(config), Path(config.paths.stage_cache), logger=logger)
+    profiler = Profiler(profile_dir=args.profile_dir) if args.profile or args.profile_dir else None
+    with profiler.activate() if profiler else contextlib.nullcontext():
+        if args.tune:
+            tune(config, runner)
+        else:
+            runner.run(from_stage=args.from_stage, to_stage=args.to_stage)
+            for result in runner.results:
+                logger.info("%-12s %-8s %7.2fs", result.name, result.status, result.seconds)
+            logger.info("Pipeline finished successfully")
 
-    logger.info("Pipeline finished successfully")
+    if profiler is not None:
+        for record in profiler.records:
+            logger.info(
+                "%-40s wall %7.2fs cpu %7.2fs rows %s -> %s", record.name, record.wall_seconds,
+                record.cpu_seconds, record.rows_in, record.rows_out,
+            )
+        logger.info("Run report written to %s", profiler.write_report(Path(config.paths.run_report)))
 
 
 if __name__ == "__main__":